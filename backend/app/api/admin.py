@@ -0,0 +1,537 @@
+# backend/app/api/admin.py
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, status, Query, Request, Header, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.models.user import User
+from app.models.bulk import BulkUpdateRequest
+from app.models.enrollment import EnrollmentUpdate
+from app.models.schedule import ScheduleUpdate
+from app.models.job_application import JobApplicationUpdate
+from app.models.collegeninja import CollegeNinjaStatusUpdate
+from app.api import enrollments, schedules, job_applications, collegeninja
+from app.api.auth import find_user, get_current_admin_user
+from app.core.loop_monitor import loop_monitor
+from app.core.rate_limit import rate_limiter
+from app.core.security import bcrypt_calibration
+from app.utils.search_index import search_index, SEARCH_FIELDS
+from app.utils.email_index import email_index, normalize_email
+from app.utils.zip_index import zip_index, ZIP_FIELDS
+from app.utils.analytics import signup_analytics, bucket_range, ANALYTICS_FIELDS, INTERVALS
+from app.utils.shared_snapshot import shared_snapshot
+from app.utils.file_db import file_db, COLLECTIONS
+from app.utils.compact_records import json_default
+from app.utils.retention import retention_job, RETENTION_RULES
+from app.utils.reminders import reminder_scheduler
+from app.utils.email import email_sender
+from app.utils.backup import backup_store, BackupError
+from app.utils.event_hub import event_hub, format_sse, live_event, LIVE_COLLECTIONS
+from app.utils.availability import BookingConflict
+from app.utils.importer import Importer, IMPORTERS, IMPORT_FORMATS, detect_format, send_confirmations
+from app.core.config import settings
+
+router = APIRouter()
+
+# Update model and valid statuses per collection accepted by /bulk
+BULK_UPDATES = {
+    "enrollments": (EnrollmentUpdate, enrollments.VALID_STATUSES),
+    "schedules": (ScheduleUpdate, schedules.VALID_STATUSES),
+    "job_applications": (JobApplicationUpdate, job_applications.VALID_STATUSES),
+    "collegeninja_students": (CollegeNinjaStatusUpdate, collegeninja.VALID_STUDENT_STATUSES),
+    "collegeninja_counselors": (CollegeNinjaStatusUpdate, collegeninja.VALID_COUNSELOR_STATUSES),
+}
+
+def _validate_changes(collection: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+    """Check one item's changes the way the collection's PATCH endpoint does"""
+    model, valid_statuses = BULK_UPDATES[collection]
+    unknown = [field for field in changes if field not in model.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    try:
+        update_data = model(**changes).model_dump(exclude_unset=True)
+    except ValidationError as e:
+        error = e.errors()[0]
+        raise ValueError(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}")
+    if not update_data:
+        raise ValueError("No changes given")
+    if 'status' in update_data and update_data['status'] not in valid_statuses:
+        raise ValueError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+    if update_data.get('scheduled_date'):
+        update_data['scheduled_date'] = update_data['scheduled_date'].isoformat()
+    return update_data
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, description="Search terms (prefix matching)"),
+    collections: Optional[List[str]] = Query(None, description="Restrict to these collections"),
+    limit: int = Query(20, ge=1, le=200),
+    include_archived: bool = Query(False, description="Also scan the cold archive"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Full-text search over applications, enrollments, schedules and signups (admin only)"""
+    if collections:
+        unknown = [c for c in collections if c not in SEARCH_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid collection. Must be one of: {', '.join(SEARCH_FIELDS)}"
+            )
+
+    start = time.perf_counter()
+    results = search_index.search(q, collections=collections, limit=limit)
+    if include_archived and len(results) < limit:
+        # Archived records come after every hot hit, newest segment first
+        # Decompresses every segment, so scan off the event loop
+        results += await asyncio.to_thread(
+            file_db.archive.search, q, collections=collections, limit=limit - len(results)
+        )
+
+    return {
+        "query": q,
+        "total": len(results),
+        "took_ms": round((time.perf_counter() - start) * 1000, 3),
+        "results": results
+    }
+
+@router.get("/regions")
+async def get_regions(
+    prefix: str = Query("", max_length=10, description="Postal code prefix, e.g. 980"),
+    digits: int = Query(3, ge=1, le=10, description="Group codes by this many leading characters"),
+    country: Optional[str] = Query(None, description="Only this country"),
+    collections: Optional[List[str]] = Query(None, description="Restrict to these collections"),
+    include_records: bool = Query(False, description="Also return the matching records"),
+    limit: int = Query(100, ge=1, le=1000, description="Records per collection"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Enrollment, schedule and signup counts by postal code prefix and country (admin only)"""
+    if collections:
+        unknown = [c for c in collections if c not in ZIP_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid collection. Must be one of: {', '.join(ZIP_FIELDS)}"
+            )
+
+    start = time.perf_counter()
+    report = zip_index.breakdown(prefix, digits=digits, collections=collections, country=country)
+    if include_records:
+        report["records"] = zip_index.records(prefix, collections=collections, country=country, limit=limit)
+
+    return {
+        "prefix": prefix,
+        "digits": digits,
+        "country": country,
+        "took_ms": round((time.perf_counter() - start) * 1000, 3),
+        **report
+    }
+
+# Range covered by /analytics when no 'from' is given
+DEFAULT_ANALYTICS_RANGE = {"day": timedelta(days=90), "week": timedelta(weeks=26), "month": timedelta(days=365)}
+
+@router.get("/analytics")
+async def get_analytics(
+    interval: str = Query("day", description="day, week or month"),
+    start: Optional[datetime] = Query(None, alias="from", description="Range start; UTC unless an offset is given"),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end, default now"),
+    collections: Optional[List[str]] = Query(None, description="Restrict to these collections"),
+    category: Optional[str] = Query(None, description="Only this course, service type, position or grade"),
+    window: int = Query(7, ge=1, le=365, description="Buckets averaged by the moving average"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Signup counts, moving averages and conversion rates over time (admin only)"""
+    if not signup_analytics.available:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analytics need numpy, which is not installed"
+        )
+    if interval not in INTERVALS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid interval. Must be one of: {', '.join(INTERVALS)}"
+        )
+    if collections:
+        unknown = [c for c in collections if c not in ANALYTICS_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid collection. Must be one of: {', '.join(ANALYTICS_FIELDS)}"
+            )
+
+    end = end or datetime.now(timezone.utc)
+    end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+    start = start or end - DEFAULT_ANALYTICS_RANGE[interval]
+    start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be after 'from'"
+        )
+    first, last = bucket_range(interval, start, end)
+    if last - first >= settings.ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too long: at most {settings.ANALYTICS_MAX_BUCKETS} {interval}s per request"
+        )
+
+    started = time.perf_counter()
+    try:
+        series = signup_analytics.trends(collections or list(ANALYTICS_FIELDS), interval, start, end, window, category)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+    return {
+        "interval": interval,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "window": window,
+        "category": category,
+        "took_ms": round((time.perf_counter() - started) * 1000, 3),
+        "series": series
+    }
+
+@router.get("/people/{email}")
+async def get_person(
+    email: str,
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get a user and all related records across collections by email (admin only)"""
+    records = email_index.lookup(email)
+    users = records.pop("users")
+    if "users" not in email_index.collections:
+        # Not indexed next to a shared snapshot; the snapshot has the account
+        user = find_user(email)
+        users = [user] if user else []
+
+    if not users and not any(records.values()):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No records found for this email"
+        )
+
+    return {
+        "email": normalize_email(email),
+        "user": User(**users[0]) if users else None,
+        **records
+    }
+
+@router.post("/bulk/{collection}")
+async def bulk_update(
+    collection: str,
+    request: BulkUpdateRequest,
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Apply many {id, changes} updates to one collection in a single write (admin only)"""
+    if collection not in BULK_UPDATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid collection. Must be one of: {', '.join(BULK_UPDATES)}"
+        )
+    if not request.updates or len(request.updates) > settings.BULK_UPDATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Send between 1 and {settings.BULK_UPDATE_MAX_ITEMS} updates"
+        )
+
+    # Everything is validated up front so a bad item never leaves a half-applied batch
+    updates = []
+    errors = []
+    seen = set()
+    for index, item in enumerate(request.updates):
+        try:
+            if item.id in seen:
+                raise ValueError("Duplicate id in this batch")
+            seen.add(item.id)
+            updates.append({"id": item.id, "changes": _validate_changes(collection, item.changes)})
+        except ValueError as e:
+            errors.append({"index": index, "id": item.id, "error": str(e)})
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "No changes were applied", "errors": errors}
+        )
+
+    try:
+        records = await asyncio.to_thread(file_db.update_many, collection, updates)
+    except BookingConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"No changes were applied: {e}"
+        )
+    results = [
+        {"id": update["id"], "status": "updated", "record": record} if record is not None
+        else {"id": update["id"], "status": "not_found"}
+        for update, record in zip(updates, records)
+    ]
+    updated = sum(1 for record in records if record is not None)
+    return {
+        "collection": collection,
+        "updated": updated,
+        "not_found": len(records) - updated,
+        "results": results
+    }
+
+@router.post("/import/{collection}")
+async def import_records(
+    collection: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CSV with a header row, or one JSON object per line"),
+    format: Optional[str] = Query(None, description="csv or ndjson; taken from the file name when omitted"),
+    dry_run: bool = Query(False, description="Validate and count without writing"),
+    send_emails: bool = Query(False, description="Send each imported record its confirmation email"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Import enrollments or CollegeNinja signups from a CSV or NDJSON upload (admin only)"""
+    if collection not in IMPORTERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid collection. Must be one of: {', '.join(IMPORTERS)}"
+        )
+    fmt = format or detect_format(file.filename)
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format. Must be one of: {', '.join(IMPORT_FORMATS)}"
+        )
+
+    importer = Importer(file_db, collection, dry_run=dry_run, keep_created=send_emails)
+    # The upload is spooled to disk by now; rows are read from it one at a time
+    report = await asyncio.to_thread(importer.run, file.file, fmt)
+    if send_emails and importer.created:
+        # Emails go out after the response instead of holding the import up
+        background_tasks.add_task(send_confirmations, collection, importer.created)
+        report["emails_queued"] = len(importer.created)
+    return report
+
+@router.get("/event-loop")
+async def get_event_loop_stats(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get this worker's event loop lag histogram and recent blocking calls (admin only)"""
+    return loop_monitor.stats()
+
+@router.post("/event-loop/reset")
+async def reset_event_loop_stats(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Clear this worker's recorded event loop lag (admin only)"""
+    loop_monitor.reset()
+    return {"message": "Event loop stats reset"}
+
+@router.get("/rate-limits")
+async def get_rate_limit_stats(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get auth rate limiter rejection counts (admin only)"""
+    return rate_limiter.stats()
+
+@router.get("/password-hashing")
+async def get_password_hashing(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get the bcrypt cost chosen at startup (admin only)"""
+    return bcrypt_calibration
+
+@router.get("/shared-snapshot")
+async def get_shared_snapshot(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get the shared-memory snapshot version mapped by this worker (admin only)"""
+    return shared_snapshot.stats()
+
+@router.get("/archive")
+async def get_archive(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get archive segment sizes and the last retention run in this process (admin only)"""
+    return {
+        "codec": file_db.archive.codec,
+        "collections": file_db.archive.stats(),
+        "last_run": retention_job.last_run,
+    }
+
+@router.get("/archive/{collection}/export")
+async def export_archive(
+    collection: str,
+    include_hot: bool = Query(False, description="Also export the records still in the hot files"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Stream archived records as NDJSON, oldest first (admin only)"""
+    if collection not in RETENTION_RULES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid collection. Must be one of: {', '.join(RETENTION_RULES)}"
+        )
+
+    def lines():
+        for record in file_db.archive.iter_records(collection):
+            yield json.dumps(record, default=json_default) + "\n"
+        if include_hot:
+            for record in list(file_db.get_collection(collection)):
+                yield json.dumps(record, default=json_default) + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{collection}.ndjson"'}
+    )
+
+@router.post("/retention/run")
+async def run_retention(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Archive every record the retention rules select right now (admin only)"""
+    return await retention_job.run_once()
+
+@router.get("/reminders")
+async def get_reminders(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get the consultation reminder queue and email sender counts of this process (admin only)"""
+    return {"scheduler": reminder_scheduler.stats(), "email_sender": email_sender.stats()}
+
+@router.get("/backups")
+async def list_backups(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """List data snapshots, oldest first (admin only)"""
+    return {"snapshots": [backup_store.summary(s) for s in backup_store.snapshots()]}
+
+@router.post("/backups")
+async def create_backup(
+    incremental: bool = Query(False, description="Store only files changed since the last snapshot"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Take a consistent snapshot of the data directory without pausing writes (admin only)"""
+    try:
+        snapshot = await asyncio.to_thread(backup_store.create, file_db, incremental)
+    except BackupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    return backup_store.summary(snapshot)
+
+@router.get("/changes")
+async def get_changes(
+    since: int = Query(0, ge=0, description="Last sequence number the client has seen"),
+    collections: Optional[List[str]] = Query(None, description="Restrict to these collections"),
+    epoch: Optional[str] = Query(None, description="Epoch the since value belongs to"),
+    limit: int = Query(500, ge=1, le=5000),
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for a change (long poll)"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get inserts, updates, deletes and archives after a sequence number (admin only)"""
+    # Clients poll again with since=next_since. truncated means changes were
+    # missed (log wrapped or writer restarted): reload full collections first
+    if collections:
+        unknown = [c for c in collections if c not in COLLECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid collection. Must be one of: {', '.join(COLLECTIONS)}"
+            )
+
+    changes_log = file_db.changes
+    deadline = time.monotonic() + wait
+    while True:
+        changes, truncated, next_since = changes_log.since(since, collections, limit, epoch)
+        remaining = deadline - time.monotonic()
+        if changes or truncated or remaining <= 0:
+            break
+        # Changes to other collections still move the cursor forward
+        since = next_since
+        await changes_log.wait(next_since, remaining)
+
+    return {
+        "epoch": changes_log.epoch,
+        "truncated": truncated,
+        "next_since": next_since,
+        "changes": changes
+    }
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    collections: Optional[List[str]] = Query(None, description="Restrict to these collections"),
+    last_event_id: Optional[str] = Header(None),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Stream new signups and status changes as Server-Sent Events (admin only)"""
+    # Events come from this process's change log. With several workers that
+    # only covers every write when they share the storage writer, which
+    # app.server starts for them; plain uvicorn --workers N streams each
+    # worker's own writes. Event ids are epoch:seq, so a reconnect landing on
+    # another numbering gets a reset instead of someone else's backlog
+    if collections:
+        unknown = [c for c in collections if c not in LIVE_COLLECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid collection. Must be one of: {', '.join(LIVE_COLLECTIONS)}"
+            )
+    if len(event_hub) >= settings.EVENT_STREAM_MAX_CLIENTS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live event streams"
+        )
+
+    # Subscribe before replaying so nothing falls between the two
+    subscription = event_hub.subscribe(collections)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            replayed = 0
+            if last_event_id:
+                epoch, _, seq = last_event_id.rpartition(":")
+                if epoch and seq.isdigit():
+                    backlog, truncated, _ = file_db.changes.since(
+                        int(seq), collections or LIVE_COLLECTIONS, settings.EVENT_STREAM_BUFFER, epoch
+                    )
+                else:
+                    backlog, truncated = [], True
+                if truncated or len(backlog) >= settings.EVENT_STREAM_BUFFER:
+                    # Too far behind: the dashboard reloads its lists instead
+                    yield format_sse("reset", {"reason": "missed events"})
+                else:
+                    for entry in backlog:
+                        yield format_sse(entry["collection"], live_event(entry), f"{file_db.changes.epoch}:{entry['seq']}")
+                        replayed = entry["seq"]
+
+            while not subscription.closed:
+                events = await subscription.next_events(settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+                dropped = subscription.take_dropped()
+                if dropped:
+                    yield format_sse("dropped", {"count": dropped})
+                for event in events:
+                    # Only the first batch can repeat replayed events
+                    if event["seq"] > replayed:
+                        yield format_sse(event["collection"], event, f"{file_db.changes.epoch}:{event['seq']}")
+                replayed = 0
+                if not events and not dropped:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/events/stats")
+async def get_event_stats(
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get live event stream clients and buffer usage in this worker (admin only)"""
+    return event_hub.stats()
@@ -1,19 +1,26 @@
 # backend/app/api/auth.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from datetime import datetime, timedelta, timezone
 import random
 from typing import Optional
 
 from app.core.config import settings
-from app.core.security import verify_password, get_password_hash, create_access_token, decode_token
+from app.core.security import verify_password, get_password_hash, password_needs_rehash, create_access_token, decode_token
 from app.models.user import UserCreate, UserLogin, User, Token, PasswordReset, PasswordResetConfirm
 from app.utils.file_db import file_db
+from app.utils.shared_snapshot import shared_snapshot
 from app.utils.email import send_reset_code_email, send_password_reset_confirmation
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+def find_user(email: str) -> Optional[dict]:
+    """User for an email, from the shared snapshot when this worker maps one"""
+    if shared_snapshot.ready:
+        return shared_snapshot.user_by_email(email)
+    return file_db.get_user_by_email(email)
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     """Get current authenticated user"""
     credentials_exception = HTTPException(
@@ -30,7 +37,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     if email is None:
         raise credentials_exception
 
-    user = file_db.get_user_by_email(email)
+    user = find_user(email)
     if user is None:
         raise credentials_exception
 
@@ -49,7 +56,7 @@ async def get_current_admin_user(current_user: User = Depends(get_current_user))
 async def register(user_create: UserCreate):
     """Register a new user"""
     # Check if email exists
-    existing_user = file_db.get_user_by_email(user_create.email)
+    existing_user = find_user(user_create.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,10 +77,17 @@ async def register(user_create: UserCreate):
             detail=str(e)
         )
 
+def rehash_password(user_id: str, password: str) -> None:
+    """Upgrade a stale password hash to the current bcrypt cost"""
+    try:
+        file_db.update_user(user_id, {'password_hash': get_password_hash(password)})
+    except Exception as e:
+        print(f"Failed to rehash password: {e}")
+
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login(background_tasks: BackgroundTasks, form_data: OAuth2PasswordRequestForm = Depends()):
     """Login with email and password"""
-    user = file_db.get_user_by_email(form_data.username)  # username field contains email
+    user = find_user(form_data.username)  # username field contains email
 
     if not user or not verify_password(form_data.password, user['password_hash']):
         raise HTTPException(
@@ -88,6 +102,10 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
             detail="Inactive user"
         )
 
+    # Upgrade hashes made with an older cost after the response is sent
+    if password_needs_rehash(user['password_hash']):
+        background_tasks.add_task(rehash_password, user['id'], form_data.password)
+
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -104,13 +122,13 @@ async def get_me(current_user: User = Depends(get_current_user)):
 @router.post("/check-email")
 async def check_email(email: str):
     """Check if email is already registered"""
-    user = file_db.get_user_by_email(email)
+    user = find_user(email)
     return {"email_taken": user is not None}
 
 @router.post("/password-reset")
 async def request_password_reset(reset_request: PasswordReset):
     """Request password reset code"""
-    user = file_db.get_user_by_email(reset_request.email)
+    user = find_user(reset_request.email)
 
     if not user:
         # Don't reveal if email exists
@@ -160,7 +178,7 @@ async def confirm_password_reset(reset_confirm: PasswordResetConfirm):
         )
 
     # Update password
-    user = file_db.get_user_by_email(reset_confirm.email)
+    user = find_user(reset_confirm.email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
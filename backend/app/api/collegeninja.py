@@ -13,6 +13,10 @@ from app.utils.email import send_collegeninja_student_confirmation, send_college
 
 router = APIRouter()
 
+# Valid signup statuses
+VALID_STUDENT_STATUSES = ["pending", "contacted", "enrolled"]
+VALID_COUNSELOR_STATUSES = ["pending", "contacted", "partner"]
+
 @router.post("/student-signup", response_model=CollegeNinjaStudent)
 async def create_student_signup(student: CollegeNinjaStudentCreate):
     """Create a new CollegeNinja student/parent signup"""
@@ -152,11 +156,10 @@ async def update_student_status(
     current_admin: User = Depends(get_current_admin_user)
 ):
     """Update student signup status (admin only)"""
-    valid_statuses = ["pending", "contacted", "enrolled"]
-    if status not in valid_statuses:
+    if status not in VALID_STUDENT_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            detail=f"Invalid status. Must be one of: {', '.join(VALID_STUDENT_STATUSES)}"
         )
 
     updated = file_db.update_collegeninja_student(student_id, {"status": status})
@@ -175,11 +178,10 @@ async def update_counselor_status(
     current_admin: User = Depends(get_current_admin_user)
 ):
     """Update counselor signup status (admin only)"""
-    valid_statuses = ["pending", "contacted", "partner"]
-    if status not in valid_statuses:
+    if status not in VALID_COUNSELOR_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            detail=f"Invalid status. Must be one of: {', '.join(VALID_COUNSELOR_STATUSES)}"
         )
 
     updated = file_db.update_collegeninja_counselor(counselor_id, {"status": status})
@@ -1,20 +1,30 @@
+from typing import Any, Dict
+
 from fastapi import APIRouter
 
+from app.core.catalog import get_catalogs
+from app.utils.file_db import file_db
+
 router = APIRouter()
 
-# Static course data
-COURSES = [
-    {
-        "id": "junior-ai",
-        "name": "Junior AI Program",
-        "description": "AI and Programming In Action - For Middle & High School Students",
-        "duration": "6 weeks (12 lesson hours)",
-        "max_students": 8,
-        "level": "beginner"
+
+def with_seats(course: Dict[str, Any]) -> Dict[str, Any]:
+    """Course details plus its live seat counts"""
+    cohorts = course.get("cohorts")
+    if not cohorts:
+        return {**course, **file_db.seats.seats(course["name"])}
+    cohort_seats = {cohort: file_db.seats.seats(course["name"], cohort) for cohort in cohorts}
+    return {
+        **course,
+        "taken": sum(seats["taken"] for seats in cohort_seats.values()),
+        "seats_left": sum(seats["seats_left"] for seats in cohort_seats.values()),
+        "waitlisted": sum(seats["waitlisted"] for seats in cohort_seats.values()),
+        "cohort_seats": cohort_seats,
     }
-]
+
 
 @router.get("/")
 async def get_courses():
     """Get all available courses"""
-    return {"courses": COURSES, "programs": []}
\ No newline at end of file
+    catalogs = get_catalogs()
+    return {"courses": [with_seats(course) for course in catalogs["courses"]], "programs": catalogs["programs"]}
@@ -6,21 +6,15 @@ from datetime import datetime
 from app.models.enrollment import Enrollment, EnrollmentCreate, EnrollmentUpdate
 from app.models.user import User
 from app.api.auth import get_current_user, get_current_admin_user
+from app.core.catalog import COURSE_NAMES, course_cohorts
+from app.utils.capacity import WAITLIST_STATUS
 from app.utils.file_db import file_db
 from app.utils.email import send_enrollment_confirmation
 
 router = APIRouter()
 
 # Valid courses list
-VALID_COURSES = [
-    "Junior AI Program",
-    "Generative AI Program",
-    "Advanced Generative AI Program",
-    "CollegeNinja",
-    "High School Research Program",
-    "Interview Clinic",
-    "Music AI Research Program"
-]
+VALID_COURSES = list(COURSE_NAMES.values())
 
 # Valid student types
 VALID_STUDENT_TYPES = ["HStudent", "MStudent", "CStudent", "Parent", "Career", "Other"]
@@ -28,6 +22,18 @@ VALID_STUDENT_TYPES = ["HStudent", "MStudent", "CStudent", "Parent", "Career", "
 # Valid countries
 VALID_COUNTRIES = ["USA", "Canada", "Other"]
 
+# Valid enrollment statuses
+VALID_STATUSES = ["pending", "waitlisted", "confirmed", "completed", "cancelled"]
+
+
+def check_cohort(course: str, cohort: Optional[str]) -> None:
+    """Raise ValueError unless the cohort is one the course runs"""
+    cohorts = course_cohorts(course)
+    if cohorts and cohort not in cohorts:
+        raise ValueError(f"Invalid cohort. Must be one of: {', '.join(cohorts)}")
+    if not cohorts and cohort:
+        raise ValueError(f"{course} has no cohorts to choose from")
+
 @router.post("/", response_model=Enrollment)
 async def create_enrollment(enrollment: EnrollmentCreate):
     """Create a new course enrollment"""
@@ -42,6 +48,15 @@ async def create_enrollment(enrollment: EnrollmentCreate):
             detail=f"Invalid course. Must be one of: {', '.join(VALID_COURSES)}"
         )
 
+    # Validate cohort
+    try:
+        check_cohort(enrollment.course, enrollment.cohort)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
     # Validate student type
     if enrollment.student_type not in VALID_STUDENT_TYPES:
         raise HTTPException(
@@ -102,7 +117,7 @@ async def create_enrollment(enrollment: EnrollmentCreate):
             print(f"Warning: Could not check existing enrollments: {e}")
             # Continue with enrollment creation
 
-        # Create the enrollment
+        # Create the enrollment; it is waitlisted when the course is full
         created_enrollment = file_db.create_enrollment(enrollment_data)
 
         if not created_enrollment:
@@ -116,7 +131,8 @@ async def create_enrollment(enrollment: EnrollmentCreate):
             await send_enrollment_confirmation(
                 enrollment.email,
                 enrollment.first_name,
-                enrollment.course
+                enrollment.course,
+                waitlisted=created_enrollment.get('status') == WAITLIST_STATUS
             )
         except Exception as e:
             print(f"Failed to send enrollment email: {e}")
@@ -223,10 +239,10 @@ async def update_enrollment(
         update_data = enrollment_update.model_dump(exclude_unset=True)
 
         # Validate status if provided
-        if 'status' in update_data and update_data['status'] not in ['pending', 'confirmed', 'completed', 'cancelled']:
+        if 'status' in update_data and update_data['status'] not in VALID_STATUSES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid status. Must be one of: pending, confirmed, completed, cancelled"
+                detail=f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"
             )
 
         updated_enrollment = file_db.update_enrollment(enrollment_id, update_data)
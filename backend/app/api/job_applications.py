@@ -5,11 +5,15 @@ from typing import List, Optional
 from app.models.job_application import JobApplication, JobApplicationCreate, JobApplicationUpdate
 from app.models.user import User
 from app.api.auth import get_current_admin_user
+from app.core.catalog import get_catalogs
 from app.utils.file_db import file_db
 from app.utils.email import send_job_application_confirmation, send_job_application_notification
 
 router = APIRouter()
 
+# Valid application statuses
+VALID_STATUSES = ["new", "reviewing", "interviewed", "rejected", "accepted"]
+
 @router.post("/", response_model=JobApplication)
 async def create_job_application(application: JobApplicationCreate):
     """Submit a new job application"""
@@ -68,34 +72,7 @@ async def get_job_applications(
 @router.get("/positions")
 async def get_available_positions():
     """Get list of available positions"""
-    return {
-        "positions": [
-            {
-                "id": "ai-instructor",
-                "title": "AI Program Instructor",
-                "type": "Part-time",
-                "location": "Remote"
-            },
-            {
-                "id": "fullstack-developer",
-                "title": "Full-Stack Developer",
-                "type": "Contract",
-                "location": "Remote"
-            },
-            {
-                "id": "program-coordinator",
-                "title": "Program Coordinator",
-                "type": "Part-time",
-                "location": "Remote"
-            },
-            {
-                "id": "marketing-partner",
-                "title": "Marketing Partner",
-                "type": "Contract",
-                "location": "Remote"
-            }
-        ]
-    }
+    return {"positions": get_catalogs()["positions"]}
 
 @router.get("/{application_id}", response_model=JobApplication)
 async def get_job_application(
@@ -121,11 +98,10 @@ async def update_job_application(
 ):
     """Update job application status (admin only)"""
     # Validate status if provided
-    valid_statuses = ["new", "reviewing", "interviewed", "rejected", "accepted"]
-    if application_update.status and application_update.status not in valid_statuses:
+    if application_update.status and application_update.status not in VALID_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            detail=f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"
         )
 
     update_data = application_update.model_dump(exclude_unset=True)
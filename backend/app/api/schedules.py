@@ -1,17 +1,23 @@
 # backend/app/api/schedules.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import uuid
 
 from app.models.schedule import Schedule, ScheduleCreate, ScheduleUpdate
 from app.models.user import User
 from app.api.auth import get_current_user, get_current_admin_user
 from app.utils.file_db import file_db
-from app.utils.email import send_schedule_confirmation
+from app.utils.email import email_sender, send_schedule_confirmation, send_schedule_update_notification
+from app.utils.reminders import parse_scheduled_date
+from app.utils.availability import BookingConflict
+from app.core.config import settings
 
 router = APIRouter()
 
+# Valid schedule statuses
+VALID_STATUSES = ["pending", "scheduled", "completed", "cancelled"]
+
 @router.post("/")
 async def create_schedule(schedule: ScheduleCreate):
     """Create a new consultation schedule request"""
@@ -137,6 +143,31 @@ async def get_schedules(
             detail="Failed to retrieve schedules"
         )
 
+@router.get("/availability")
+async def get_availability(
+    start: datetime = Query(..., alias="from", description="Window start; UTC unless an offset is given"),
+    end: datetime = Query(..., alias="to", description="Window end; UTC unless an offset is given"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get free consultation slots within working hours (admin only)"""
+    start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+    if end <= start or end - start > timedelta(days=settings.AVAILABILITY_MAX_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"'to' must be after 'from' and at most {settings.AVAILABILITY_MAX_DAYS} days later"
+        )
+
+    slots = file_db.bookings.free_slots(start, end)
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "timezone": settings.WORKING_TIMEZONE,
+        "consultation_minutes": settings.CONSULTATION_MINUTES,
+        "total": len(slots),
+        "slots": slots
+    }
+
 @router.get("/my", response_model=List[Schedule])
 async def get_my_schedules(
     current_user: User = Depends(get_current_user)
@@ -244,13 +275,21 @@ async def update_schedule(
             update_data['scheduled_date'] = update_data['scheduled_date'].isoformat()
 
         # Validate status if provided
-        if 'status' in update_data and update_data['status'] not in ['pending', 'scheduled', 'completed', 'cancelled']:
+        if 'status' in update_data and update_data['status'] not in VALID_STATUSES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid status. Must be one of: pending, scheduled, completed, cancelled"
+                detail=f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"
             )
 
-        updated_schedule = file_db.update_schedule(schedule_id, update_data)
+        previous = file_db.get_schedule_by_id(schedule_id)
+        previous_date = previous.get('scheduled_date') if previous else None
+        try:
+            updated_schedule = file_db.update_schedule(schedule_id, update_data)
+        except BookingConflict as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(e)
+            )
 
         if not updated_schedule:
             raise HTTPException(
@@ -258,6 +297,16 @@ async def update_schedule(
                 detail="Schedule not found"
             )
 
+        # Tell the client once a time is set or moved; reminders follow from the scheduler
+        scheduled_date = parse_scheduled_date(updated_schedule.get('scheduled_date'))
+        if scheduled_date and updated_schedule.get('scheduled_date') != previous_date:
+            email_sender.submit(
+                send_schedule_update_notification,
+                updated_schedule.get('email'),
+                updated_schedule.get('first_name', ''),
+                scheduled_date
+            )
+
         # Ensure all required fields
         validated_schedule = {
             'id': updated_schedule.get('id', ''),
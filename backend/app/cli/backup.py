@@ -0,0 +1,55 @@
+# backend/app/cli/backup.py
+"""Take, list, verify and restore online snapshots of the data directory.
+
+Usage: python -m app.cli.backup create [--incremental]
+       python -m app.cli.backup list
+       python -m app.cli.backup verify SNAPSHOT_ID
+       python -m app.cli.backup restore SNAPSHOT_ID [--data-dir DIR]
+
+create is safe while the server runs. Stop the server before restore: the
+current data directory is moved aside and replaced by the snapshot.
+"""
+import argparse
+import sys
+
+from app.core.config import settings
+from app.utils.backup import BackupError, BackupStore
+from app.utils.file_db import FileDB
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Data directory snapshots")
+    parser.add_argument("--backup-dir", default=settings.BACKUP_DIR, help="where snapshots are kept")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="take a snapshot now")
+    create.add_argument("--incremental", action="store_true", help="store only files changed since the last snapshot")
+    commands.add_parser("list", help="list snapshots")
+    verify = commands.add_parser("verify", help="check a snapshot's checksums")
+    verify.add_argument("snapshot_id")
+    restore = commands.add_parser("restore", help="replace the data directory with a snapshot")
+    restore.add_argument("snapshot_id")
+    restore.add_argument("--data-dir", default=settings.DATA_DIR)
+    args = parser.parse_args()
+
+    store = BackupStore(args.backup_dir)
+    try:
+        if args.command == "create":
+            snapshot = store.create(FileDB(settings.DATA_DIR), incremental=args.incremental)
+            print(f"{snapshot['id']}  base={snapshot['base']}  capture {snapshot['capture_ms']}ms  "
+                  f"total {snapshot['took_ms']}ms")
+        elif args.command == "list":
+            print(f"{'id':<24} {'base':<24} {'files':>6} {'stored':>6} {'bytes':>10}")
+            for snapshot in store.snapshots():
+                print(f"{snapshot['id']:<24} {snapshot['base'] or '-':<24} {len(snapshot['files']):>6} "
+                      f"{snapshot['stored_files']:>6} {snapshot['archive_bytes']:>10}")
+        elif args.command == "verify":
+            print(f"{args.snapshot_id}: {store.verify(args.snapshot_id)} files ok")
+        elif args.command == "restore":
+            store.restore(args.snapshot_id, args.data_dir)
+    except BackupError as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
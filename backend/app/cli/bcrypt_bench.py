@@ -0,0 +1,66 @@
+# backend/app/cli/bcrypt_bench.py
+"""Report login throughput per core at each bcrypt cost.
+
+Usage: python -m app.cli.bcrypt_bench [--min 10] [--max 14] [--seconds 2] [--processes N]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+
+def _verify_loop(rounds: int, seconds: float) -> int:
+    """Verify one password repeatedly for the given time, returning the count"""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+    hashed = context.hash("benchmark-password")
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        context.verify("benchmark-password", hashed)
+        count += 1
+    return count
+
+
+def bench(rounds: int, seconds: float, processes: int) -> dict:
+    """Measure verify latency on one core and throughput across processes"""
+    count = _verify_loop(rounds, seconds)
+    per_core = count / seconds
+    result = {
+        "rounds": rounds,
+        "verify_ms": 1000.0 / per_core if per_core else float("inf"),
+        "logins_per_sec_per_core": per_core,
+    }
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            counts = list(pool.map(_verify_loop, [rounds] * processes, [seconds] * processes))
+        result["logins_per_sec_total"] = sum(counts) / seconds
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="bcrypt login throughput benchmark")
+    parser.add_argument("--min", type=int, default=settings.BCRYPT_MIN_ROUNDS, help="lowest cost to test")
+    parser.add_argument("--max", type=int, default=settings.BCRYPT_MAX_ROUNDS, help="highest cost to test")
+    parser.add_argument("--seconds", type=float, default=2.0, help="measurement time per cost")
+    parser.add_argument("--processes", type=int, default=1, help=f"parallel processes (cpus: {os.cpu_count()})")
+    args = parser.parse_args()
+
+    header = f"{'cost':>4}  {'verify ms':>10}  {'logins/s/core':>14}"
+    if args.processes > 1:
+        header += f"  {f'logins/s x{args.processes}':>16}"
+    print(header)
+
+    for rounds in range(args.min, args.max + 1):
+        result = bench(rounds, args.seconds, args.processes)
+        line = f"{rounds:>4}  {result['verify_ms']:>10.1f}  {result['logins_per_sec_per_core']:>14.1f}"
+        if "logins_per_sec_total" in result:
+            line += f"  {result['logins_per_sec_total']:>16.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
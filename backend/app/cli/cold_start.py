@@ -0,0 +1,143 @@
+# backend/app/cli/cold_start.py
+"""Profile imports and measure time-to-first-response of a fresh process.
+
+Usage: python -m app.cli.cold_start [--top 25] [--path /api/health] [--runs 3] [--cold]
+
+Run from the backend directory. --cold sets COLD_START_MODE=true for the
+measured processes so both boot modes can be compared.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Executed in a fresh interpreter: import the app, run the ASGI lifespan
+# startup and send one GET request, reporting wall-clock timestamps.
+FIRST_RESPONSE_SCRIPT = r"""
+import json, sys, time
+t_start = time.time()
+import asyncio
+import app.main
+t_imported = time.time()
+
+async def main(path):
+    app_ = app.main.app
+    lifespan_events = asyncio.Queue()
+    await lifespan_events.put({"type": "lifespan.startup"})
+    started = asyncio.Event()
+    stop = asyncio.Event()
+
+    async def lifespan_receive():
+        message = await lifespan_events.get()
+        return message
+
+    async def lifespan_send(message):
+        if message["type"] == "lifespan.startup.complete":
+            started.set()
+        elif message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(message.get("message"))
+
+    lifespan = asyncio.create_task(app_({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, lifespan_receive, lifespan_send))
+    await started.wait()
+    t_started = time.time()
+
+    status = {}
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000), "server": ("localhost", 8000), "state": {},
+    }
+    await app_(scope, receive, send)
+    t_responded = time.time()
+
+    await lifespan_events.put({"type": "lifespan.shutdown"})
+    await lifespan
+    return t_started, t_responded, status.get("code")
+
+t_started, t_responded, code = asyncio.run(main(sys.argv[1]))
+print("RESULT " + json.dumps({
+    "start": t_start, "imported": t_imported, "started": t_started,
+    "responded": t_responded, "status": code,
+}))
+"""
+
+
+def import_report(top: int, env: dict) -> None:
+    """Print the slowest imports of app.main as reported by -X importtime"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, env=env
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        rows.append((cumulative_us, self_us, parts[2].rstrip()))
+
+    total = next((r for r in rows if r[2].strip() == "app.main"), None)
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f}  {self_us / 1000:>8.1f}  {name}")
+    if total:
+        print(f"\nimport app.main: {total[0] / 1000:.1f}ms")
+
+
+def first_response(path: str, env: dict) -> dict:
+    """Start a fresh interpreter and time each boot phase until the first response"""
+    launched = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-c", FIRST_RESPONSE_SCRIPT, path],
+        capture_output=True, text=True, env=env
+    )
+    result_line = next((l for l in proc.stdout.splitlines() if l.startswith("RESULT ")), None)
+    if result_line is None:
+        raise RuntimeError(proc.stderr or proc.stdout)
+    result = json.loads(result_line[len("RESULT "):])
+    return {
+        "interpreter_ms": (result["start"] - launched) * 1000,
+        "import_ms": (result["imported"] - result["start"]) * 1000,
+        "startup_ms": (result["started"] - result["imported"]) * 1000,
+        "first_request_ms": (result["responded"] - result["started"]) * 1000,
+        "time_to_first_response_ms": (result["responded"] - launched) * 1000,
+        "status": result["status"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold start profiler")
+    parser.add_argument("--top", type=int, default=25, help="number of imports to list")
+    parser.add_argument("--path", default="/api/health", help="path of the first request")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes to measure")
+    parser.add_argument("--cold", action="store_true", help="measure with COLD_START_MODE enabled")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.cold:
+        env["COLD_START_MODE"] = "true"
+
+    import_report(args.top, env)
+
+    print(f"\nTime to first response for GET {args.path} ({'cold start mode' if args.cold else 'default mode'})")
+    keys = ["interpreter_ms", "import_ms", "startup_ms", "first_request_ms", "time_to_first_response_ms"]
+    print("  ".join(f"{k:>26}" if k == keys[-1] else f"{k:>16}" for k in keys))
+    for _ in range(args.runs):
+        result = first_response(args.path, env)
+        print("  ".join(f"{result[k]:>26.1f}" if k == keys[-1] else f"{result[k]:>16.1f}" for k in keys))
+
+
+if __name__ == "__main__":
+    main()
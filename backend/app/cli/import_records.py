@@ -0,0 +1,62 @@
+# backend/app/cli/import_records.py
+"""Import enrollments or CollegeNinja signups from a CSV or NDJSON file.
+
+Usage: python -m app.cli.import_records COLLECTION FILE [--format csv|ndjson]
+                                        [--dry-run] [--send-emails] [--chunk-size N]
+
+COLLECTION is enrollments, collegeninja_students or collegeninja_counselors.
+When STORAGE_WRITER_SOCKET is set, rows are written through the running
+storage writer; otherwise stop the server first, since it would not see the
+rows written here until its files are reloaded.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.utils.file_db import file_db
+from app.utils.importer import IMPORTERS, IMPORT_FORMATS, Importer, detect_format, send_confirmations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import records")
+    parser.add_argument("collection", choices=list(IMPORTERS))
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="default: from the file extension")
+    parser.add_argument("--dry-run", action="store_true", help="validate and count without writing")
+    parser.add_argument("--send-emails", action="store_true", help="send each imported record its confirmation")
+    parser.add_argument("--chunk-size", type=int, help="rows per write (default IMPORT_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.file)
+    if fmt is None:
+        print("error: cannot tell the format from the file name, pass --format", file=sys.stderr)
+        sys.exit(1)
+
+    def progress(report) -> None:
+        print(f"  {report['rows']} rows read, {report['imported']} imported", flush=True)
+
+    importer = Importer(
+        file_db,
+        args.collection,
+        dry_run=args.dry_run,
+        keep_created=args.send_emails,
+        chunk_size=args.chunk_size,
+        progress=progress,
+    )
+    with open(args.file, 'rb') as f:
+        report = importer.run(f, fmt)
+
+    for error in report["errors"]:
+        print(f"  row {error['row']}: {error['error']}")
+    if report["errors_truncated"]:
+        print("  (more errors not shown)")
+    print(f"{report['imported']} imported, {report['duplicates']} duplicates, {report['invalid']} invalid "
+          f"of {report['rows']} rows in {report['took_ms']}ms{' (dry run)' if args.dry_run else ''}")
+
+    if importer.created:
+        sent = asyncio.run(send_confirmations(args.collection, importer.created))
+        print(f"{sent} confirmation emails sent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# backend/app/cli/memory_bench.py
+"""Compare the memory used by cached collections as dicts and as compact records.
+
+Usage: python -m app.cli.memory_bench [--records 100000] [--data-dir DIR]
+
+With --data-dir the collections are read from real data files, otherwise
+synthetic records shaped like the API models are generated.
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.utils.compact_records import COLLECTION_FIELDS, compact_all
+from app.utils.file_db import FileDB
+
+STATUSES = ["pending", "confirmed", "completed", "cancelled"]
+COURSES = ["Junior AI Program", "Generative AI Program", "CollegeNinja", "Interview Clinic"]
+COUNTRIES = ["USA", "Canada", "Other"]
+STUDENT_TYPES = ["HStudent", "MStudent", "CStudent", "Parent"]
+POSITIONS = ["AI Program Instructor", "Full-Stack Developer", "Program Coordinator"]
+
+
+def _timestamp(i: int, utc: bool) -> str:
+    moment = datetime(2024, 1, 1) + timedelta(seconds=i * 97, microseconds=i * 7919 % 1000000)
+    if utc:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.isoformat()
+
+
+def synthetic(collection: str, i: int) -> Dict[str, Any]:
+    """One record with realistic field values for a collection"""
+    person = {
+        "email": f"person{i}@example.com",
+        "phone": f"425-555-{i % 10000:04d}",
+    }
+    if collection == "users":
+        return {**person, "name": f"Person {i}", "role": "student", "country": random.choice(COUNTRIES),
+                "postal_code": f"98{i % 1000:03d}", "comments": None, "password_hash": "$2b$12$" + "x" * 53,
+                "id": str(uuid.uuid4()), "created_at": _timestamp(i, False), "is_active": True, "is_admin": False}
+    if collection == "enrollments":
+        return {"first_name": f"First{i}", "last_name": f"Last{i}", **person, "zip_code": f"98{i % 1000:03d}",
+                "course": random.choice(COURSES), "student_type": random.choice(STUDENT_TYPES),
+                "country": random.choice(COUNTRIES), "comments": None, "id": str(uuid.uuid4()),
+                "created_at": _timestamp(i, False), "status": random.choice(STATUSES)}
+    if collection == "schedules":
+        return {"id": f"sch_{i}", "created_at": _timestamp(i, True), "updated_at": _timestamp(i + 1, True),
+                "status": random.choice(STATUSES), "scheduled_date": None, "first_name": f"First{i}",
+                "last_name": f"Last{i}", **person, "country": random.choice(COUNTRIES),
+                "service_type": "consultation", "message": "", "zip_code": "", "student_type": ""}
+    if collection == "job_applications":
+        return {"id": f"job_{i}", "created_at": _timestamp(i, True), "status": "new", "name": f"Person {i}",
+                **person, "position": random.choice(POSITIONS), "resume_url": None,
+                "cover_letter": "I would like to teach.", "linkedin_url": None, "portfolio_url": None}
+    record = {"id": f"cn_{i}", "created_at": _timestamp(i, True), "status": "pending", "name": f"Person {i}",
+              **person, "zipCode": f"98{i % 1000:03d}"}
+    if collection == "collegeninja_students":
+        record.update(currentSchool="Newport High", gradeLevel="11")
+    return record
+
+
+def measure(build: Callable[[], Any]) -> Tuple[int, Any]:
+    """Bytes still allocated after build() returns, and its result"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def load_collections(args) -> Dict[str, str]:
+    """Raw JSON text per collection, from data files or generated"""
+    if args.data_dir:
+        db = FileDB(args.data_dir)
+        db.compact_records = False
+        return {c: json.dumps(db.get_collection(c), default=str) for c in COLLECTION_FIELDS}
+    random.seed(7)
+    return {c: json.dumps([synthetic(c, i) for i in range(args.records)]) for c in COLLECTION_FIELDS}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cached collection memory benchmark")
+    parser.add_argument("--records", type=int, default=100000, help="synthetic records per collection")
+    parser.add_argument("--data-dir", type=Path, default=None, help="measure real data files instead")
+    args = parser.parse_args()
+
+    print(f"{'collection':<24} {'records':>8}  {'dicts MB':>9}  {'compact MB':>10}  {'saved':>6}  {'load ms':>8}  lossless")
+    for collection, raw in load_collections(args).items():
+        dict_bytes, records = measure(lambda: json.loads(raw))
+        originals = json.loads(raw)
+
+        def build_compact() -> List[Any]:
+            compacted = json.loads(raw)
+            compact_all(collection, compacted)
+            return compacted
+
+        compact_bytes, compacted = measure(build_compact)
+        start = time.perf_counter()
+        compact_all(collection, json.loads(raw))
+        convert_ms = (time.perf_counter() - start) * 1000
+        lossless = all(record.to_dict() == original for record, original in zip(compacted, originals))
+
+        saved = 1 - compact_bytes / dict_bytes if dict_bytes else 0.0
+        print(f"{collection:<24} {len(records):>8}  {dict_bytes / 1e6:>9.1f}  {compact_bytes / 1e6:>10.1f}  "
+              f"{saved:>6.0%}  {convert_ms:>8.0f}  {'yes' if lossless else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# backend/app/core/catalog.py
+from typing import Any, Dict, List, Optional
+
+# Every course accepted by the enrollment form; entries of COURSES add details and capacity
+COURSE_NAMES: Dict[str, str] = {
+    "junior-ai": "Junior AI Program",
+    "generative-ai": "Generative AI Program",
+    "advanced-ai": "Advanced Generative AI Program",
+    "college-ninja": "CollegeNinja",
+    "junior-researcher": "High School Research Program",
+    "interview-clinic": "Interview Clinic",
+    "music-ai-research": "Music AI Research Program",
+}
+
+# Static course data; max_students is the seat count of each cohort, listed
+# in "cohorts" when a course runs several at once
+COURSES: List[Dict[str, Any]] = [
+    {
+        "id": "junior-ai",
+        "name": "Junior AI Program",
+        "description": "AI and Programming In Action - For Middle & High School Students",
+        "duration": "6 weeks (12 lesson hours)",
+        "max_students": 8,
+        "level": "beginner"
+    }
+]
+
+PROGRAMS: List[Dict[str, Any]] = []
+
+POSITIONS: List[Dict[str, Any]] = [
+    {
+        "id": "ai-instructor",
+        "title": "AI Program Instructor",
+        "type": "Part-time",
+        "location": "Remote"
+    },
+    {
+        "id": "fullstack-developer",
+        "title": "Full-Stack Developer",
+        "type": "Contract",
+        "location": "Remote"
+    },
+    {
+        "id": "program-coordinator",
+        "title": "Program Coordinator",
+        "type": "Part-time",
+        "location": "Remote"
+    },
+    {
+        "id": "marketing-partner",
+        "title": "Marketing Partner",
+        "type": "Contract",
+        "location": "Remote"
+    }
+]
+
+
+_COURSES_BY_NAME = {course["name"]: course for course in COURSES}
+
+
+def course_capacity(name: str) -> Optional[int]:
+    """Seats per cohort of a course, None when its enrollment is not capped"""
+    course = _COURSES_BY_NAME.get(name)
+    return course.get("max_students") if course else None
+
+
+def course_cohorts(name: str) -> List[str]:
+    """Cohorts an enrollment in a course must pick from, empty when it has none"""
+    course = _COURSES_BY_NAME.get(name)
+    return list(course.get("cohorts", [])) if course else []
+
+
+def build_catalogs() -> Dict[str, List[Dict[str, Any]]]:
+    """Catalogs as defined in code, used to publish the shared snapshot"""
+    return {"courses": COURSES, "programs": PROGRAMS, "positions": POSITIONS}
+
+
+def get_catalogs() -> Dict[str, List[Dict[str, Any]]]:
+    """Catalogs from the shared snapshot when attached, otherwise from code"""
+    from app.utils.shared_snapshot import shared_snapshot
+
+    return shared_snapshot.catalogs() or build_catalogs()
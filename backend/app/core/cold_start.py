@@ -0,0 +1,122 @@
+# backend/app/core/cold_start.py
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from starlette.routing import Mount
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+class LazyRouters:
+    """Router modules registered on the first request to their prefix.
+
+    Each spec is (module name under app.api, URL prefix, OpenAPI tag).
+    """
+
+    def __init__(self, app: FastAPI, specs: List[Tuple[str, str, str]]):
+        self.app = app
+        self.pending: Dict[str, Tuple[str, str]] = {prefix: (module, tag) for module, prefix, tag in specs}
+        # Import time per router in milliseconds, for the startup report
+        self.load_times: Dict[str, float] = {}
+
+    def load(self, prefix: str) -> None:
+        """Import and register the router for a prefix if still pending"""
+        spec = self.pending.pop(prefix, None)
+        if spec is None:
+            return
+        module_name, tag = spec
+        start = time.perf_counter()
+        module = importlib.import_module(f"app.api.{module_name}")
+        self.app.include_router(module.router, prefix=prefix, tags=[tag])
+        # Keep catch-all mounts such as the static site behind the API routes
+        routes = self.app.router.routes
+        mounts = [r for r in routes if isinstance(r, Mount) and r.path == ""]
+        for mount in mounts:
+            routes.remove(mount)
+            routes.append(mount)
+        # Routes changed, so any generated schema is out of date
+        self.app.openapi_schema = None
+        self.load_times[module_name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def load_all(self) -> None:
+        for prefix in list(self.pending):
+            self.load(prefix)
+
+    async def load_in_background(self, delay: float = 1.0) -> None:
+        """Register the remaining routers shortly after the first requests"""
+        await asyncio.sleep(delay)
+        for prefix in list(self.pending):
+            self.load(prefix)
+            # Yield between imports so requests keep being served
+            await asyncio.sleep(0)
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware loading a deferred router before its first request is routed"""
+
+    def __init__(self, app, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self.routers.pending:
+            path = scope.get("path", "")
+            if path in ("/openapi.json", "/docs", "/redoc"):
+                self.routers.load_all()
+            else:
+                for prefix in list(self.routers.pending):
+                    if path == prefix or path.startswith(prefix + "/"):
+                        self.routers.load(prefix)
+                        break
+        await self.app(scope, receive, send)
+
+
+def _source_fingerprint(app: FastAPI) -> str:
+    """Hash of the app version, routes and source files the schema is built from"""
+    digest = hashlib.sha256(app.version.encode())
+    for route in app.routes:
+        methods = ",".join(sorted(getattr(route, "methods", None) or []))
+        digest.update(f"{route.path}|{methods}|{getattr(route, 'name', '')}".encode())
+    for path in sorted(APP_DIR.rglob("*.py")):
+        stat = path.stat()
+        digest.update(f"{path.relative_to(APP_DIR)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def install_openapi_cache(app: FastAPI, cache_path: Path, routers: Optional[LazyRouters] = None) -> None:
+    """Serve the OpenAPI schema from disk while the code it was built from is unchanged"""
+
+    def openapi():
+        if app.openapi_schema:
+            return app.openapi_schema
+        if routers is not None:
+            routers.load_all()
+
+        fingerprint = _source_fingerprint(app)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") == fingerprint:
+                app.openapi_schema = cached["schema"]
+                return app.openapi_schema
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        schema = FastAPI.openapi(app)
+        try:
+            temp_file = Path(f"{cache_path}.{os.getpid()}.tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({"fingerprint": fingerprint, "schema": schema}, f, separators=(',', ':'))
+            os.replace(temp_file, cache_path)
+        except OSError as e:
+            print(f"Could not persist OpenAPI schema: {e}")
+        return schema
+
+    app.openapi = openapi
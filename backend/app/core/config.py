@@ -1,6 +1,6 @@
 # backend/app/core/config.py
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # Application
@@ -13,12 +13,96 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     RESET_CODE_EXPIRE_MINUTES: int = 15
 
+    # Rate limiting for auth endpoints
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_IP_PER_MINUTE: int = 20
+    RATE_LIMIT_EMAIL_PER_MINUTE: int = 5
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_MAX_CONCURRENT: int = 8
+    # Proxies whose X-Forwarded-For uvicorn honours in the prod profile (comma-separated
+    # addresses or CIDR ranges, or "*"); deployments behind an ingress must set this
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    # Password hashing cost, calibrated at startup unless BCRYPT_ROUNDS is set
+    BCRYPT_ROUNDS: Optional[int] = None
+    BCRYPT_TARGET_MS: float = 250.0
+    # passlib's default cost; calibration never goes below it
+    BCRYPT_MIN_ROUNDS: int = 12
+    BCRYPT_MAX_ROUNDS: int = 15
+
     # Database
     DATA_DIR: str = "./data"
 
+    # Startup: reuse recorded calibration and register routers on first use
+    COLD_START_MODE: bool = False
+    # Set by app.server once storage is prepared for all workers
+    LAUNCHER_PREPARED: bool = False
+
+    # Set by app.server when a dedicated storage writer process owns all writes
+    STORAGE_WRITER_SOCKET: Optional[str] = None
+    # Shared-memory snapshot of users and catalogs published by the storage writer
+    SHARED_SNAPSHOT_NAME: Optional[str] = None
+
+    # Keep cached records in the compact slotted form (see app.utils.compact_records)
+    COMPACT_RECORDS: bool = True
+
+    # Move old finished records to the compressed archive (see app.utils.retention)
+    RETENTION_ENABLED: bool = True
+    RETENTION_INTERVAL_HOURS: float = 24.0
+    RETENTION_START_DELAY_SECONDS: float = 60.0
+    RETENTION_BATCH_SIZE: int = 200
+    RETENTION_IO_BYTES_PER_SECOND: int = 2_000_000
+    # zstd or gzip; zstd when the zstandard package is installed
+    ARCHIVE_CODEC: Optional[str] = None
+
+    # Recent changes kept per process for /api/admin/changes
+    CHANGE_LOG_SIZE: int = 10000
+
+    # Admin live event stream: events buffered per client before the oldest are dropped
+    EVENT_STREAM_BUFFER: int = 256
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    EVENT_STREAM_MAX_CLIENTS: int = 100
+
+    # Most items accepted by one /api/admin/bulk request
+    BULK_UPDATE_MAX_ITEMS: int = 500
+
+    # Bulk CSV/NDJSON imports: rows written per FileDB transaction, row errors reported
+    IMPORT_CHUNK_SIZE: int = 10000
+    IMPORT_MAX_ERRORS: int = 1000
+
+    # Signup trends (needs numpy): most buckets one /api/admin/analytics call returns
+    ANALYTICS_MAX_BUCKETS: int = 1000
+
+    # Online snapshots of the data directory (see app.utils.backup)
+    BACKUP_DIR: str = "./backups"
+
+    # Follow data file changes from other workers: auto, inotify, poll or off
+    FILE_WATCH_MODE: str = "auto"
+    FILE_WATCH_POLL_INTERVAL: float = 0.2
+
     # Email
     MAILGUN_API_KEY: Optional[str] = None
     MAILGUN_DOMAIN: Optional[str] = None
+    # Concurrent sends of the pooled sender (see app.utils.email.EmailSender)
+    EMAIL_SENDER_WORKERS: int = 4
+
+    # Consultation reminders, sent this many hours before each scheduled_date
+    REMINDERS_ENABLED: bool = True
+    REMINDER_OFFSETS_HOURS: List[float] = [24.0, 1.0]
+
+    # Consultation length and staff working hours offered as free slots
+    CONSULTATION_MINUTES: int = 60
+    WORKING_HOURS: Dict[str, str] = {day: "09:00-17:00" for day in ["mon", "tue", "wed", "thu", "fri"]}
+    WORKING_TIMEZONE: str = "UTC"
+    AVAILABILITY_MAX_DAYS: int = 31
+
+    # Event loop lag monitor: heartbeat period, lag that counts as a stall and
+    # gets its stack captured, captures kept and frames per capture
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL: float = 0.05
+    LOOP_LAG_THRESHOLD_MS: float = 100.0
+    LOOP_MONITOR_OFFENDERS: int = 50
+    LOOP_MONITOR_STACK_DEPTH: int = 25
 
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
@@ -27,154 +111,3 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 settings = Settings()
-
-# backend/app/core/security.py
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from app.core.config import settings
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
-
-def decode_token(token: str) -> Optional[Dict[str, Any]]:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
-        return None
-
-# backend/app/models/user.py
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
-from datetime import datetime
-from enum import Enum
-
-class UserRole(str, Enum):
-    STUDENT = "student"
-    PARENT = "parent"
-    TEACHER = "teacher"
-    VISITOR = "visitor"
-    ADMIN = "admin"
-
-class UserBase(BaseModel):
-    email: EmailStr
-    name: str
-    role: UserRole
-    country: str
-    postal_code: str
-    comments: Optional[str] = None
-
-class UserCreate(UserBase):
-    password: str = Field(..., min_length=8)
-
-class UserLogin(BaseModel):
-    email: EmailStr
-    password: str
-
-class UserInDB(UserBase):
-    id: str
-    password_hash: str
-    created_at: datetime
-    is_active: bool = True
-    is_admin: bool = False
-
-class User(UserBase):
-    id: str
-    created_at: datetime
-    is_active: bool
-    is_admin: bool
-
-class UserUpdate(BaseModel):
-    name: Optional[str] = None
-    role: Optional[UserRole] = None
-    country: Optional[str] = None
-    postal_code: Optional[str] = None
-    comments: Optional[str] = None
-    is_active: Optional[bool] = None
-    is_admin: Optional[bool] = None
-
-class Token(BaseModel):
-    access_token: str
-    token_type: str = "bearer"
-
-class TokenData(BaseModel):
-    email: Optional[str] = None
-
-class PasswordReset(BaseModel):
-    email: EmailStr
-
-class PasswordResetConfirm(BaseModel):
-    email: EmailStr
-    code: str
-    new_password: str = Field(..., min_length=8)
-
-# backend/app/models/enrollment.py
-from pydantic import BaseModel, EmailStr
-from datetime import datetime
-from typing import Optional
-
-class EnrollmentBase(BaseModel):
-    first_name: str
-    last_name: str
-    email: EmailStr
-    phone: str
-    zip_code: str
-    course: str
-    student_type: str
-    country: str
-    comments: Optional[str] = None
-
-class EnrollmentCreate(EnrollmentBase):
-    pass
-
-class Enrollment(EnrollmentBase):
-    id: str
-    created_at: datetime
-    status: str = "pending"  # pending, confirmed, completed
-
-class EnrollmentUpdate(BaseModel):
-    status: Optional[str] = None
-
-# backend/app/models/schedule.py
-from pydantic import BaseModel, EmailStr
-from datetime import datetime
-from typing import Optional
-
-class ScheduleBase(BaseModel):
-    first_name: str
-    last_name: str
-    email: EmailStr
-    phone: str
-    zip_code: str
-    student_type: str
-    country: str
-    comments: Optional[str] = None
-
-class ScheduleCreate(ScheduleBase):
-    pass
-
-class Schedule(ScheduleBase):
-    id: str
-    created_at: datetime
-    status: str = "pending"  # pending, scheduled, completed
-
-class ScheduleUpdate(BaseModel):
-    status: Optional[str] = None
-    scheduled_date: Optional[datetime] = None
\ No newline at end of file
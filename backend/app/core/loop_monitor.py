@@ -0,0 +1,198 @@
+# backend/app/core/loop_monitor.py
+"""Event loop lag monitor.
+
+A heartbeat task sleeps for LOOP_MONITOR_INTERVAL and records how late it
+wakes up. That delay is how long something held the event loop, and it goes
+into a histogram. A watchdog thread checks the heartbeat: once it is more
+than LOOP_LAG_THRESHOLD_MS overdue, the loop is blocked right now. The
+watchdog then captures the loop thread's stack, which shows the blocking
+call, and the request the running task is serving. The capture is completed
+with the stall's full length when the heartbeat runs again.
+"""
+import asyncio
+import bisect
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings
+
+# Upper bounds of the lag histogram buckets, in milliseconds
+LAG_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def route_of(scope: Dict[str, Any]) -> str:
+    """Method and route template of a request, or its path before routing"""
+    route = scope.get("route")
+    return f"{scope.get('method', '')} {getattr(route, 'path', None) or scope.get('path', '')}"
+
+
+class LoopMonitor:
+    """Lag histogram and blocking-call captures for the event loop it is started on"""
+
+    def __init__(self, interval: Optional[float] = None, threshold_ms: Optional[float] = None):
+        self.interval = interval or settings.LOOP_MONITOR_INTERVAL
+        self.threshold = (threshold_ms or settings.LOOP_LAG_THRESHOLD_MS) / 1000
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        # Monotonic time the heartbeat last ran
+        self._heartbeat = 0.0
+        # Capture of the stall under way, completed by the next heartbeat
+        self._stall: Optional[Dict[str, Any]] = None
+        # Request served by each running task, set by LoopMonitorMiddleware
+        self.requests: Dict[asyncio.Task, Dict[str, Any]] = {}
+        self.reset()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def reset(self) -> None:
+        """Forget recorded lag and offenders"""
+        with self._lock:
+            self.histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+            self.samples = 0
+            self.total_lag = 0.0
+            self.max_lag = 0.0
+            self.stalls = 0
+            self.offenders: Deque[Dict[str, Any]] = deque(maxlen=settings.LOOP_MONITOR_OFFENDERS)
+            self.by_route: Dict[str, Dict[str, float]] = {}
+
+    def _record(self, lag: float, now: float) -> None:
+        lag_ms = lag * 1000
+        with self._lock:
+            self._heartbeat = now
+            self.samples += 1
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            self.histogram[bisect.bisect_left(LAG_BUCKETS_MS, lag_ms)] += 1
+            if lag >= self.threshold:
+                self.stalls += 1
+            stall, self._stall = self._stall, None
+            if stall is None:
+                return
+            stall["lag_ms"] = round(lag_ms, 1)
+            route = self.by_route.setdefault(stall["route"], {"stalls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            route["stalls"] += 1
+            route["total_ms"] += lag_ms
+            route["max_ms"] = max(route["max_ms"], lag_ms)
+        print(f"Event loop blocked for {lag_ms:.0f}ms in {stall['route']} at {stall['stack'][-1].strip().splitlines()[0]}")
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._record(max(0.0, now - expected), now)
+
+    def _capture(self) -> None:
+        """Record the loop thread's stack if the heartbeat is overdue and this stall is not captured yet"""
+        heartbeat = self._heartbeat
+        if self._stall is not None or time.monotonic() - heartbeat - self.interval < self.threshold:
+            return
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        # The limit keeps the innermost frames, so the blocking call itself is always there
+        stack = traceback.format_stack(frame, limit=settings.LOOP_MONITOR_STACK_DEPTH)
+        task = asyncio.current_task(self._loop)
+        scope = self.requests.get(task)
+        with self._lock:
+            if self._heartbeat != heartbeat:
+                # The loop moved on while the stack was read; it may show later code
+                return
+            self._stall = {
+                "at": datetime.now(timezone.utc).isoformat(),
+                "route": route_of(scope) if scope else "(no request)",
+                "task": task.get_name() if task else None,
+                "lag_ms": None,
+                "stack": stack,
+            }
+            self.offenders.append(self._stall)
+
+    def _watch(self) -> None:
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stopping.wait(poll):
+            try:
+                self._capture()
+            except Exception as e:
+                print(f"Loop monitor watchdog failed: {e}")
+
+    def start(self) -> None:
+        """Start the heartbeat on the running event loop and the watchdog thread"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task is None or self._loop is not asyncio.get_running_loop():
+            # Another event loop started the monitor and stops it itself
+            return
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join(timeout=1)
+        self._watchdog = None
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            bounds: List[Optional[float]] = LAG_BUCKETS_MS + [None]
+            return {
+                "running": self.running,
+                "interval_ms": self.interval * 1000,
+                "threshold_ms": self.threshold * 1000,
+                "samples": self.samples,
+                "mean_lag_ms": round(self.total_lag / self.samples * 1000, 3) if self.samples else 0.0,
+                "max_lag_ms": round(self.max_lag * 1000, 1),
+                "stalls": self.stalls,
+                "histogram": [{"le_ms": bound, "count": count} for bound, count in zip(bounds, self.histogram)],
+                "routes": sorted(
+                    ({"route": route, **{k: round(v, 1) for k, v in counts.items()}} for route, counts in self.by_route.items()),
+                    key=lambda r: r["total_ms"],
+                    reverse=True,
+                ),
+                # Newest first; a capture still under way has no lag_ms yet
+                "offenders": [dict(offender) for offender in reversed(self.offenders)],
+            }
+
+
+class LoopMonitorMiddleware:
+    """ASGI middleware noting which request each task serves, so stalls name their route"""
+
+    def __init__(self, app, monitor: Optional[LoopMonitor] = None):
+        self.app = app
+        self.monitor = monitor or loop_monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.monitor.running:
+            await self.app(scope, receive, send)
+            return
+        task = asyncio.current_task()
+        self.monitor.requests[task] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.requests.pop(task, None)
+
+
+# Global instance, started by the application lifespan when LOOP_MONITOR_ENABLED
+loop_monitor = LoopMonitor()
@@ -0,0 +1,211 @@
+# backend/app/core/rate_limit.py
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from app.core.config import settings
+
+# Auth endpoints guarded by the limiter, mapped to the body/query field holding the email
+GUARDED_PATHS = {
+    "/api/auth/login": "username",
+    "/api/auth/register": "email",
+    "/api/auth/password-reset": "email",
+    "/api/auth/password-reset-confirm": "email",
+    "/api/auth/verify-code": "email",
+}
+
+
+class TokenBucketStore:
+    """Token buckets keyed by string, evicting the least recently used keys"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> [tokens, last refill time]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def allow(self, key: str, per_minute: int, now: Optional[float] = None) -> Tuple[bool, float]:
+        """Take one token for key; returns (allowed, seconds until a token is available)"""
+        now = time.monotonic() if now is None else now
+        rate = per_minute / 60.0
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(per_minute), now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(float(per_minute), bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return True, 0.0
+            return False, (1.0 - bucket[0]) / rate
+
+
+class RateLimiter:
+    """Per-IP and per-email limits plus a concurrency cap for auth endpoints"""
+
+    def __init__(self):
+        self.ip_buckets = TokenBucketStore(settings.RATE_LIMIT_MAX_KEYS)
+        self.email_buckets = TokenBucketStore(settings.RATE_LIMIT_MAX_KEYS)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self.allowed = 0
+        # path -> reason -> count
+        self.rejections: Dict[str, Dict[str, int]] = {}
+
+    def _reject(self, path: str, reason: str) -> None:
+        with self._lock:
+            by_reason = self.rejections.setdefault(path, {})
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+
+    def check(self, path: str, ip: str, email: Optional[str]) -> Optional[Tuple[int, str, float]]:
+        """Return (status, reason, retry_after) when the request must be rejected"""
+        allowed, retry_after = self.ip_buckets.allow(f"{path}|{ip}", settings.RATE_LIMIT_IP_PER_MINUTE)
+        if not allowed:
+            self._reject(path, "ip")
+            return 429, "ip", retry_after
+
+        if email:
+            allowed, retry_after = self.email_buckets.allow(
+                f"{path}|{email.strip().lower()}", settings.RATE_LIMIT_EMAIL_PER_MINUTE
+            )
+            if not allowed:
+                self._reject(path, "email")
+                return 429, "email", retry_after
+
+        with self._lock:
+            if self.in_flight >= settings.RATE_LIMIT_MAX_CONCURRENT:
+                overloaded = True
+            else:
+                overloaded = False
+                self.in_flight += 1
+                self.allowed += 1
+        if overloaded:
+            self._reject(path, "overload")
+            return 503, "overload", 1.0
+        return None
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rejections = {path: dict(reasons) for path, reasons in self.rejections.items()}
+            return {
+                "enabled": settings.RATE_LIMIT_ENABLED,
+                "allowed": self.allowed,
+                "in_flight": self.in_flight,
+                "rejected_total": sum(sum(r.values()) for r in rejections.values()),
+                "rejections": rejections,
+                "tracked_ips": len(self.ip_buckets),
+                "tracked_emails": len(self.email_buckets),
+            }
+
+
+def _client_ip(scope) -> str:
+    # Behind a proxy, uvicorn's proxy_headers has already put the address the
+    # trusted hops (FORWARDED_ALLOW_IPS) reported here; the raw header is client-controlled
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _extract_email(scope, body: bytes, field: str) -> Optional[str]:
+    """Find the target email in the query string, JSON body or form body"""
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    if query.get(field):
+        return query[field][0]
+
+    content_type = ""
+    for name, value in scope.get("headers", []):
+        if name == b"content-type":
+            content_type = value.decode("latin-1")
+            break
+
+    try:
+        if "application/json" in content_type:
+            data = json.loads(body or b"{}")
+            value = data.get(field) if isinstance(data, dict) else None
+            return value if isinstance(value, str) else None
+        if "application/x-www-form-urlencoded" in content_type:
+            values = parse_qs(body.decode("utf-8")).get(field)
+            return values[0] if values else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return None
+
+
+class RateLimitMiddleware:
+    """ASGI middleware rejecting abusive auth traffic before any bcrypt or storage work"""
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.RATE_LIMIT_ENABLED
+            or scope.get("method") != "POST"
+            or scope.get("path") not in GUARDED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Buffer the body so the email can be read, then replay it to the app
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        path = scope["path"]
+        rejection = self.limiter.check(path, _client_ip(scope), _extract_email(scope, body, GUARDED_PATHS[path]))
+        if rejection is not None:
+            status_code, reason, retry_after = rejection
+            detail = "Too many requests" if status_code == 429 else "Server busy, please retry"
+            payload = json.dumps({"detail": detail}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode()),
+                    (b"retry-after", str(max(1, int(retry_after + 0.999))).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": payload})
+            return
+
+        replayed = False
+
+        async def replay_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        try:
+            await self.app(scope, replay_receive, send)
+        finally:
+            self.limiter.release()
+
+
+# Global instance
+rate_limiter = RateLimiter()
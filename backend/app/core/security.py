@@ -1,22 +1,124 @@
 # backend/app/core/security.py
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import json
+import os
+import time
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# python-jose and passlib are imported on first use to keep cold starts fast
+_pwd_context = None
+_bcrypt_options: Dict[str, Any] = {}
+
+# Result of the last bcrypt cost calibration, see calibrate_bcrypt_rounds
+bcrypt_calibration: Dict[str, Any] = {}
+
+def get_pwd_context():
+    """Get the passlib context, creating it on first use"""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", **_bcrypt_options)
+    return _pwd_context
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash was made with a lower cost than currently configured"""
+    if not get_pwd_context().needs_update(hashed_password):
+        return False
+    # Never rehash down to fewer rounds than the stored hash has ($2b$<rounds>$...)
+    rounds = _bcrypt_options.get("bcrypt__default_rounds")
+    try:
+        return rounds is None or int(hashed_password.split('$')[2]) < rounds
+    except (IndexError, ValueError):
+        return True
+
+def configure_bcrypt_rounds(rounds: int) -> None:
+    """Hash new passwords with the given cost and flag weaker hashes for rehash"""
+    _bcrypt_options.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    if _pwd_context is not None:
+        _pwd_context.update(**_bcrypt_options)
+
+def measure_bcrypt_ms(rounds: int, samples: int = 3) -> float:
+    """Measure the median time in milliseconds to hash at the given cost"""
+    from passlib.context import CryptContext
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+def calibrate_bcrypt_rounds(target_ms: Optional[float] = None, record_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Pick the highest bcrypt cost whose hash time stays within the target latency"""
+    target_ms = target_ms or settings.BCRYPT_TARGET_MS
+    min_rounds = settings.BCRYPT_MIN_ROUNDS
+
+    if settings.BCRYPT_ROUNDS:
+        rounds = settings.BCRYPT_ROUNDS
+        hash_ms = measure_bcrypt_ms(rounds, samples=1)
+        source = "configured"
+    else:
+        # Each extra round doubles the work, so one measurement predicts the rest
+        base_ms = measure_bcrypt_ms(min_rounds)
+        rounds = min_rounds
+        while rounds < settings.BCRYPT_MAX_ROUNDS and base_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+            rounds += 1
+        hash_ms = base_ms * 2 ** (rounds - min_rounds)
+        source = "calibrated"
+
+    configure_bcrypt_rounds(rounds)
+    bcrypt_calibration.clear()
+    bcrypt_calibration.update({
+        "rounds": rounds,
+        "source": source,
+        "target_ms": target_ms,
+        "hash_ms": round(hash_ms, 1),
+        "cpu_count": os.cpu_count(),
+        "calibrated_at": datetime.now(timezone.utc).isoformat()
+    })
+    print(f"bcrypt cost {rounds} ({source}): ~{hash_ms:.0f}ms per hash, target {target_ms:.0f}ms")
+
+    if record_path is not None:
+        temp_file = Path(f"{record_path}.{os.getpid()}.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(bcrypt_calibration, f, indent=2)
+        os.replace(temp_file, record_path)
+
+    return dict(bcrypt_calibration)
+
+def load_bcrypt_calibration(record_path: Path) -> bool:
+    """Apply a previously recorded calibration without measuring again"""
+    if settings.BCRYPT_ROUNDS:
+        return False
+    try:
+        with open(record_path, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+        rounds = int(record["rounds"])
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return False
+    if rounds < settings.BCRYPT_MIN_ROUNDS:
+        # Recorded under a lower floor; measure again
+        return False
+
+    configure_bcrypt_rounds(rounds)
+    bcrypt_calibration.clear()
+    bcrypt_calibration.update(record)
+    bcrypt_calibration["source"] = "recorded"
+    return True
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
+    from jose import jwt
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -28,8 +130,9 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """Decode JWT token"""
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
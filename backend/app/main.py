@@ -3,24 +3,141 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import os
+import time
 from pathlib import Path
 
-from app.api import auth, users, courses, enrollments, schedules, job_applications, collegeninja
 from app.core.config import settings
-from app.utils.file_db import FileDB
+from app.core.cold_start import LazyRouters, LazyRouterMiddleware, install_openapi_cache
+from app.core.loop_monitor import LoopMonitorMiddleware, loop_monitor
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.security import calibrate_bcrypt_rounds, load_bcrypt_calibration
+from app.utils.file_db import file_db, COLLECTIONS
+from app.utils.search_index import search_index
+from app.utils.email_index import email_index
+from app.utils.zip_index import zip_index
+from app.utils.analytics import signup_analytics
+from app.utils.shared_snapshot import shared_snapshot
+from app.utils.retention import retention_job
+from app.utils.reminders import reminder_scheduler
+from app.utils.email import email_sender
+from app.utils.event_hub import event_hub
 
-# Initialize file database
-file_db = FileDB()
+async def timed(coro):
+    """Await a coroutine and return its wall time in milliseconds"""
+    start = time.perf_counter()
+    await coro
+    return round((time.perf_counter() - start) * 1000, 1)
+
+async def open_storage():
+    """Warm the file cache, then build the indexes"""
+    # Replicas mapping the shared snapshot serve auth lookups from it and never load users.json
+    collections = [c for c in COLLECTIONS if c != "users" or not shared_snapshot.ready]
+    await file_db.prewarm(collections)
+    await asyncio.gather(
+        asyncio.to_thread(search_index.open, file_db, file_db.data_dir / "search_index.json"),
+        asyncio.to_thread(email_index.open, file_db, collections),
+        asyncio.to_thread(zip_index.open, file_db),
+        asyncio.to_thread(signup_analytics.open, file_db),
+        asyncio.to_thread(file_db.seats.rebuild),
+    )
+
+def claim_jobs_lock(lock_file: Path):
+    """Non-blocking exclusive lock electing the one worker that runs a job; None if another holds it"""
+    try:
+        import fcntl
+    except ImportError:
+        # No forked workers on Windows, so there is nobody to elect between
+        return lock_file
+    f = open(lock_file, "a")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    # Held until the process exits or the lifespan closes it
+    return f
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting up...")
+    start = time.perf_counter()
     file_db.initialize_files()
+    calibration_file = file_db.data_dir / "bcrypt_calibration.json"
+    background = []
+
+    if (settings.COLD_START_MODE or settings.LAUNCHER_PREPARED) and load_bcrypt_calibration(calibration_file):
+        # Reuse the cost recorded by the launcher or an earlier replica instead of measuring
+        calibration = asyncio.sleep(0)
+    else:
+        calibration = asyncio.to_thread(calibrate_bcrypt_rounds, None, calibration_file)
+        if settings.COLD_START_MODE:
+            # First boot without a record: calibrate once the replica is serving
+            background.append(asyncio.create_task(calibration))
+            calibration = asyncio.sleep(0)
+
+    if settings.SHARED_SNAPSHOT_NAME:
+        shared_snapshot.attach(settings.SHARED_SNAPSHOT_NAME)
+    # bcrypt releases the GIL, so calibration overlaps with loading the data
+    bcrypt_ms, storage_ms = await asyncio.gather(
+        timed(calibration),
+        timed(open_storage()),
+    )
+    file_db.reset_codes.start_sweeper()
+    file_db.changes.add_listener(event_hub.on_change)
+    # One process archives and sends reminders: the storage writer when there is one, otherwise
+    # the worker holding the jobs lock (uvicorn --workers N started without app.server)
+    jobs_lock = None if settings.STORAGE_WRITER_SOCKET else claim_jobs_lock(file_db.data_dir / "jobs.lock")
+    owns_jobs = jobs_lock is not None
+    run_retention = settings.RETENTION_ENABLED and owns_jobs
+    if run_retention:
+        retention_job.start()
+    run_reminders = settings.REMINDERS_ENABLED and owns_jobs
+    if run_reminders:
+        reminder_scheduler.start()
+    watch_mode = file_db.watch(settings.FILE_WATCH_MODE, settings.FILE_WATCH_POLL_INTERVAL)
+    # The storage writer keeps no search index, so workers elect the one that persists it
+    index_lock = claim_jobs_lock(file_db.data_dir / "search_index.lock")
+    if lazy_routers.pending:
+        background.append(asyncio.create_task(lazy_routers.load_in_background()))
+
+    app.state.startup_timings = {
+        "bcrypt_calibration_ms": bcrypt_ms,
+        "storage_and_indexes_ms": storage_ms,
+        "total_ms": round((time.perf_counter() - start) * 1000, 1),
+        "file_watch": watch_mode,
+        "retention": run_retention,
+        "reminders": run_reminders,
+    }
+    print(f"Startup complete: {app.state.startup_timings}")
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
     yield
     # Shutdown
     print("Shutting down...")
+    await loop_monitor.stop()
+    for task in background:
+        task.cancel()
+    event_hub.close()
+    file_db.changes.remove_listener(event_hub.on_change)
+    file_db.unwatch()
+    shared_snapshot.detach()
+    if run_retention:
+        await retention_job.stop()
+    if run_reminders:
+        await reminder_scheduler.stop()
+    if hasattr(jobs_lock, "close"):
+        jobs_lock.close()
+    await email_sender.stop()
+    await file_db.reset_codes.stop_sweeper()
+    if index_lock is not None and (watch_mode != "off" or not settings.LAUNCHER_PREPARED):
+        # Without the watcher each worker's index only saw its own writes; the
+        # launcher rebuilds the persisted index on the next start instead
+        search_index.save(file_db, file_db.data_dir / "search_index.json")
+    if hasattr(index_lock, "close"):
+        index_lock.close()
 
 app = FastAPI(
     title="StemPro Academy API",
@@ -29,6 +146,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Reject auth floods before they reach bcrypt; added first so CORS wraps
+# its 429 and 503 responses and browsers can read Retry-After
+app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -36,16 +157,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Not a safelisted response header; the rate limiter's clients need it
+    expose_headers=["Retry-After"],
 )
 
-# API Routes
-app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
-app.include_router(users.router, prefix="/api/users", tags=["users"])
-app.include_router(courses.router, prefix="/api/courses", tags=["courses"])
-app.include_router(enrollments.router, prefix="/api/enrollments", tags=["enrollments"])
-app.include_router(schedules.router, prefix="/api/schedules", tags=["schedules"])
-app.include_router(job_applications.router, prefix="/api/job-applications", tags=["job-applications"])
-app.include_router(collegeninja.router, prefix="/api/collegeninja", tags=["collegeninja"])
+# Outermost, so a stall anywhere in a request is attributed to it
+app.add_middleware(LoopMonitorMiddleware)
+
+# API Routes: (module in app.api, prefix, tag)
+lazy_routers = LazyRouters(app, [
+    ("auth", "/api/auth", "authentication"),
+    ("users", "/api/users", "users"),
+    ("courses", "/api/courses", "courses"),
+    ("enrollments", "/api/enrollments", "enrollments"),
+    ("schedules", "/api/schedules", "schedules"),
+    ("job_applications", "/api/job-applications", "job-applications"),
+    ("collegeninja", "/api/collegeninja", "collegeninja"),
+    ("admin", "/api/admin", "admin"),
+])
+
+if settings.COLD_START_MODE:
+    # Import each router on the first request to its prefix, the rest after startup
+    app.add_middleware(LazyRouterMiddleware, routers=lazy_routers)
+else:
+    lazy_routers.load_all()
+
+# Serve the OpenAPI schema from disk while the code is unchanged
+install_openapi_cache(app, Path(settings.DATA_DIR) / "openapi_cache.json", lazy_routers)
 
 # Serve static files in production
 if settings.ENVIRONMENT == "production":
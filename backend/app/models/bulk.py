@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List
+
+class BulkUpdateItem(BaseModel):
+    id: str
+    changes: Dict[str, Any]
+
+class BulkUpdateRequest(BaseModel):
+    updates: List[BulkUpdateItem]
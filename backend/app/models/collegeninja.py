@@ -30,4 +30,7 @@ class CollegeNinjaCounselorCreate(CollegeNinjaCounselorBase):
 class CollegeNinjaCounselor(CollegeNinjaCounselorBase):
     id: str
     created_at: datetime
-    status: str = "pending"  # pending, contacted, partner
\ No newline at end of file
+    status: str = "pending"  # pending, contacted, partner
+
+class CollegeNinjaStatusUpdate(BaseModel):
+    status: Optional[str] = None
@@ -12,6 +12,7 @@ class EnrollmentBase(BaseModel):
     student_type: str
     country: str
     comments: Optional[str] = None
+    cohort: Optional[str] = None
 
 class EnrollmentCreate(EnrollmentBase):
     pass
@@ -19,7 +20,8 @@ class EnrollmentCreate(EnrollmentBase):
 class Enrollment(EnrollmentBase):
     id: str
     created_at: datetime
-    status: str = "pending"  # pending, confirmed, completed
+    updated_at: Optional[datetime] = None
+    status: str = "pending"  # pending, waitlisted, confirmed, completed
 
 class EnrollmentUpdate(BaseModel):
     status: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,195 @@
+# backend/app/server.py
+"""Production server launcher with tuned uvicorn profiles.
+
+Usage: python -m app.server [--profile dev|prod|load-test] [--host 0.0.0.0] [--port 8000] [--workers N]
+                            [--storage-writer]
+
+The launcher prepares shared storage once (data files, bcrypt calibration,
+search index) before uvicorn spawns its workers, so workers start from the
+recorded state instead of racing to create it.
+
+A dedicated storage writer process owns every data file write and the
+workers keep read-only replicas fed by its change stream, see
+app.utils.storage_writer. FileDB does unlocked read-modify-write on its JSON
+files and keeps seat counts, bookings and reset codes in memory, so the
+writer is always started when there is more than one worker; --storage-writer
+also starts it for a single worker.
+"""
+import argparse
+import asyncio
+import importlib.util
+import math
+import multiprocessing
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "dev": {
+        "workers": 1,
+        "reload": True,
+        "log_level": "debug",
+        "access_log": True,
+        "timeout_keep_alive": 5,
+        "backlog": 128,
+        "timeout_graceful_shutdown": 5,
+    },
+    "prod": {
+        "workers": None,  # one per available CPU
+        "reload": False,
+        "log_level": "info",
+        "access_log": True,
+        # Longer than the ingress idle timeout so the proxy closes connections first
+        "timeout_keep_alive": 75,
+        "backlog": 2048,
+        "timeout_graceful_shutdown": 20,
+        # Trusted proxies come from FORWARDED_ALLOW_IPS, see build_config. Behind the
+        # Azure Container Apps ingress set it to the environment's private ranges
+        # (docker-compose.azure.yml does), or every visitor shares the ingress address
+        "proxy_headers": True,
+    },
+    "load-test": {
+        "workers": None,
+        "reload": False,
+        "log_level": "warning",
+        "access_log": False,
+        "timeout_keep_alive": 30,
+        "backlog": 4096,
+        "timeout_graceful_shutdown": 10,
+    },
+}
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """CPU quota of this container from cgroup v2 or v1, if one is set"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (FileNotFoundError, ValueError):
+        pass
+
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (FileNotFoundError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """CPUs this process may actually use: affinity capped by the cgroup quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, math.ceil(limit)))
+    return max(1, cpus)
+
+
+def prepare_storage() -> None:
+    """Create data files, record the bcrypt cost and persist the search index once"""
+    from app.core.security import calibrate_bcrypt_rounds
+    from app.utils.file_db import file_db
+    from app.utils.search_index import search_index
+
+    file_db.initialize_files()
+    calibrate_bcrypt_rounds(record_path=file_db.data_dir / "bcrypt_calibration.json")
+    asyncio.run(file_db.prewarm())
+    search_index.open(file_db, file_db.data_dir / "search_index.json")
+
+    # Workers read this through settings and skip their own calibration
+    os.environ["LAUNCHER_PREPARED"] = "true"
+
+
+def start_storage_writer() -> multiprocessing.Process:
+    """Start the single storage writer process and point workers at it"""
+    from app.core.config import settings
+    from app.utils.storage_writer import run_writer, wait_for_writer
+
+    socket_path = os.path.join(tempfile.gettempdir(), f"stempro-storage-{os.getpid()}.sock")
+    snapshot_name = f"stempro-snapshot-{os.getpid()}"
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_writer,
+        args=(settings.DATA_DIR, socket_path, snapshot_name),
+        name="storage-writer",
+        daemon=True,
+    )
+    process.start()
+    wait_for_writer(socket_path)
+
+    # Workers read these through settings, create a RemoteFileDB and map the snapshot
+    os.environ["STORAGE_WRITER_SOCKET"] = socket_path
+    os.environ["SHARED_SNAPSHOT_NAME"] = snapshot_name
+    return process
+
+
+def build_config(profile: str, host: str, port: int, workers: Optional[int]) -> Dict[str, Any]:
+    """uvicorn keyword arguments for a profile"""
+    from app.core.config import settings
+
+    config = dict(PROFILES[profile])
+    if config.get("proxy_headers"):
+        # Only these peers may set X-Forwarded-For; anyone else could pick a fresh rate-limit bucket
+        config["forwarded_allow_ips"] = settings.FORWARDED_ALLOW_IPS
+    if workers:
+        config["workers"] = workers
+    elif config["workers"] is None:
+        config["workers"] = int(os.environ.get("WEB_CONCURRENCY", available_cpus()))
+
+    if config["reload"]:
+        # uvicorn cannot reload with several workers
+        config["workers"] = 1
+
+    # Use the C event loop and HTTP parser when installed (uvicorn[standard])
+    config["loop"] = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    config["http"] = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+    config.update(host=host, port=port)
+    return config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="StemPro Academy API server")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default=os.environ.get("SERVER_PROFILE", "prod"))
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=None, help="override the profile worker count")
+    parser.add_argument(
+        "--storage-writer",
+        action="store_true",
+        default=os.environ.get("STORAGE_WRITER", "").lower() in ("1", "true", "yes"),
+        help="route all data writes through one storage writer process (always on with several workers)",
+    )
+    args = parser.parse_args()
+
+    config = build_config(args.profile, args.host, args.port, args.workers)
+    print(f"Starting profile '{args.profile}' with {config['workers']} worker(s), "
+          f"loop={config['loop']}, http={config['http']}, cpu limit={cgroup_cpu_limit()}")
+
+    if config["workers"] > 1:
+        prepare_storage()
+
+    # Several workers writing the same files directly would lose records
+    writer = start_storage_writer() if args.storage_writer or config["workers"] > 1 else None
+
+    import uvicorn
+    try:
+        uvicorn.run("app.main:app", **config)
+    finally:
+        if writer is not None:
+            writer.terminate()
+            writer.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
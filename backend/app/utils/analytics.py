@@ -0,0 +1,288 @@
+# backend/app/utils/analytics.py
+"""Signup trends computed on columnar arrays.
+
+Each collection keeps three parallel NumPy arrays (creation time in seconds,
+category code and status code) plus an id -> row map, built once at startup
+and then updated in place from FileDB writes. Removed records only clear
+their row's live flag, and the arrays are compacted once dead rows outnumber
+live ones. A trend query is a handful of vectorized passes (mask, bucket,
+bincount, cumsum) over those arrays instead of a scan of the records.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional, /api/admin/analytics answers 503 without it
+    np = None
+
+from app.utils.change_log import REMOVAL_OPS
+
+# Category field per collection (None: counted as a whole)
+ANALYTICS_FIELDS: Dict[str, Optional[str]] = {
+    "enrollments": "course",
+    "schedules": "service_type",
+    "job_applications": "position",
+    "collegeninja_students": "gradeLevel",
+    "collegeninja_counselors": None,
+}
+
+# Statuses a record reaches once it converts
+CONVERTED_STATUSES: Dict[str, List[str]] = {
+    "enrollments": ["confirmed", "completed"],
+    "schedules": ["scheduled", "completed"],
+    "job_applications": ["accepted"],
+    "collegeninja_students": ["enrolled"],
+    "collegeninja_counselors": ["partner"],
+}
+
+INTERVALS = ["day", "week", "month"]
+
+DAY = 86400
+# 1970-01-01 was a Thursday; shifting by 3 days makes weeks start on Monday
+WEEK_SHIFT = 3 * DAY
+
+
+def created_seconds(record: Dict[str, Any]) -> Optional[int]:
+    """created_at as UTC epoch seconds"""
+    value = record.get('created_at')
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    # Records written with utcnow() carry no offset
+    return int((parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)).timestamp())
+
+
+def bucket_ids(seconds: "np.ndarray", interval: str) -> "np.ndarray":
+    """Bucket number of each timestamp: days, Monday-based weeks or months since 1970"""
+    if interval == "day":
+        return seconds // DAY
+    if interval == "week":
+        return (seconds + WEEK_SHIFT) // (7 * DAY)
+    return seconds.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+
+
+def bucket_range(interval: str, start: datetime, end: datetime) -> List[int]:
+    """First and last bucket numbers touched by [start, end]"""
+    return bucket_ids(np.array([start.timestamp(), end.timestamp()], dtype=np.int64), interval).tolist()
+
+
+def bucket_start(bucket: int, interval: str) -> datetime:
+    """First instant of a bucket number"""
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    if interval == "day":
+        return epoch + timedelta(days=int(bucket))
+    if interval == "week":
+        return epoch + timedelta(weeks=int(bucket)) - timedelta(days=3)
+    return datetime(1970 + int(bucket) // 12, int(bucket) % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+class _Codes:
+    """Interned strings as small ints"""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._code: Dict[str, int] = {}
+
+    def code(self, name: Optional[str]) -> int:
+        name = name or "unknown"
+        code = self._code.get(name)
+        if code is None:
+            code = self._code[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def lookup(self, name: str) -> int:
+        """Code of a known name, -1 otherwise"""
+        return self._code.get(name, -1)
+
+
+class ColumnStore:
+    """Creation time, category and status columns of one collection"""
+
+    def __init__(self, collection: str, capacity: int = 1024):
+        self.collection = collection
+        self.field = ANALYTICS_FIELDS[collection]
+        self.categories = _Codes()
+        self.statuses = _Codes()
+        self.size = 0
+        self.seconds = np.zeros(capacity, dtype=np.int64)
+        self.category = np.zeros(capacity, dtype=np.int32)
+        self.status = np.zeros(capacity, dtype=np.int16)
+        self.live = np.zeros(capacity, dtype=bool)
+        self._row_of: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def _grow(self) -> None:
+        capacity = len(self.seconds) * 2
+        for name in ("seconds", "category", "status", "live"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def put(self, record: Dict[str, Any]) -> None:
+        """Insert or update a record's row"""
+        row = self._row_of.get(record['id'])
+        if row is None:
+            seconds = created_seconds(record)
+            if seconds is None:
+                return
+            if self.size == len(self.seconds):
+                self._grow()
+            row = self._row_of[record['id']] = self.size
+            self.size += 1
+            self.seconds[row] = seconds
+            self.live[row] = True
+        self.category[row] = self.categories.code(record.get(self.field) if self.field else None)
+        self.status[row] = self.statuses.code(record.get('status'))
+
+    def remove(self, record_id: str) -> None:
+        row = self._row_of.pop(record_id, None)
+        if row is None:
+            return
+        self.live[row] = False
+        if self.size > 1024 and len(self._row_of) * 2 < self.size:
+            self._compact()
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self.live[:self.size])
+        # Rows keep their relative order, so each id's new row is its rank among the kept ones
+        new_row = np.cumsum(self.live[:self.size]) - 1
+        self._row_of = {record_id: int(new_row[row]) for record_id, row in self._row_of.items()}
+        for name in ("seconds", "category", "status", "live"):
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+        self.live[len(keep):self.size] = False
+        self.size = len(keep)
+
+    def series(
+        self,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        window: int,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Bucketed counts, trailing moving average and conversion rate between start and end"""
+        first, last = bucket_range(interval, start, end)
+        buckets = last - first + 1
+
+        seconds = self.seconds[:self.size]
+        mask = self.live[:self.size] & (seconds >= int(start.timestamp())) & (seconds <= int(end.timestamp()))
+        if category is not None:
+            mask &= self.category[:self.size] == self.categories.lookup(category)
+        index = bucket_ids(seconds[mask], interval) - first
+        codes = self.category[:self.size][mask]
+        statuses = self.status[:self.size][mask]
+
+        counts = np.bincount(index, minlength=buckets)
+        converted_codes = [self.statuses.lookup(s) for s in CONVERTED_STATUSES[self.collection]]
+        converted = np.bincount(index[np.isin(statuses, converted_codes)], minlength=buckets)
+
+        # Trailing mean over the last `window` buckets, shorter at the start of the range
+        total = np.concatenate(([0], np.cumsum(counts)))
+        right = np.arange(1, buckets + 1)
+        left = np.maximum(right - window, 0)
+        moving_average = (total[right] - total[left]) / (right - left)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.where(counts > 0, converted / counts, np.nan)
+
+        ncat = len(self.categories.names)
+        by_category = np.bincount(index * ncat + codes, minlength=buckets * ncat).reshape(buckets, ncat)
+        totals = by_category.sum(axis=0)
+
+        return {
+            "buckets": [bucket_start(first + n, interval).date().isoformat() for n in range(buckets)],
+            "counts": counts.tolist(),
+            "moving_average": np.round(moving_average, 3).tolist(),
+            "converted": converted.tolist(),
+            "conversion_rate": [None if np.isnan(r) else round(float(r), 4) for r in rate],
+            "total": int(counts.sum()),
+            "total_converted": int(converted.sum()),
+            "by_category": {
+                name: by_category[:, code].tolist()
+                for code, name in enumerate(self.categories.names) if totals[code]
+            } if self.field else {},
+        }
+
+
+class SignupAnalytics:
+    """Column stores of every analysed collection, following FileDB writes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._file_db = None
+        self._stores: Dict[str, "ColumnStore"] = {}
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    def _load(self, collection: str) -> "ColumnStore":
+        store = ColumnStore(collection)
+        for record in self._file_db.get_collection(collection):
+            store.put(record)
+        return store
+
+    def on_change(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        """FileDB change listener keeping the columns up to date"""
+        if collection not in ANALYTICS_FIELDS:
+            return
+        if op == "reload":
+            store = self._load(collection)
+            with self._lock:
+                self._stores[collection] = store
+            return
+        with self._lock:
+            store = self._stores.get(collection)
+            if store is None:
+                return
+            if op in REMOVAL_OPS:
+                store.remove(record['id'])
+            else:
+                store.put(record)
+
+    def open(self, file_db) -> None:
+        """Build the columns and follow FileDB writes; does nothing without NumPy"""
+        if not self.available:
+            print("Signup analytics disabled: numpy is not installed")
+            return
+        start = time.perf_counter()
+        self._file_db = file_db
+        stores = {collection: self._load(collection) for collection in ANALYTICS_FIELDS}
+        with self._lock:
+            self._stores = stores
+        file_db.add_listener(self.on_change)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Signup analytics built: {sum(len(s) for s in stores.values())} records in {elapsed:.1f}ms")
+
+    def trends(
+        self,
+        collections: List[str],
+        interval: str,
+        start: datetime,
+        end: datetime,
+        window: int,
+        category: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Series per collection; raises RuntimeError before open() has built the columns"""
+        with self._lock:
+            if not self._stores:
+                raise RuntimeError("Signup analytics are not loaded")
+            return {
+                collection: self._stores[collection].series(interval, start, end, window, category)
+                for collection in collections
+            }
+
+
+# Global instance
+signup_analytics = SignupAnalytics()
@@ -0,0 +1,137 @@
+# backend/app/utils/archive.py
+"""Cold archive for records moved out of the hot data files.
+
+Archived records are NDJSON lines in compressed, append-only segments under
+data/archive/<collection>/. A segment is written to a temp file, synced and
+renamed into place, and never modified afterwards. zstd is used when the
+zstandard package is installed, gzip otherwise; both are read back.
+"""
+import gzip
+import io
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.utils.compact_records import json_default
+from app.utils.search_index import EXACT_FIELDS, SEARCH_FIELDS, doc_summary, tokenize
+
+try:
+    import zstandard
+except ImportError:  # optional, gzip is always available
+    zstandard = None
+
+CODEC_SUFFIXES = {"zstd": ".ndjson.zst", "gzip": ".ndjson.gz"}
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+class ArchiveStore:
+    """Append-only compressed segments, one directory per collection"""
+
+    def __init__(self, directory: Path, codec: Optional[str] = None):
+        self.directory = Path(directory)
+        codec = codec or default_codec()
+        if codec not in CODEC_SUFFIXES:
+            raise ValueError(f"Unknown archive codec: {codec}")
+        if codec == "zstd" and zstandard is None:
+            print("zstandard is not installed, archiving with gzip")
+            codec = "gzip"
+        self.codec = codec
+
+    def segments(self, collection: str) -> List[Path]:
+        """Segments of a collection, oldest first"""
+        try:
+            names = os.listdir(self.directory / collection)
+        except FileNotFoundError:
+            return []
+        return [
+            self.directory / collection / name
+            for name in sorted(names)
+            if name.endswith(tuple(CODEC_SUFFIXES.values()))
+        ]
+
+    def append(self, collection: str, records: List[Dict[str, Any]]) -> Path:
+        """Write records as a new segment and return its path"""
+        directory = self.directory / collection
+        directory.mkdir(parents=True, exist_ok=True)
+        # Names sort by creation time; the pid keeps concurrent writers apart
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = directory / f"{stamp}-{os.getpid()}{CODEC_SUFFIXES[self.codec]}"
+        temp_file = Path(str(path) + '.tmp')
+
+        lines = b"".join(
+            json.dumps(record, separators=(',', ':'), default=json_default).encode('utf-8') + b"\n"
+            for record in records
+        )
+        with open(temp_file, 'wb') as f:
+            if self.codec == "zstd":
+                f.write(zstandard.ZstdCompressor(level=10).compress(lines))
+            else:
+                f.write(gzip.compress(lines, compresslevel=6))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+        return path
+
+    def _open(self, path: Path):
+        if path.name.endswith(CODEC_SUFFIXES["zstd"]):
+            if zstandard is None:
+                raise RuntimeError(f"zstandard is required to read {path.name}")
+            raw = open(path, 'rb')
+            return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True), encoding='utf-8')
+        return gzip.open(path, 'rt', encoding='utf-8')
+
+    def iter_records(self, collection: str, newest_first: bool = False) -> Iterator[Dict[str, Any]]:
+        """Stream archived records one segment at a time"""
+        segments = self.segments(collection)
+        for path in (reversed(segments) if newest_first else segments):
+            with self._open(path) as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def search(
+        self,
+        query: str,
+        collections: Optional[List[str]] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Scan archived records whose search fields match every query token by prefix"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        results: List[Dict[str, Any]] = []
+        for collection in collections or list(SEARCH_FIELDS):
+            fields = SEARCH_FIELDS.get(collection, [])
+            for record in self.iter_records(collection, newest_first=True):
+                terms = set()
+                for field in fields:
+                    value = record.get(field)
+                    terms.update(tokenize(value))
+                    if field in EXACT_FIELDS and value:
+                        terms.add(str(value).lower())
+                if all(any(term.startswith(token) for term in terms) for token in tokens):
+                    results.append({**doc_summary(collection, record), "archived": True})
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Segment count and compressed size per archived collection"""
+        stats = {}
+        try:
+            collections = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return stats
+        for collection in collections:
+            segments = self.segments(collection)
+            stats[collection] = {
+                "segments": len(segments),
+                "bytes": sum(path.stat().st_size for path in segments),
+            }
+        return stats
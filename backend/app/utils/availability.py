@@ -0,0 +1,164 @@
+# backend/app/utils/availability.py
+"""Consultation bookings and free slots within staff working hours.
+
+Every consultation lasts CONSULTATION_MINUTES, so the bookings overlapping a
+window [a, b) are exactly those starting in (a - length, b). Keeping start
+times in one sorted array therefore answers overlap queries with two
+bisections plus the k bookings found: O(log n + k), which is what an
+interval tree gives for intervals of varying length.
+"""
+import bisect
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+from app.utils.change_log import REMOVAL_OPS
+
+# Schedules holding a slot
+BOOKED_STATUSES = {"scheduled"}
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+class BookingConflict(ValueError):
+    """Raised when a consultation would overlap another booking"""
+
+
+def booking_start(record: Dict[str, Any]) -> Optional[float]:
+    """UTC timestamp at which a schedule holds a slot, if it does"""
+    if record.get('status') not in BOOKED_STATUSES or not record.get('scheduled_date'):
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(record['scheduled_date']))
+    except ValueError:
+        return None
+    # Dates picked in the admin UI arrive without an offset
+    return (parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def working_hours() -> Dict[int, Tuple[time, time]]:
+    """Weekday (0 = Monday) -> (opening, closing) from WORKING_HOURS"""
+    hours = {}
+    for day, span in settings.WORKING_HOURS.items():
+        opening, closing = span.split("-")
+        hours[WEEKDAYS.index(day.lower()[:3])] = (time.fromisoformat(opening), time.fromisoformat(closing))
+    return hours
+
+
+class BookingIndex:
+    """Start times of booked consultations in sorted order, following FileDB writes"""
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.Lock()
+        self._starts: List[float] = []
+        self._ids: List[str] = []
+        self._start_of: Dict[str, float] = {}
+        self._built = False
+
+    @property
+    def length(self) -> float:
+        return settings.CONSULTATION_MINUTES * 60
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Index every booked schedule"""
+        booked = []
+        for record in self.db.partitioned["schedules"].records():
+            start = booking_start(record)
+            if start is not None:
+                booked.append((start, record['id']))
+        booked.sort()
+        with self._lock:
+            self._starts = [start for start, _ in booked]
+            self._ids = [schedule_id for _, schedule_id in booked]
+            self._start_of = {schedule_id: start for start, schedule_id in booked}
+            self._built = True
+
+    def _remove(self, schedule_id: str) -> None:
+        start = self._start_of.pop(schedule_id, None)
+        if start is None:
+            return
+        i = bisect.bisect_left(self._starts, start)
+        while self._ids[i] != schedule_id:
+            i += 1
+        del self._starts[i]
+        del self._ids[i]
+
+    def on_change(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        """FileDB listener keeping the index up to date"""
+        if collection != "schedules" or not self._built:
+            # Not built yet: the first query reads the current state anyway
+            return
+        if op == "reload":
+            self.rebuild()
+            return
+        start = None if op in REMOVAL_OPS else booking_start(record)
+        with self._lock:
+            self._remove(record['id'])
+            if start is not None:
+                i = bisect.bisect_right(self._starts, start)
+                self._starts.insert(i, start)
+                self._ids.insert(i, record['id'])
+                self._start_of[record['id']] = start
+
+    def overlapping(self, start: float, end: float) -> List[Tuple[float, str]]:
+        """(start, schedule id) of bookings overlapping [start, end), in order"""
+        self._ensure_built()
+        with self._lock:
+            lo = bisect.bisect_right(self._starts, start - self.length)
+            hi = bisect.bisect_left(self._starts, end)
+            return list(zip(self._starts[lo:hi], self._ids[lo:hi]))
+
+    def conflicts(self, start: float, exclude: Set[str]) -> List[str]:
+        """Ids of other bookings a consultation starting at start would overlap"""
+        return [
+            schedule_id for _, schedule_id in self.overlapping(start, start + self.length)
+            if schedule_id not in exclude
+        ]
+
+    def check(self, records: List[Dict[str, Any]]) -> None:
+        """Raise BookingConflict unless the records, as about to be saved, fit the calendar"""
+        exclude = {record['id'] for record in records}
+        booked = sorted((start, record['id']) for record in records if (start := booking_start(record)) is not None)
+        for n, (start, schedule_id) in enumerate(booked):
+            clashes = self.conflicts(start, exclude)
+            if n and start - booked[n - 1][0] < self.length:
+                clashes.append(booked[n - 1][1])
+            if clashes:
+                raise BookingConflict(
+                    f"Schedule {schedule_id} overlaps the consultation booked for schedule {clashes[0]}"
+                )
+
+    def free_slots(self, start: datetime, end: datetime, now: Optional[datetime] = None) -> List[Dict[str, str]]:
+        """Open consultation slots within working hours between start and end"""
+        zone = ZoneInfo(settings.WORKING_TIMEZONE)
+        hours = working_hours()
+        step = timedelta(minutes=settings.CONSULTATION_MINUTES)
+        earliest = max(start, now or datetime.now(timezone.utc))
+
+        booked = self.overlapping(start.timestamp(), end.timestamp())
+        slots = []
+        b = 0
+        day: date = start.astimezone(zone).date()
+        while day <= end.astimezone(zone).date():
+            if day.weekday() in hours:
+                opening, closing = hours[day.weekday()]
+                slot = datetime.combine(day, opening, zone)
+                closes = datetime.combine(day, closing, zone)
+                while slot + step <= closes:
+                    slot_start, slot_end = slot.timestamp(), (slot + step).timestamp()
+                    # Bookings and slots both ascend, so one sweep pairs them up
+                    while b < len(booked) and booked[b][0] + self.length <= slot_start:
+                        b += 1
+                    free = b >= len(booked) or booked[b][0] >= slot_end
+                    if free and slot >= earliest and slot + step <= end:
+                        slots.append({"start": slot.isoformat(), "end": (slot + step).isoformat()})
+                    slot += step
+            day += timedelta(days=1)
+        return slots
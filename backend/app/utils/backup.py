@@ -0,0 +1,277 @@
+# backend/app/utils/backup.py
+"""Online snapshots of the data directory.
+
+Every FileDB write replaces a whole file through rename, so a file's content
+never changes under an (inode, size, mtime) signature. A snapshot reads every
+data file, then stats them all again: if no signature moved, the copies were
+all current at one instant between the two passes and form a consistent cut.
+Otherwise it retries. Nothing is locked, so writers are never held up.
+
+Each snapshot is one tar.gz holding the changed files and SNAPSHOT.json,
+plus a <id>.json sidecar with the same manifest and the archive checksum.
+Incremental snapshots only store files whose checksum differs from the
+previous snapshot; their manifest points at the snapshot holding the rest.
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+FORMAT_VERSION = 1
+MANIFEST_MEMBER = "SNAPSHOT.json"
+DATA_PREFIX = "data/"
+
+# Attempts at a consistent read before giving up on a busy data directory
+CAPTURE_ATTEMPTS = 20
+
+
+class BackupError(Exception):
+    """Raised when a snapshot cannot be taken, verified or restored"""
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class BackupStore:
+    """Creates, lists, verifies and restores snapshots in one directory"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    # Capture
+    @staticmethod
+    def _read(path: Path, contents: Dict[Path, bytes], signatures: Dict[Path, Tuple[int, int, int]]) -> None:
+        try:
+            with open(path, 'rb') as f:
+                contents[path] = f.read()
+                signatures[path] = _signature(os.fstat(f.fileno()))
+        except FileNotFoundError:
+            pass
+
+    def _capture(self, db) -> Tuple[Dict[str, bytes], List[Path]]:
+        """Contents of the hot files at one instant, plus the archive segments"""
+        for attempt in range(CAPTURE_ATTEMPTS):
+            contents: Dict[Path, bytes] = {}
+            signatures: Dict[Path, Tuple[int, int, int]] = {}
+            for path in (db.users_file, db.enrollments_file, db.reset_codes_file):
+                self._read(path, contents, signatures)
+            for collection in db.partitioned.values():
+                self._read(collection.manifest_file, contents, signatures)
+                try:
+                    partitions = json.loads(contents.get(collection.manifest_file) or b"{}").get('partitions', [])
+                except ValueError:
+                    partitions = []
+                # Months come from the captured manifest, so the two always agree
+                for key in partitions:
+                    self._read(collection.partition_file(key), contents, signatures)
+            # Archiving writes its segment before it drops records from the hot
+            # files, so listing segments after reading those never misses a
+            # record. One caught in both tiers is harmless.
+            segments = [path for collection in db.archive.stats() for path in db.archive.segments(collection)]
+
+            unchanged = True
+            for path, signature in signatures.items():
+                try:
+                    unchanged = _signature(os.stat(path)) == signature
+                except FileNotFoundError:
+                    unchanged = False
+                if not unchanged:
+                    break
+            if unchanged:
+                return {self._relative(db, path): data for path, data in contents.items()}, segments
+            time.sleep(0.01 * (attempt + 1))
+        raise BackupError("Data kept changing; could not take a consistent snapshot")
+
+    @staticmethod
+    def _relative(db, path: Path) -> str:
+        return path.relative_to(db.data_dir).as_posix()
+
+    # Snapshots
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """Snapshot sidecars, oldest first"""
+        snapshots = []
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return snapshots
+        for name in names:
+            if name.endswith(".json"):
+                with open(self.directory / name, 'r', encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+        return snapshots
+
+    def get(self, snapshot_id: str) -> Dict[str, Any]:
+        try:
+            with open(self.directory / f"{snapshot_id}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise BackupError(f"Snapshot {snapshot_id} not found")
+
+    def create(self, db, incremental: bool = False) -> Dict[str, Any]:
+        """Take a snapshot; incremental ones store only what changed since the last"""
+        with self._lock:
+            base = None
+            if incremental:
+                existing = self.snapshots()
+                base = existing[-1] if existing else None
+
+            start = time.perf_counter()
+            contents, segments = self._capture(db)
+            captured_ms = (time.perf_counter() - start) * 1000
+
+            now = datetime.now(timezone.utc)
+            snapshot_id = now.strftime("%Y%m%dT%H%M%S%f")[:-3] + "Z"
+            base_files = base["files"] if base else {}
+
+            files: Dict[str, Dict[str, Any]] = {}
+            for name, data in contents.items():
+                checksum = hashlib.sha256(data).hexdigest()
+                previous = base_files.get(name)
+                stored_in = previous["snapshot"] if previous and previous["sha256"] == checksum else snapshot_id
+                files[name] = {"sha256": checksum, "size": len(data), "snapshot": stored_in}
+            for path in segments:
+                name = self._relative(db, path)
+                previous = base_files.get(name)
+                if previous:
+                    # Segment names are unique and their content never changes
+                    files[name] = previous
+                else:
+                    files[name] = {"sha256": _sha256_file(path), "size": path.stat().st_size, "snapshot": snapshot_id}
+
+            manifest = {
+                "format": FORMAT_VERSION,
+                "id": snapshot_id,
+                "created_at": now.isoformat(),
+                "base": base["id"] if base else None,
+                "files": files,
+            }
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            archive_path = self.directory / f"{snapshot_id}.tar.gz"
+            temp_file = Path(f"{archive_path}.{os.getpid()}.tmp")
+            with tarfile.open(temp_file, 'w:gz', compresslevel=6) as tar:
+                self._add_bytes(tar, MANIFEST_MEMBER, json.dumps(manifest, indent=2).encode('utf-8'))
+                for name, entry in files.items():
+                    if entry["snapshot"] != snapshot_id:
+                        continue
+                    if name in contents:
+                        self._add_bytes(tar, DATA_PREFIX + name, contents[name])
+                    else:
+                        tar.add(db.data_dir / name, arcname=DATA_PREFIX + name)
+            os.replace(temp_file, archive_path)
+
+            stored = [entry for entry in files.values() if entry["snapshot"] == snapshot_id]
+            sidecar = {
+                **manifest,
+                "archive": archive_path.name,
+                "archive_sha256": _sha256_file(archive_path),
+                "archive_bytes": archive_path.stat().st_size,
+                "stored_files": len(stored),
+                "stored_bytes": sum(entry["size"] for entry in stored),
+                "capture_ms": round(captured_ms, 1),
+                "took_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+            # The sidecar appears last, so listed snapshots are always complete
+            sidecar_path = self.directory / f"{snapshot_id}.json"
+            temp_file = Path(f"{sidecar_path}.{os.getpid()}.tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(sidecar, f, indent=2)
+            os.replace(temp_file, sidecar_path)
+            print(f"Snapshot {snapshot_id}: {len(stored)}/{len(files)} files, {sidecar['archive_bytes']} bytes")
+            return sidecar
+
+    @staticmethod
+    def _add_bytes(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        tar.addfile(info, io.BytesIO(data))
+
+    @staticmethod
+    def summary(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Sidecar without the per-file table"""
+        return {key: value for key, value in snapshot.items() if key != "files"}
+
+    # Verify and restore
+    def _open_archive(self, snapshot_id: str) -> tarfile.TarFile:
+        snapshot = self.get(snapshot_id)
+        path = self.directory / snapshot["archive"]
+        if _sha256_file(path) != snapshot["archive_sha256"]:
+            raise BackupError(f"Archive checksum mismatch for snapshot {snapshot_id}")
+        return tarfile.open(path, 'r:gz')
+
+    def _extract(self, snapshot_id: str, target: Optional[Path]) -> int:
+        """Check (and with a target, write out) every file of a snapshot"""
+        files = self.get(snapshot_id)["files"]
+        by_snapshot: Dict[str, List[str]] = {}
+        for name, entry in files.items():
+            by_snapshot.setdefault(entry["snapshot"], []).append(name)
+
+        for source_id, names in by_snapshot.items():
+            with self._open_archive(source_id) as tar:
+                for name in names:
+                    member = tar.extractfile(DATA_PREFIX + name)
+                    if member is None:
+                        raise BackupError(f"{name} missing from snapshot {source_id}")
+                    data = member.read()
+                    if hashlib.sha256(data).hexdigest() != files[name]["sha256"]:
+                        raise BackupError(f"Checksum mismatch for {name} in snapshot {source_id}")
+                    if target is not None:
+                        path = target / name
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        with open(path, 'wb') as f:
+                            f.write(data)
+        return len(files)
+
+    def verify(self, snapshot_id: str) -> int:
+        """Check archive and file checksums; returns the number of files"""
+        return self._extract(snapshot_id, None)
+
+    def restore(self, snapshot_id: str, data_dir: str) -> Path:
+        """Rebuild data_dir from a snapshot; the previous directory is kept aside.
+
+        Stop the server first: running workers keep their cached copies.
+        """
+        target = Path(data_dir)
+        staging = target.with_name(f"{target.name}.restore-{snapshot_id}")
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir(parents=True)
+        try:
+            count = self._extract(snapshot_id, staging)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        previous = None
+        if target.exists():
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            previous = target.with_name(f"{target.name}.before-restore-{stamp}")
+            os.rename(target, previous)
+        os.rename(staging, target)
+        print(f"Restored {count} files from snapshot {snapshot_id} into {target}"
+              + (f", previous data kept in {previous}" if previous else ""))
+        return target
+
+
+# Global instance
+backup_store = BackupStore(settings.BACKUP_DIR)
@@ -0,0 +1,152 @@
+# backend/app/utils/capacity.py
+"""Seat counters and waitlists for courses with limited seats.
+
+Seats taken are counted per (course, cohort) once from the enrollments when
+the server starts. After that, FileDB writes keep the counts current through
+the change listener, so checking a course or reporting the seats left is a
+dictionary lookup instead of a scan of every enrollment. New enrollments that
+arrive when their cohort is full are saved as waitlisted. When a seat is
+released, the oldest waitlisted enrollment moves up in the same write.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.catalog import course_capacity
+from app.utils.change_log import REMOVAL_OPS
+
+# Enrollments holding a seat
+SEAT_STATUSES = {"pending", "confirmed"}
+WAITLIST_STATUS = "waitlisted"
+
+SeatKey = Tuple[str, Optional[str]]
+
+
+def seat_key(record: Dict[str, Any]) -> SeatKey:
+    """(course, cohort) an enrollment takes a seat in"""
+    return (record.get('course') or "", record.get('cohort') or None)
+
+
+class SeatCounter:
+    """Seats taken and waitlisted enrollment ids per course and cohort, following FileDB writes"""
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.Lock()
+        self._taken: Dict[SeatKey, int] = {}
+        # Insertion-ordered, so the first id is the next to move up
+        self._waitlists: Dict[SeatKey, Dict[str, None]] = {}
+        # enrollment id -> (key, status) as counted
+        self._counted: Dict[str, Tuple[SeatKey, str]] = {}
+        self._built = False
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Count every enrollment; waitlists are ordered by created_at"""
+        enrollments = sorted(self.db.get_collection("enrollments"), key=lambda r: str(r.get('created_at') or ""))
+        with self._lock:
+            self._taken, self._waitlists, self._counted = {}, {}, {}
+            for record in enrollments:
+                self._add(record)
+            self._built = True
+
+    def _add(self, record: Dict[str, Any]) -> None:
+        status = record.get('status')
+        if status not in SEAT_STATUSES and status != WAITLIST_STATUS:
+            return
+        key = seat_key(record)
+        self._counted[record['id']] = (key, status)
+        if status == WAITLIST_STATUS:
+            self._waitlists.setdefault(key, {})[record['id']] = None
+        else:
+            self._taken[key] = self._taken.get(key, 0) + 1
+
+    def _discard(self, enrollment_id: str) -> None:
+        counted = self._counted.pop(enrollment_id, None)
+        if counted is None:
+            return
+        key, status = counted
+        if status == WAITLIST_STATUS:
+            self._waitlists[key].pop(enrollment_id, None)
+        else:
+            self._taken[key] -= 1
+
+    def on_change(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        """FileDB listener keeping the counters up to date"""
+        if collection != "enrollments" or not self._built:
+            # Not built yet: the first use counts the current state anyway
+            return
+        if op == "reload":
+            self.rebuild()
+            return
+        with self._lock:
+            if op not in REMOVAL_OPS and self._counted.get(record['id']) == (seat_key(record), record.get('status')):
+                # Some other field changed; keep the waitlist position
+                return
+            self._discard(record['id'])
+            if op not in REMOVAL_OPS:
+                self._add(record)
+
+    def _projected(self, taken: Dict[SeatKey, int], key: SeatKey) -> int:
+        return taken.get(key, self._taken.get(key, 0))
+
+    def admit(self, records: List[Dict[str, Any]]) -> None:
+        """Mark new pending enrollments past their cohort's capacity as waitlisted, in place"""
+        self._ensure_built()
+        with self._lock:
+            taken: Dict[SeatKey, int] = {}
+            for record in records:
+                # Enrollments created as confirmed were placed by an admin and may overbook
+                if record.get('status') != "pending":
+                    continue
+                key = seat_key(record)
+                capacity = course_capacity(key[0])
+                if capacity is None:
+                    continue
+                count = self._projected(taken, key)
+                if count >= capacity:
+                    record['status'] = WAITLIST_STATUS
+                else:
+                    taken[key] = count + 1
+
+    def promotions(self, changed: List[Dict[str, Any]]) -> List[str]:
+        """Waitlisted ids that move up into the seats the changed enrollments release"""
+        self._ensure_built()
+        with self._lock:
+            taken: Dict[SeatKey, int] = {}
+            for record in changed:
+                counted = self._counted.get(record['id'])
+                if counted and counted[1] in SEAT_STATUSES:
+                    taken[counted[0]] = self._projected(taken, counted[0]) - 1
+                if record.get('status') in SEAT_STATUSES:
+                    key = seat_key(record)
+                    taken[key] = self._projected(taken, key) + 1
+
+            batch = {record['id'] for record in changed}
+            promoted = []
+            for key, count in taken.items():
+                capacity = course_capacity(key[0])
+                if capacity is None:
+                    continue
+                for waiting in self._waitlists.get(key, {}):
+                    if count >= capacity:
+                        break
+                    if waiting not in batch:
+                        promoted.append(waiting)
+                        count += 1
+            return promoted
+
+    def seats(self, course: str, cohort: Optional[str] = None) -> Dict[str, Any]:
+        """Seats taken, left and waitlisted in one cohort of a course"""
+        self._ensure_built()
+        capacity = course_capacity(course)
+        with self._lock:
+            taken = self._taken.get((course, cohort), 0)
+            waitlisted = len(self._waitlists.get((course, cohort), {}))
+        return {
+            "taken": taken,
+            "seats_left": None if capacity is None else max(0, capacity - taken),
+            "waitlisted": waitlisted,
+        }
@@ -0,0 +1,144 @@
+# backend/app/utils/change_log.py
+import asyncio
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Never sent to change feed clients
+PRIVATE_FIELDS = {"password_hash"}
+
+# Ops after which a record is gone from the hot files; "archive" means it
+# moved to the cold archive and still exists, so feed clients keep it
+REMOVAL_OPS = ("delete", "archive")
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ChangeLog:
+    """Bounded log of FileDB changes stamped with increasing sequence numbers.
+
+    The epoch identifies one run of the process that assigns the numbers;
+    a client holding a sequence from another epoch has to resync fully.
+    Appends may come from any thread, long-poll waiters live on event loops.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.epoch = uuid.uuid4().hex[:12]
+        self.last_seq = 0
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._waiters: List[asyncio.Future] = []
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Call listener(entry) after every append, on the appending thread"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def append(self, collection: str, op: str, record: Optional[Dict[str, Any]], seq: Optional[int] = None) -> int:
+        """Record a change, numbered here unless seq comes from the storage writer"""
+        entry = {
+            "seq": 0,
+            "collection": collection,
+            "op": op,
+            "id": record.get('id') if record else None,
+            # Copied: cached records keep changing in place after this
+            "record": {k: v for k, v in record.items() if k not in PRIVATE_FIELDS} if record else None,
+            "at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            entry["seq"] = self.last_seq + 1 if seq is None else seq
+            self.last_seq = entry["seq"]
+            self._entries.append(entry)
+            waiters, self._waiters = self._waiters, []
+        self._wake(waiters)
+        for listener in list(self._listeners):
+            try:
+                listener(entry)
+            except Exception as e:
+                print(f"Change log listener failed: {e}")
+        return entry["seq"]
+
+    def reset(self, epoch: str, last_seq: int) -> None:
+        """Follow another process's numbering; older entries are dropped"""
+        with self._lock:
+            if epoch == self.epoch and last_seq == self.last_seq:
+                return
+            self.epoch = epoch
+            self.last_seq = last_seq
+            self._entries.clear()
+            waiters, self._waiters = self._waiters, []
+        self._wake(waiters)
+
+    @staticmethod
+    def _wake(waiters: List[asyncio.Future]) -> None:
+        for future in waiters:
+            future.get_loop().call_soon_threadsafe(_resolve, future)
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest sequence still held"""
+        entries = self._entries
+        return entries[0]["seq"] if entries else self.last_seq + 1
+
+    def since(
+        self,
+        seq: int,
+        collections: Optional[List[str]] = None,
+        limit: int = 1000,
+        epoch: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], bool, int]:
+        """Changes after seq oldest first, whether the client missed some, and the seq to poll from next"""
+        with self._lock:
+            truncated = (epoch is not None and epoch != self.epoch) or seq > self.last_seq
+            if truncated:
+                seq = 0
+            truncated = truncated or seq < self.first_seq - 1
+            scanned = self.last_seq
+            newer = []
+            for entry in reversed(self._entries):
+                if entry["seq"] <= seq:
+                    break
+                newer.append(entry)
+        newer.reverse()
+        if collections:
+            wanted = set(collections)
+            newer = [entry for entry in newer if entry["collection"] in wanted]
+        if len(newer) > limit:
+            newer = newer[:limit]
+            scanned = newer[-1]["seq"]
+        return newer, truncated, scanned
+
+    async def wait(self, seq: int, timeout: float) -> bool:
+        """Wait up to timeout seconds for a change after seq"""
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            if self.last_seq != seq:
+                return True
+            self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "epoch": self.epoch,
+            "last_seq": self.last_seq,
+            "first_seq": self.first_seq,
+            "entries": len(self._entries),
+            "capacity": self._entries.maxlen,
+        }
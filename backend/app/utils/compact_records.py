@@ -0,0 +1,227 @@
+# backend/app/utils/compact_records.py
+"""Compact in-memory form of FileDB records.
+
+Each collection gets a record class with __slots__ for its known fields, so
+records no longer carry a per-record key table. Low-cardinality strings
+(status, course, country, ...) are interned and ISO timestamps are stored as
+ints. Records behave as mutable mappings and convert back to exactly the
+dicts they were built from; unknown fields are kept in a small overflow dict.
+"""
+import sys
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+EPOCH = datetime(1970, 1, 1)
+
+# Timestamp ints are micros * 2 + kind, kind 1 meaning "+00:00" was present
+TZ_NAIVE = 0
+TZ_UTC = 1
+
+_MISSING = object()
+
+# Known fields per collection, in the order records are usually written
+COLLECTION_FIELDS: Dict[str, List[str]] = {
+    "users": [
+        "email", "name", "role", "country", "postal_code", "comments",
+        "password_hash", "id", "created_at", "is_active", "is_admin",
+    ],
+    "enrollments": [
+        "first_name", "last_name", "email", "phone", "zip_code", "course",
+        "student_type", "country", "comments", "id", "created_at", "status",
+        "cohort", "updated_at",
+    ],
+    "schedules": [
+        "id", "created_at", "updated_at", "status", "scheduled_date",
+        "first_name", "last_name", "email", "phone", "country", "service_type",
+        "message", "zip_code", "student_type", "notes",
+    ],
+    "job_applications": [
+        "id", "created_at", "status", "name", "email", "phone", "position",
+        "resume_url", "cover_letter", "linkedin_url", "portfolio_url", "notes",
+    ],
+    "collegeninja_students": [
+        "id", "created_at", "status", "name", "email", "phone", "zipCode",
+        "currentSchool", "gradeLevel",
+    ],
+    "collegeninja_counselors": [
+        "id", "created_at", "status", "name", "email", "phone", "zipCode",
+    ],
+}
+
+DATETIME_FIELDS = frozenset({"created_at", "updated_at", "scheduled_date"})
+
+# Fields with few distinct values, shared between records through sys.intern
+INTERNED_FIELDS = frozenset({
+    "status", "role", "country", "course", "cohort", "student_type", "service_type",
+    "position", "gradeLevel", "currentSchool", "zip_code", "zipCode", "postal_code",
+})
+
+
+def encode_timestamp(value: Any) -> Any:
+    """ISO timestamp string to an int, or the value itself if that would lose anything"""
+    if type(value) is int:
+        # Would read back as a timestamp; keep it boxed instead
+        return (value,)
+    if not isinstance(value, str):
+        return value
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        kind = TZ_NAIVE
+    elif parsed.tzinfo == timezone.utc:
+        kind = TZ_UTC
+        parsed = parsed.replace(tzinfo=None)
+    else:
+        return value
+    encoded = ((parsed - EPOCH) // timedelta(microseconds=1)) * 2 + kind
+    return encoded if decode_timestamp(encoded) == value else value
+
+
+def decode_timestamp(value: Any) -> Any:
+    if type(value) is tuple:
+        return value[0]
+    if type(value) is not int:
+        return value
+    micros, kind = divmod(value, 2)
+    parsed = EPOCH + timedelta(microseconds=micros)
+    if kind == TZ_UTC:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.isoformat()
+
+
+def _encode(key: str, value: Any) -> Any:
+    if key in DATETIME_FIELDS:
+        return encode_timestamp(value)
+    if key in INTERNED_FIELDS and type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+def _decode(key: str, value: Any) -> Any:
+    if key in DATETIME_FIELDS:
+        return decode_timestamp(value)
+    return value
+
+
+class CompactRecord(MutableMapping):
+    """Slotted record that reads and writes like the dict it replaces"""
+
+    __slots__ = ("_extra",)
+    _fields: tuple = ()
+    _field_set: frozenset = frozenset()
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self._extra = None
+        if not data:
+            return
+        # Inlined __setitem__; this runs once per record on every file load
+        field_set = self._field_set
+        for key, value in data.items():
+            if key in field_set:
+                if key in DATETIME_FIELDS:
+                    value = encode_timestamp(value)
+                elif key in INTERNED_FIELDS and type(value) is str:
+                    value = sys.intern(value)
+                setattr(self, key, value)
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[sys.intern(key)] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            value = getattr(self, key, _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+            return _decode(key, value)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._field_set:
+            setattr(self, key, _encode(key, value))
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[sys.intern(key)] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._field_set:
+            if getattr(self, key, _MISSING) is _MISSING:
+                raise KeyError(key)
+            delattr(self, key)
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._fields:
+            if getattr(self, key, _MISSING) is not _MISSING:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._field_set:
+            return getattr(self, key, _MISSING) is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self}
+
+    copy = to_dict
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def make_record_class(collection: str, fields: List[str]) -> Type[CompactRecord]:
+    """Build the slotted record class for a collection"""
+    name = "".join(part.title() for part in collection.split("_")) + "Record"
+    return type(name, (CompactRecord,), {
+        "__slots__": tuple(fields),
+        "_fields": tuple(fields),
+        "_field_set": frozenset(fields),
+    })
+
+
+RECORD_CLASSES: Dict[str, Type[CompactRecord]] = {
+    collection: make_record_class(collection, fields)
+    for collection, fields in COLLECTION_FIELDS.items()
+}
+
+
+def compact(collection: str, record: Any) -> Any:
+    """Compact form of a record; anything that is not a plain dict is returned as is"""
+    if type(record) is not dict:
+        return record
+    return RECORD_CLASSES[collection](record)
+
+
+def compact_all(collection: str, records: List[Any]) -> None:
+    """Replace the records of a list in place with their compact form"""
+    record_class = RECORD_CLASSES[collection]
+    for i, record in enumerate(records):
+        if type(record) is dict:
+            records[i] = record_class(record)
+
+
+def json_default(value: Any) -> Any:
+    """json.dump fallback that writes compact records as plain objects"""
+    if isinstance(value, CompactRecord):
+        return value.to_dict()
+    return str(value)
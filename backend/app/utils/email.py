@@ -1,11 +1,90 @@
 # backend/app/utils/email.py
-import httpx
-from typing import Optional
+from typing import Any, Awaitable, Callable, List, Optional
 from app.core.config import settings
 from datetime import datetime
+import asyncio
 
 MAILGUN_BASE_URL = f"https://api.mailgun.net/v3/{settings.MAILGUN_DOMAIN}/messages"
 
+class EmailSender:
+    """Fixed pool of workers sending queued emails over one pooled HTTP client"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.sent = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the workers on the running event loop"""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    def submit(self, send: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        """Queue send(*args); must be called on the sender's event loop"""
+        self.start()
+        self._queue.put_nowait((send, args))
+
+    def http_client(self):
+        """Client shared by the workers, so sends reuse connections"""
+        if self._client is None and self.running:
+            import httpx
+            self._client = httpx.AsyncClient(limits=httpx.Limits(max_connections=self.workers))
+        return self._client
+
+    async def _work(self) -> None:
+        while True:
+            send, args = await self._queue.get()
+            try:
+                if await send(*args) is False:
+                    self.failed += 1
+                else:
+                    self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Queued email failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Finish queued emails for up to timeout seconds, then stop the workers"""
+        if not self._tasks or self._loop is not asyncio.get_running_loop():
+            # The workers belong to another event loop, which stops them
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"Dropping {self._queue.qsize()} queued emails on shutdown")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+        }
+
+# Global instance
+email_sender = EmailSender(settings.EMAIL_SENDER_WORKERS)
+
 async def send_email(
     to_email: str,
     subject: str,
@@ -18,19 +97,24 @@ async def send_email(
         print("Mailgun not configured, skipping email send")
         return False
 
+    # httpx is only needed once an email is actually sent
+    import httpx
+
+    data = {
+        "from": f"StemPro Academy <{from_email}>",
+        "to": [to_email],
+        "bcc": bcc_email,
+        "subject": subject,
+        "text": text_body
+    }
     try:
+        # Inside the pooled sender, reuse its connections
+        client = email_sender.http_client()
+        if client is not None:
+            response = await client.post(MAILGUN_BASE_URL, auth=("api", settings.MAILGUN_API_KEY), data=data)
+            return response.status_code == 200
         async with httpx.AsyncClient() as client:
-            response = await client.post(
-                MAILGUN_BASE_URL,
-                auth=("api", settings.MAILGUN_API_KEY),
-                data={
-                    "from": f"StemPro Academy <{from_email}>",
-                    "to": [to_email],
-                    "bcc": bcc_email,
-                    "subject": subject,
-                    "text": text_body
-                }
-            )
+            response = await client.post(MAILGUN_BASE_URL, auth=("api", settings.MAILGUN_API_KEY), data=data)
             return response.status_code == 200
     except Exception as e:
         print(f"Failed to send email: {e}")
@@ -79,12 +163,17 @@ StemPro Academy"""
 
     return await send_email(to_email, subject, message)
 
-async def send_enrollment_confirmation(to_email: str, name: str, course: str) -> bool:
+async def send_enrollment_confirmation(to_email: str, name: str, course: str, waitlisted: bool = False) -> bool:
     """Send course enrollment confirmation email"""
     subject = f"Thank you for registering {course} at StemPro Academy!"
+    waitlist_note = (
+        f"\n\n{course} is currently full, so you have been placed on the waitlist. "
+        "We will let you know as soon as a seat opens up."
+        if waitlisted else ""
+    )
     message = f"""Dear {name},
 
-Thank you for registering for {course} at StemPro Academy. We are excited to have you as part of our learning community.
+Thank you for registering for {course} at StemPro Academy. We are excited to have you as part of our learning community.{waitlist_note}
 
 We will get in touch with you soon with more details about the course schedule and next steps.
 
@@ -193,9 +282,34 @@ async def send_schedule_update_notification(email: str, first_name: str, schedul
     AI Academy Team
     """
 
-    # Implement your email sending logic here
-    # Example: await send_email(email, subject, body)
     print(f"Sending schedule update to {email} for {formatted_date}")
+    return await send_email(email, subject, body)
+
+async def send_schedule_reminder(email: str, first_name: str, scheduled_date: datetime, hours_before: float):
+    """Remind a client of an upcoming consultation"""
+    subject = "Reminder: Your Consultation with AI Academy"
+
+    formatted_date = scheduled_date.strftime("%B %d, %Y at %I:%M %p UTC")
+    if hours_before >= 24:
+        when = f"in {hours_before / 24:g} day{'s' if hours_before != 24 else ''}"
+    else:
+        when = f"in {hours_before:g} hour{'s' if hours_before != 1 else ''}"
+
+    body = f"""
+    Dear {first_name},
+
+    This is a reminder that your consultation with AI Academy is coming up {when}.
+
+    Consultation Date & Time: {formatted_date}
+
+    If you need to reschedule, please contact us as soon as possible.
+
+    Best regards,
+    AI Academy Team
+    """
+
+    print(f"Sending schedule reminder to {email} for {formatted_date}")
+    return await send_email(email, subject, body)
 
 
 async def send_job_application_confirmation(email: str, name: str, position: str):
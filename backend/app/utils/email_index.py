@@ -0,0 +1,108 @@
+# backend/app/utils/email_index.py
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.change_log import REMOVAL_OPS
+from app.utils.file_db import COLLECTIONS
+
+
+def normalize_email(email: Optional[str]) -> str:
+    """Normalize an email address for lookups"""
+    return (email or "").strip().lower()
+
+
+class EmailIndex:
+    """Global index mapping a normalized email to its records in every collection"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._file_db = None
+        # Collections indexed; replicas mapping the shared snapshot leave out users
+        self.collections = list(COLLECTIONS)
+        self._reset()
+
+    def _reset(self) -> None:
+        # email -> {(collection, id): record}
+        self._by_email: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        # (collection, id) -> email, so updates that change the email can move the record
+        self._email_of: Dict[Tuple[str, str], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_email)
+
+    def _add(self, collection: str, record: Dict[str, Any]) -> None:
+        ref = (collection, record.get('id'))
+        old_email = self._email_of.get(ref)
+        email = normalize_email(record.get('email'))
+        if old_email is not None and old_email != email:
+            self._discard(ref)
+        if not email:
+            return
+        self._by_email.setdefault(email, {})[ref] = record
+        self._email_of[ref] = email
+
+    def _discard(self, ref: Tuple[str, str]) -> None:
+        email = self._email_of.pop(ref, None)
+        if email is None:
+            return
+        records = self._by_email.get(email)
+        if records is not None:
+            records.pop(ref, None)
+            if not records:
+                del self._by_email[email]
+
+    def on_change(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        """FileDB change listener keeping the index up to date"""
+        if collection not in self.collections:
+            return
+        if op == "reload":
+            self.reload_collection(collection)
+            return
+        with self._lock:
+            if op in REMOVAL_OPS:
+                self._discard((collection, record.get('id')))
+            else:
+                self._add(collection, record)
+
+    def rebuild(self, file_db) -> None:
+        """Rebuild the index from every FileDB collection"""
+        with self._lock:
+            self._reset()
+            for collection in self.collections:
+                for record in file_db.get_collection(collection):
+                    self._add(collection, record)
+
+    def reload_collection(self, collection: str) -> None:
+        """Re-index one collection after another process changed it"""
+        records = self._file_db.get_collection(collection)
+        with self._lock:
+            for ref in [ref for ref in self._email_of if ref[0] == collection]:
+                self._discard(ref)
+            for record in records:
+                self._add(collection, record)
+
+    def open(self, file_db, collections: Optional[List[str]] = None) -> None:
+        """Build the index and follow FileDB writes"""
+        start = time.perf_counter()
+        self._file_db = file_db
+        self.collections = list(collections or COLLECTIONS)
+        self.rebuild(file_db)
+        file_db.add_listener(self.on_change)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Email index built: {len(self)} people in {elapsed:.1f}ms")
+
+    def lookup(self, email: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Return every record for an email grouped by collection, newest first"""
+        grouped: Dict[str, List[Dict[str, Any]]] = {c: [] for c in COLLECTIONS}
+        with self._lock:
+            records = list(self._by_email.get(normalize_email(email), {}).items())
+        for (collection, _), record in records:
+            grouped[collection].append(record)
+        for collection in grouped:
+            grouped[collection].sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        return grouped
+
+
+# Global instance
+email_index = EmailIndex()
@@ -0,0 +1,142 @@
+# backend/app/utils/event_hub.py
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.utils.search_index import doc_summary
+
+# Collections whose activity is streamed to the admin dashboard
+LIVE_COLLECTIONS = [
+    "enrollments",
+    "schedules",
+    "job_applications",
+    "collegeninja_students",
+    "collegeninja_counselors",
+]
+
+
+def live_event(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Dashboard event for a change log entry"""
+    record = entry["record"]
+    return {
+        "seq": entry["seq"],
+        "collection": entry["collection"],
+        "op": entry["op"],
+        "id": entry["id"],
+        "at": entry["at"],
+        "summary": doc_summary(entry["collection"], record) if record else None,
+    }
+
+
+def format_sse(event: Optional[str], data: Any, event_id: Optional[str] = None) -> str:
+    """One Server-Sent Events frame"""
+    frame = ""
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    if event:
+        frame += f"event: {event}\n"
+    return frame + f"data: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """One client's bounded event buffer; the oldest events are dropped when full"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, collections: Optional[Set[str]], buffer_size: int):
+        self.loop = loop
+        self.collections = collections
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self.dropped = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def push(self, event: Dict[str, Any]) -> None:
+        """Queue an event; safe to call from any thread"""
+        if self.collections is not None and event["collection"] not in self.collections:
+            return
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append(event)
+        if not self._ready.is_set():
+            self.loop.call_soon_threadsafe(self._ready.set)
+
+    async def next_events(self, timeout: float) -> List[Dict[str, Any]]:
+        """Wait up to timeout for events and take everything buffered"""
+        if not self.events:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._ready.clear()
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events
+
+    def take_dropped(self) -> int:
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    def close(self) -> None:
+        """End the client's stream; safe to call from any thread"""
+        self.closed = True
+        self.loop.call_soon_threadsafe(self._ready.set)
+
+
+class EventHub:
+    """In-process pub/sub fanning FileDB changes out to live dashboard clients"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: List[Subscription] = []
+        self.published = 0
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, collections: Optional[List[str]] = None) -> Subscription:
+        subscription = Subscription(
+            asyncio.get_running_loop(),
+            set(collections) if collections else None,
+            settings.EVENT_STREAM_BUFFER,
+        )
+        with self._lock:
+            # Copy on write: publishers iterate without taking the lock
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def close(self) -> None:
+        """End every open stream"""
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.close()
+
+    def on_change(self, entry: Dict[str, Any]) -> None:
+        """Change log listener publishing dashboard activity"""
+        subscriptions = self._subscriptions
+        if not subscriptions or entry["collection"] not in LIVE_COLLECTIONS:
+            return
+        event = live_event(entry)
+        self.published += 1
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    def stats(self) -> Dict[str, Any]:
+        subscriptions = self._subscriptions
+        return {
+            "clients": len(subscriptions),
+            "published": self.published,
+            "buffered": sum(len(s.events) for s in subscriptions),
+            "dropped_pending": sum(s.dropped for s in subscriptions),
+        }
+
+
+# Global instance, fed by file_db.changes from the application lifespan
+event_hub = EventHub()
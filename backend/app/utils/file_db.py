@@ -7,121 +7,407 @@ import uuid
 from datetime import datetime, timezone
 import random
 from contextlib import contextmanager
+import functools
 import sys
 import time
+import asyncio
+import threading
+
+from app.core.config import settings
+from app.utils.archive import ArchiveStore
+from app.utils.availability import BookingIndex
+from app.utils.capacity import SeatCounter
+from app.utils.change_log import ChangeLog
+from app.utils.compact_records import compact_all, json_default
+from app.utils.partitions import MANIFEST_NAME, PARTITIONED_COLLECTIONS, PartitionedCollection, partition_key
+from app.utils.ttl_store import TTLStore
+from app.utils.file_lock import lock_file
+from app.utils.file_watcher import create_watcher
+
+# Collection names used for change notifications and bulk access
+COLLECTIONS = [
+    "users",
+    "enrollments",
+    "schedules",
+    "job_applications",
+    "collegeninja_students",
+    "collegeninja_counselors",
+]
+
+# Id prefixes of signups created in bulk by insert_many
+SIGNUP_ID_PREFIXES = {
+    "collegeninja_students": "cn_student",
+    "collegeninja_counselors": "cn_counselor",
+}
+
+
+def serialized(method):
+    """Run a FileDB write under the instance's write lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class FileDB:
     def __init__(self, data_dir: str = "./data"):
+        # No disk work here; files are created on first use or by initialize_files()
         self.data_dir = Path(data_dir)
-        self.data_dir.mkdir(exist_ok=True)
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        # Bulk writes run on worker threads while requests write on the loop
+        # thread; each read-for-update -> write -> notify sequence holds this
+        self._write_lock = threading.RLock()
+
+        # Parsed file contents keyed by path: (stat signature, data)
+        self._cache: Dict[Path, Any] = {}
 
         # Define file paths
         self.users_file = self.data_dir / "users.json"
         self.enrollments_file = self.data_dir / "enrollments.json"
-        self.schedules_file = self.data_dir / "schedules.json"
         self.reset_codes_file = self.data_dir / "reset_codes.json"
+
+        # Records moved out of the hot files by the retention job
+        self.archive = ArchiveStore(self.data_dir / "archive", settings.ARCHIVE_CODEC)
+
+        # Schedules, applications and signups live in month partitions
+        self.partitioned = {name: PartitionedCollection(self, name) for name in PARTITIONED_COLLECTIONS}
+
+        # Single-file layout of the partitioned collections, migrated on startup
+        self.schedules_file = self.data_dir / "schedules.json"
         self.job_applications_file = self.data_dir / "job_applications.json"
         self.collegeninja_signups_file = self.data_dir / "collegeninja_signups.json"
 
+        # Password reset codes expire on their own, see TTLStore
+        self.reset_codes = TTLStore(self.reset_codes_file)
+
+        # Booked consultation slots, checked before a schedule is saved
+        self.bookings = BookingIndex(self)
+        # Seats taken per course and cohort, checked before an enrollment is saved
+        self.seats = SeatCounter(self)
+
+        # Callbacks notified after every write: listener(collection, op, record)
+        self._listeners = [self.bookings.on_change, self.seats.on_change]
+        # Sequence-numbered changes for the admin change feed
+        self.changes = ChangeLog(settings.CHANGE_LOG_SIZE)
+
+        # Collections stored in each top-level data file, for change notifications
+        self._file_collections = {
+            self.users_file: ["users"],
+            self.enrollments_file: ["enrollments"],
+        }
+
+        # While a watcher runs, cached reads skip the stat call
+        self._watcher = None
+
+        # Keep cached records as slotted objects instead of dicts
+        self.compact_records = settings.COMPACT_RECORDS
+
     def initialize_files(self):
         """Initialize JSON files if they don't exist"""
+        with self._init_lock:
+            self._initialized = True
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self._create_missing_files()
+            self._migrate_legacy_files()
+
+    def _ensure_initialized(self) -> None:
+        """Lazily create the data directory and files on first use"""
+        if not self._initialized:
+            self.initialize_files()
+
+    def _create_missing_files(self):
         files = [
             (self.users_file, []),
             (self.enrollments_file, []),
-            (self.schedules_file, []),
             (self.reset_codes_file, {}),
-            (self.job_applications_file, {"applications": []}),
-            (self.collegeninja_signups_file, {"students": [], "counselors": []})
         ]
 
         for file_path, default_content in files:
             if not file_path.exists():
                 self._write_json(file_path, default_content)
 
-    @contextmanager
-    def _file_lock(self, file_path: Path):
-        """Context manager for file locking - Windows compatible"""
-        # For Windows, we'll use a simple lock file approach
-        lock_file = Path(str(file_path) + '.lock')
-
-        # Try to acquire lock
-        max_attempts = 50
-        attempt = 0
+        for collection in self.partitioned.values():
+            collection.directory.mkdir(exist_ok=True)
+            if not collection.manifest_file.exists():
+                self._write_json(collection.manifest_file, {"partitions": []})
+
+    def _migrate_legacy_files(self):
+        """Move records from the old single-file layout into month partitions"""
+        legacy_files = [
+            (self.schedules_file, {"schedules": "schedules"}),
+            (self.job_applications_file, {"job_applications": "applications"}),
+            (self.collegeninja_signups_file, {"collegeninja_students": "students", "collegeninja_counselors": "counselors"}),
+        ]
 
-        while attempt < max_attempts:
+        for file_path, collections in legacy_files:
+            if not file_path.exists():
+                continue
             try:
-                # Try to create lock file exclusively
-                lock_fd = os.open(str(lock_file), os.O_CREAT | os.O_EXCL | os.O_RDWR)
-                os.close(lock_fd)
-                break
-            except FileExistsError:
-                # Lock file exists, wait and retry
-                time.sleep(0.1)
-                attempt += 1
-        else:
-            # Could not acquire lock after max attempts
-            raise TimeoutError(f"Could not acquire lock for {file_path}")
+                # The lock keeps two processes from migrating the same file
+                with self._file_lock(file_path) as f:
+                    content = f.read()
+                    data = json.loads(content) if content else {}
+                    for collection, key in collections.items():
+                        if isinstance(data, dict):
+                            records = data.get(key, [])
+                        else:
+                            records = data if isinstance(data, list) else []
+                        count = self.partitioned[collection].migrate(records)
+                        print(f"Migrated {count} {collection} records from {file_path.name}")
+                    os.replace(file_path, Path(str(file_path) + '.migrated'))
+            except FileNotFoundError:
+                # Another process finished the migration first
+                continue
+            except json.JSONDecodeError as e:
+                print(f"Skipping migration of corrupted {file_path.name}: {e}")
 
-        try:
+    @contextmanager
+    def _file_lock(self, file_path: Path):
+        """Context manager for file locking - Windows compatible"""
+        with lock_file(file_path):
             # Open and yield the actual file
             with open(file_path, 'r+', encoding='utf-8') as f:
                 yield f
-        finally:
-            # Release lock by removing lock file
-            try:
-                os.remove(lock_file)
-            except:
-                pass
 
-    def _read_json(self, file_path: Path) -> Any:
-        """Read JSON file with locking"""
-        if not file_path.exists():
+    def _default_content(self, file_path: Path) -> Any:
+        """Default empty structure for a data file"""
+        if file_path.name == MANIFEST_NAME:
+            return {"partitions": []}
+        if file_path.parent != self.data_dir:
+            # Month partition
+            return []
+        if "users" in str(file_path) or "enrollments" in str(file_path) or "schedules" in str(file_path):
+            return []
+        elif "job_applications" in str(file_path):
+            return {"applications": []}
+        elif "collegeninja_signups" in str(file_path):
+            return {"students": [], "counselors": []}
+        else:
+            return {}
+
+    @staticmethod
+    def _signature(file_path: Path):
+        """Identify a file version by inode, size and mtime"""
+        stat = os.stat(file_path)
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _read_json(self, file_path: Path, for_update: bool = False) -> Any:
+        """Read JSON file, reusing the parsed data while the file is unchanged"""
+        self._ensure_initialized()
+
+        # The watcher invalidates entries changed by other processes, so reads
+        # can trust the cache; reads followed by a write still check the disk
+        if self._watcher is not None and not for_update:
+            cached = self._cache.get(file_path)
+            if cached is not None:
+                return cached[1]
+
+        try:
+            signature = self._signature(file_path)
+        except FileNotFoundError:
             # Return default empty structure
-            if "users" in str(file_path) or "enrollments" in str(file_path) or "schedules" in str(file_path):
-                return []
-            elif "job_applications" in str(file_path):
-                return {"applications": []}
-            elif "collegeninja_signups" in str(file_path):
-                return {"students": [], "counselors": []}
-            else:
-                return {}
+            self._cache.pop(file_path, None)
+            return self._default_content(file_path)
+
+        cached = self._cache.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
 
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                return json.loads(content) if content else []
+                data = json.loads(content) if content else []
         except (json.JSONDecodeError, FileNotFoundError):
             # Return default empty structure if file is corrupted or missing
-            if "users" in str(file_path) or "enrollments" in str(file_path) or "schedules" in str(file_path):
-                return []
-            elif "job_applications" in str(file_path):
-                return {"applications": []}
-            elif "collegeninja_signups" in str(file_path):
-                return {"students": [], "counselors": []}
-            else:
-                return {}
+            return self._default_content(file_path)
+
+        if self.compact_records:
+            self._compact(file_path, data)
+        self._cache[file_path] = (signature, data)
+        return data
 
     def _write_json(self, file_path: Path, data: Any) -> None:
         """Write JSON file with locking"""
-        # Create a temporary file first
-        temp_file = Path(str(file_path) + '.tmp')
+        self._ensure_initialized()
 
-        # Write to temporary file
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
-
-        # Atomic rename (as atomic as possible on Windows)
-        if sys.platform == 'win32':
-            # On Windows, remove the target file first if it exists
-            if file_path.exists():
-                os.remove(file_path)
+        # Create a temporary file first
+        temp_file = Path(f"{file_path}.{os.getpid()}.tmp")
 
-        os.rename(temp_file, file_path)
+        try:
+            # Write to temporary file
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, default=json_default)
+
+            if self.compact_records:
+                self._compact(file_path, data)
+            # Rename keeps inode, size and mtime: caching first lets the
+            # watcher recognise this write as our own
+            self._cache[file_path] = (self._signature(temp_file), data)
+
+            # Atomic rename (as atomic as possible on Windows)
+            if sys.platform == 'win32':
+                # On Windows, remove the target file first if it exists
+                if file_path.exists():
+                    os.remove(file_path)
+
+            os.rename(temp_file, file_path)
+        except Exception:
+            # Callers may have mutated the cached data in place; force a reread
+            self._cache.pop(file_path, None)
+            raise
+
+    def _compact(self, file_path: Path, data: Any) -> None:
+        """Convert the records of a parsed data file to their compact form in place"""
+        if file_path.name == MANIFEST_NAME or not isinstance(data, list):
+            return
+        for collection in self._collections_of(file_path):
+            compact_all(collection, data)
+
+    def _collections_of(self, file_path: Path) -> List[str]:
+        """Collections whose records are stored in a data file"""
+        if file_path.parent == self.data_dir:
+            return self._file_collections.get(file_path, [])
+        if file_path.suffix == ".json" and file_path.parent.parent == self.data_dir:
+            name = file_path.parent.name
+            if name in self.partitioned:
+                return [name]
+        return []
+
+    def data_files(self, collections: Optional[List[str]] = None) -> List[Path]:
+        """Every file holding records of the given collections (default all)"""
+        files: List[Path] = []
+        for collection in collections or COLLECTIONS:
+            if collection in self.partitioned:
+                files.extend(self.partitioned[collection].files())
+            else:
+                files.extend(f for f, names in self._file_collections.items() if collection in names)
+        return files
+
+    def _files_for_change(self, collection: str, record: Dict[str, Any]) -> List[Path]:
+        """Data files a write to this record may have replaced"""
+        if collection in self.partitioned:
+            partitioned = self.partitioned[collection]
+            return [partitioned.manifest_file, partitioned.partition_file(partition_key(record))]
+        return [f for f, names in self._file_collections.items() if collection in names]
+
+    async def prewarm(self, collections: Optional[List[str]] = None) -> Dict[str, float]:
+        """Load the data files of the given collections (default all) concurrently, returning ms per file"""
+        self._ensure_initialized()
+
+        def load(file_path: Path) -> float:
+            start = time.perf_counter()
+            self._read_json(file_path)
+            return (time.perf_counter() - start) * 1000
+
+        paths = self.data_files(collections)
+        timings = await asyncio.gather(*(asyncio.to_thread(load, path) for path in paths))
+        return {str(path.relative_to(self.data_dir)): round(ms, 1) for path, ms in zip(paths, timings)}
+
+    # Cross-process change notifications
+    def watch(self, mode: str = "auto", interval: float = 0.2) -> str:
+        """Follow changes made by other processes to the data directory"""
+        self._ensure_initialized()
+        if self._watcher is None and mode != "off":
+            directories = [self.data_dir] + [c.directory for c in self.partitioned.values()]
+            watcher = create_watcher(directories, self._on_file_changed, mode, interval)
+            watcher.start()
+            self._watcher = watcher
+        return self._watcher.kind if self._watcher is not None else "off"
+
+    def unwatch(self) -> None:
+        """Stop following external changes"""
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+
+    def _on_file_changed(self, file_path: Path) -> None:
+        """Invalidate cached data changed by another process and tell listeners"""
+        if file_path == self.reset_codes_file:
+            self.reset_codes.reload_if_changed()
+            return
+        collections = self._collections_of(file_path)
+        if not collections:
+            return
+
+        with self._write_lock:
+            cached = self._cache.get(file_path)
+            try:
+                signature = self._signature(file_path)
+            except FileNotFoundError:
+                signature = None
+            if cached is not None and cached[0] == signature:
+                # Our own write; the cache is already current
+                return
+
+            self._cache.pop(file_path, None)
+            if file_path.name == MANIFEST_NAME:
+                # New months show up as partition file changes of their own
+                return
+            if cached is None or len(collections) > 1 or not isinstance(cached[1], list):
+                # Nothing to compare with; listeners reload the whole collection
+                for collection in collections:
+                    self._emit(collection, "reload", None)
+                return
+
+            # Listeners only hear about the records of this file that changed
+            self._log_change(collections[0], "reload", None)
+            self._notify_diff(collections[0], cached[1], self._read_json(file_path, for_update=True))
+
+    def _notify_diff(self, collection: str, old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> None:
+        """Tell listeners how one file's records changed between two versions"""
+        previous = {record.get('id'): record for record in old}
+        for record in new:
+            before = previous.pop(record.get('id'), None)
+            if before is None:
+                self._notify(collection, "insert", record)
+            elif before != record:
+                self._notify(collection, "update", record)
+        for record in previous.values():
+            self._notify(collection, "delete", record)
+
+    # Change notifications
+    def add_listener(self, listener) -> None:
+        """Register a callback invoked as listener(collection, op, record) after writes"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        """Unregister a change listener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        """Record a change and notify listeners (op is insert, update, delete, archive or reload)"""
+        self._log_change(collection, op, record)
+        self._notify(collection, op, record)
+
+    def _notify(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(collection, op, record)
+            except Exception as e:
+                # A broken listener must never fail the write itself
+                print(f"Change listener failed for {collection}/{op}: {e}")
+
+    def _log_change(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        self.changes.append(collection, op, record)
+
+    def get_collection(self, collection: str) -> List[Dict[str, Any]]:
+        """Get every record of a collection in storage order"""
+        if collection == "users":
+            return self._read_json(self.users_file)
+        if collection == "enrollments":
+            return self._read_json(self.enrollments_file)
+        if collection in self.partitioned:
+            return self.partitioned[collection].records()
+        raise ValueError(f"Unknown collection: {collection}")
 
     # User operations
+    @serialized
     def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new user"""
-        users = self._read_json(self.users_file)
+        users = self._read_json(self.users_file, for_update=True)
 
         # Check if email already exists
         if any(u['email'].lower() == user_data['email'].lower() for u in users):
@@ -135,6 +421,7 @@ class FileDB:
 
         users.append(user_data)
         self._write_json(self.users_file, users)
+        self._emit("users", "insert", user_data)
 
         return user_data
 
@@ -154,14 +441,16 @@ class FileDB:
                 return user
         return None
 
+    @serialized
     def update_user(self, user_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update user data"""
-        users = self._read_json(self.users_file)
+        users = self._read_json(self.users_file, for_update=True)
 
         for i, user in enumerate(users):
             if user['id'] == user_id:
                 users[i].update(update_data)
                 self._write_json(self.users_file, users)
+                self._emit("users", "update", users[i])
                 return users[i]
 
         return None
@@ -171,28 +460,35 @@ class FileDB:
         users = self._read_json(self.users_file)
         return users[skip:skip + limit]
 
+    @serialized
     def delete_user(self, user_id: str) -> bool:
         """Delete a user"""
-        users = self._read_json(self.users_file)
-        original_length = len(users)
+        users = self._read_json(self.users_file, for_update=True)
+        removed = [u for u in users if u['id'] == user_id]
         users = [u for u in users if u['id'] != user_id]
 
-        if len(users) < original_length:
+        if removed:
             self._write_json(self.users_file, users)
+            for user in removed:
+                self._emit("users", "delete", user)
             return True
         return False
 
     # Enrollment operations
+    @serialized
     def create_enrollment(self, enrollment_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new enrollment"""
-        enrollments = self._read_json(self.enrollments_file)
+        enrollments = self._read_json(self.enrollments_file, for_update=True)
 
         enrollment_data['id'] = str(uuid.uuid4())
         enrollment_data['created_at'] = datetime.utcnow().isoformat()
         enrollment_data['status'] = enrollment_data.get('status', 'pending')
+        # A full course takes the enrollment on its waitlist instead
+        self.seats.admit([enrollment_data])
 
         enrollments.append(enrollment_data)
         self._write_json(self.enrollments_file, enrollments)
+        self._emit("enrollments", "insert", enrollment_data)
 
         return enrollment_data
 
@@ -209,53 +505,62 @@ class FileDB:
                 return enrollment
         return None
 
+    @serialized
     def update_enrollment(self, enrollment_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update enrollment data"""
-        enrollments = self._read_json(self.enrollments_file)
+        enrollments = self._read_json(self.enrollments_file, for_update=True)
 
         for i, enrollment in enumerate(enrollments):
             if enrollment['id'] == enrollment_id:
                 enrollments[i].update(update_data)
+                enrollments[i]['updated_at'] = datetime.now(timezone.utc).isoformat()
+                promoted = self._promote_waitlisted(enrollments, [enrollments[i]])
                 self._write_json(self.enrollments_file, enrollments)
+                self._emit("enrollments", "update", enrollments[i])
+                for record in promoted:
+                    self._emit("enrollments", "update", record)
                 return enrollments[i]
 
         return None
 
+    def _promote_waitlisted(self, enrollments: List[Dict[str, Any]], changed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Give the seats released by changed enrollments to the oldest waitlisted ones, before saving"""
+        promoted_ids = set(self.seats.promotions(changed))
+        if not promoted_ids:
+            return []
+        promoted = [enrollment for enrollment in enrollments if enrollment['id'] in promoted_ids]
+        for enrollment in promoted:
+            enrollment['status'] = 'pending'
+            enrollment['updated_at'] = datetime.now(timezone.utc).isoformat()
+            print(f"Enrollment {enrollment['id']} moved up from the {enrollment.get('course')} waitlist")
+        return promoted
+
     # Reset code operations
     def save_reset_code(self, email: str, code: str, expiration: str) -> None:
         """Save password reset code"""
-        reset_codes = self._read_json(self.reset_codes_file)
-        reset_codes[email.lower()] = {
-            'code': code,
-            'expiration': expiration
-        }
-        self._write_json(self.reset_codes_file, reset_codes)
+        expires_at = datetime.fromisoformat(expiration).timestamp()
+        self._ensure_initialized()
+        self.reset_codes.set(email.lower(), code, expires_at)
 
     def get_reset_code(self, email: str) -> Optional[Dict[str, str]]:
         """Get reset code for email"""
-        reset_codes = self._read_json(self.reset_codes_file)
-        return reset_codes.get(email.lower())
+        entry = self.reset_codes.get(email.lower())
+        if entry is None:
+            return None
+        code, expires_at = entry
+        return {
+            'code': code,
+            'expiration': datetime.fromtimestamp(expires_at, timezone.utc).isoformat()
+        }
 
     def delete_reset_code(self, email: str) -> None:
         """Delete reset code after use"""
-        reset_codes = self._read_json(self.reset_codes_file)
-        if email.lower() in reset_codes:
-            del reset_codes[email.lower()]
-            self._write_json(self.reset_codes_file, reset_codes)
+        self.reset_codes.delete(email.lower())
 
     # Schedule operations - FIXED
+    @serialized
     def create_schedule(self, schedule_data: dict) -> dict:
         """Create a new schedule"""
-        schedules = self._read_json(self.schedules_file)
-
-        # Handle both list and dict structures
-        if isinstance(schedules, dict) and 'schedules' in schedules:
-            schedule_list = schedules['schedules']
-        else:
-            # Convert to proper structure
-            schedule_list = schedules if isinstance(schedules, list) else []
-            schedules = {'schedules': schedule_list}
-
         # Generate unique ID
         schedule_id = f"sch_{datetime.now().strftime('%Y%m%d%H%M%S')}_{random.randint(1000, 9999)}"
 
@@ -269,111 +574,56 @@ class FileDB:
             **schedule_data
         }
 
-        schedules['schedules'].append(schedule)
-        self._write_json(self.schedules_file, schedules)
+        self.partitioned["schedules"].insert(schedule)
+        self._emit("schedules", "insert", schedule)
 
         return schedule
 
     def get_schedules(self, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get all schedules with pagination"""
-        schedules = self._read_json(self.schedules_file)
-
-        # Handle both list and dict structures
-        if isinstance(schedules, dict) and 'schedules' in schedules:
-            schedule_list = schedules['schedules']
-        elif isinstance(schedules, list):
-            schedule_list = schedules
-        else:
-            schedule_list = []
-
-        # Sort by created_at descending (newest first)
-        sorted_schedules = sorted(
-            schedule_list,
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
-        )
-
-        # Apply pagination
-        return sorted_schedules[skip:skip + limit]
+        """Get schedules newest first with pagination"""
+        return self.partitioned["schedules"].newest(skip, limit)
 
     def get_schedule_by_id(self, schedule_id: str) -> Optional[dict]:
         """Get schedule by ID"""
-        schedules = self._read_json(self.schedules_file)
-
-        # Handle both list and dict structures
-        if isinstance(schedules, dict) and 'schedules' in schedules:
-            schedule_list = schedules['schedules']
-        elif isinstance(schedules, list):
-            schedule_list = schedules
-        else:
-            schedule_list = []
-
-        for schedule in schedule_list:
-            if schedule['id'] == schedule_id:
-                return schedule
-
-        return None
+        return self.partitioned["schedules"].get(schedule_id)
 
+    @serialized
     def update_schedule(self, schedule_id: str, update_data: dict) -> Optional[dict]:
         """Update schedule"""
-        schedules = self._read_json(self.schedules_file)
-
-        # Handle both list and dict structures
-        if isinstance(schedules, dict) and 'schedules' in schedules:
-            schedule_list = schedules['schedules']
-        else:
-            schedule_list = schedules if isinstance(schedules, list) else []
-            schedules = {'schedules': schedule_list}
-
-        for i, schedule in enumerate(schedule_list):
-            if schedule['id'] == schedule_id:
-                # Update fields
-                schedule_list[i].update(update_data)
-                schedule_list[i]['updated_at'] = datetime.now(timezone.utc).isoformat()
-
-                schedules['schedules'] = schedule_list
-                self._write_json(self.schedules_file, schedules)
-                return schedule_list[i]
-
-        return None
-
+        schedules = self.partitioned["schedules"]
+        found = schedules.find(schedule_id, for_update=True)
+        if found is None:
+            return None
+
+        key, rows, i = found
+        # Raises BookingConflict before anything changes
+        self.bookings.check([{**rows[i], **update_data}])
+        # Update fields
+        rows[i].update(update_data)
+        rows[i]['updated_at'] = datetime.now(timezone.utc).isoformat()
+
+        schedules.save(key, rows)
+        self._emit("schedules", "update", rows[i])
+        return rows[i]
+
+    @serialized
     def delete_schedule(self, schedule_id: str) -> bool:
         """Delete schedule"""
-        schedules = self._read_json(self.schedules_file)
-
-        # Handle both list and dict structures
-        if isinstance(schedules, dict) and 'schedules' in schedules:
-            schedule_list = schedules['schedules']
-        else:
-            schedule_list = schedules if isinstance(schedules, list) else []
-            schedules = {'schedules': schedule_list}
-
-        original_count = len(schedule_list)
-        schedules['schedules'] = [
-            s for s in schedule_list
-            if s['id'] != schedule_id
-        ]
-
-        if len(schedules['schedules']) < original_count:
-            self._write_json(self.schedules_file, schedules)
-            return True
+        schedules = self.partitioned["schedules"]
+        found = schedules.find(schedule_id, for_update=True)
+        if found is None:
+            return False
 
-        return False
+        key, rows, i = found
+        schedule = rows.pop(i)
+        schedules.save(key, rows)
+        self._emit("schedules", "delete", schedule)
+        return True
 
     def get_schedules_by_email(self, email: str) -> List[dict]:
         """Get all schedules for a specific email"""
-        schedules = self._read_json(self.schedules_file)
-
-        # Handle both list and dict structures
-        if isinstance(schedules, dict) and 'schedules' in schedules:
-            schedule_list = schedules['schedules']
-        elif isinstance(schedules, list):
-            schedule_list = schedules
-        else:
-            schedule_list = []
-
         user_schedules = [
-            s for s in schedule_list
+            s for s in self.partitioned["schedules"].records()
             if s.get('email', '').lower() == email.lower()
         ]
 
@@ -385,10 +635,9 @@ class FileDB:
         )
 
     # Job application operations
+    @serialized
     def create_job_application(self, application_data: dict) -> dict:
         """Create a new job application"""
-        applications = self._read_json(self.job_applications_file)
-
         # Generate unique ID
         app_id = f"job_{datetime.now().strftime('%Y%m%d%H%M%S')}_{random.randint(1000, 9999)}"
 
@@ -400,74 +649,54 @@ class FileDB:
             **application_data
         }
 
-        if 'applications' not in applications:
-            applications = {'applications': []}
-
-        applications['applications'].append(application)
-        self._write_json(self.job_applications_file, applications)
+        self.partitioned["job_applications"].insert(application)
+        self._emit("job_applications", "insert", application)
 
         return application
 
     def get_job_applications(self, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get all job applications with pagination"""
-        applications = self._read_json(self.job_applications_file)
-
-        # Sort by created_at descending (newest first)
-        sorted_applications = sorted(
-            applications.get('applications', []),
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
-        )
-
-        # Apply pagination
-        return sorted_applications[skip:skip + limit]
+        """Get job applications newest first with pagination"""
+        return self.partitioned["job_applications"].newest(skip, limit)
 
     def get_job_application_by_id(self, application_id: str) -> Optional[dict]:
         """Get job application by ID"""
-        applications = self._read_json(self.job_applications_file)
-
-        for application in applications.get('applications', []):
-            if application['id'] == application_id:
-                return application
-
-        return None
+        return self.partitioned["job_applications"].get(application_id)
 
+    @serialized
     def update_job_application(self, application_id: str, update_data: dict) -> Optional[dict]:
         """Update job application"""
-        applications = self._read_json(self.job_applications_file)
+        applications = self.partitioned["job_applications"]
+        found = applications.find(application_id, for_update=True)
+        if found is None:
+            return None
 
-        for i, application in enumerate(applications.get('applications', [])):
-            if application['id'] == application_id:
-                # Update fields
-                applications['applications'][i].update(update_data)
-                applications['applications'][i]['updated_at'] = datetime.now(timezone.utc).isoformat()
+        key, rows, i = found
+        # Update fields
+        rows[i].update(update_data)
+        rows[i]['updated_at'] = datetime.now(timezone.utc).isoformat()
 
-                self._write_json(self.job_applications_file, applications)
-                return applications['applications'][i]
-
-        return None
+        applications.save(key, rows)
+        self._emit("job_applications", "update", rows[i])
+        return rows[i]
 
+    @serialized
     def delete_job_application(self, application_id: str) -> bool:
         """Delete job application"""
-        applications = self._read_json(self.job_applications_file)
+        applications = self.partitioned["job_applications"]
+        found = applications.find(application_id, for_update=True)
+        if found is None:
+            return False
 
-        original_count = len(applications.get('applications', []))
-        applications['applications'] = [
-            a for a in applications.get('applications', [])
-            if a['id'] != application_id
-        ]
-
-        if len(applications['applications']) < original_count:
-            self._write_json(self.job_applications_file, applications)
-            return True
-
-        return False
+        key, rows, i = found
+        application = rows.pop(i)
+        applications.save(key, rows)
+        self._emit("job_applications", "delete", application)
+        return True
 
     # CollegeNinja operations
+    @serialized
     def create_collegeninja_student(self, student_data: dict) -> dict:
         """Create a new CollegeNinja student signup"""
-        signups = self._read_json(self.collegeninja_signups_file)
-
         # Generate unique ID
         student_id = f"cn_student_{datetime.now().strftime('%Y%m%d%H%M%S')}_{random.randint(1000, 9999)}"
 
@@ -479,18 +708,14 @@ class FileDB:
             **student_data
         }
 
-        if 'students' not in signups:
-            signups['students'] = []
-
-        signups['students'].append(student)
-        self._write_json(self.collegeninja_signups_file, signups)
+        self.partitioned["collegeninja_students"].insert(student)
+        self._emit("collegeninja_students", "insert", student)
 
         return student
 
+    @serialized
     def create_collegeninja_counselor(self, counselor_data: dict) -> dict:
         """Create a new CollegeNinja counselor signup"""
-        signups = self._read_json(self.collegeninja_signups_file)
-
         # Generate unique ID
         counselor_id = f"cn_counselor_{datetime.now().strftime('%Y%m%d%H%M%S')}_{random.randint(1000, 9999)}"
 
@@ -502,73 +727,167 @@ class FileDB:
             **counselor_data
         }
 
-        if 'counselors' not in signups:
-            signups['counselors'] = []
-
-        signups['counselors'].append(counselor)
-        self._write_json(self.collegeninja_signups_file, signups)
+        self.partitioned["collegeninja_counselors"].insert(counselor)
+        self._emit("collegeninja_counselors", "insert", counselor)
 
         return counselor
 
     def get_collegeninja_students(self, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get all CollegeNinja student signups"""
-        signups = self._read_json(self.collegeninja_signups_file)
-
-        students = signups.get('students', [])
-        # Sort by created_at descending
-        sorted_students = sorted(
-            students,
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
-        )
-
-        return sorted_students[skip:skip + limit]
+        """Get CollegeNinja student signups newest first"""
+        return self.partitioned["collegeninja_students"].newest(skip, limit)
 
     def get_collegeninja_counselors(self, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get all CollegeNinja counselor signups"""
-        signups = self._read_json(self.collegeninja_signups_file)
-
-        counselors = signups.get('counselors', [])
-        # Sort by created_at descending
-        sorted_counselors = sorted(
-            counselors,
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
-        )
-
-        return sorted_counselors[skip:skip + limit]
+        """Get CollegeNinja counselor signups newest first"""
+        return self.partitioned["collegeninja_counselors"].newest(skip, limit)
+
+    @serialized
+    def _update_signup(self, collection: str, record_id: str, update_data: dict) -> Optional[dict]:
+        signups = self.partitioned[collection]
+        found = signups.find(record_id, for_update=True)
+        if found is None:
+            return None
+
+        key, rows, i = found
+        rows[i].update(update_data)
+        rows[i]['updated_at'] = datetime.now(timezone.utc).isoformat()
+        signups.save(key, rows)
+        self._emit(collection, "update", rows[i])
+        return rows[i]
 
     def update_collegeninja_student(self, student_id: str, update_data: dict) -> Optional[dict]:
         """Update CollegeNinja student status"""
-        signups = self._read_json(self.collegeninja_signups_file)
-
-        students = signups.get('students', [])
-        for i, student in enumerate(students):
-            if student['id'] == student_id:
-                students[i].update(update_data)
-                students[i]['updated_at'] = datetime.now(timezone.utc).isoformat()
-                signups['students'] = students
-                self._write_json(self.collegeninja_signups_file, signups)
-                return students[i]
-
-        return None
+        return self._update_signup("collegeninja_students", student_id, update_data)
 
     def update_collegeninja_counselor(self, counselor_id: str, update_data: dict) -> Optional[dict]:
         """Update CollegeNinja counselor status"""
-        signups = self._read_json(self.collegeninja_signups_file)
-
-        counselors = signups.get('counselors', [])
-        for i, counselor in enumerate(counselors):
-            if counselor['id'] == counselor_id:
-                counselors[i].update(update_data)
-                counselors[i]['updated_at'] = datetime.now(timezone.utc).isoformat()
-                signups['counselors'] = counselors
-                self._write_json(self.collegeninja_signups_file, signups)
-                return counselors[i]
-
-        return None
-
-# Global instance
-file_db = FileDB()
-# Initialize files on startup
-file_db.initialize_files()
\ No newline at end of file
+        return self._update_signup("collegeninja_counselors", counselor_id, update_data)
+
+    # Bulk operations
+    @serialized
+    def update_many(self, collection: str, updates: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Apply {id, changes} updates writing each touched file once; None for ids not found"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(updates)
+        promoted: List[Dict[str, Any]] = []
+        now = datetime.now(timezone.utc).isoformat()
+        if collection == "enrollments":
+            rows = self._read_json(self.enrollments_file, for_update=True)
+            index = {row['id']: i for i, row in enumerate(rows)}
+            for n, update in enumerate(updates):
+                i = index.get(update['id'])
+                if i is not None:
+                    rows[i].update(update['changes'])
+                    rows[i]['updated_at'] = now
+                    results[n] = rows[i]
+            changed = [record for record in results if record is not None]
+            if changed:
+                promoted = self._promote_waitlisted(rows, changed)
+                self._write_json(self.enrollments_file, rows)
+        elif collection in self.partitioned:
+            partitioned = self.partitioned[collection]
+            partitions = partitioned.partitions(for_update=True)
+            # Months are loaded once and indexed as the ids ask for them
+            loaded: Dict[str, Dict[str, int]] = {}
+            months: Dict[str, List[Dict[str, Any]]] = {}
+            found = []
+            for n, update in enumerate(updates):
+                for key in partitioned._candidate_keys(update['id'], partitions):
+                    if key not in loaded:
+                        months[key] = partitioned._rows(key, for_update=True)
+                        loaded[key] = {row['id']: i for i, row in enumerate(months[key])}
+                    i = loaded[key].get(update['id'])
+                    if i is not None:
+                        found.append((n, key, i))
+                        break
+            if collection == "schedules":
+                # The whole batch is checked, against the calendar and itself, before any change
+                self.bookings.check([{**months[key][i], **updates[n]['changes']} for n, key, i in found])
+            dirty = set()
+            for n, key, i in found:
+                months[key][i].update(updates[n]['changes'])
+                months[key][i]['updated_at'] = now
+                results[n] = months[key][i]
+                dirty.add(key)
+            for key in sorted(dirty):
+                partitioned.save(key, months[key])
+        else:
+            raise ValueError(f"Bulk updates are not supported for {collection}")
+
+        for record in results + promoted:
+            if record is not None:
+                self._emit(collection, "update", record)
+        return results
+
+    @serialized
+    def insert_many(self, collection: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert new enrollments or signups writing each touched file once"""
+        now = datetime.now(timezone.utc)
+        for record in records:
+            # Imported records may keep their original date and status
+            record.setdefault('created_at', now.isoformat())
+            record.setdefault('status', 'pending')
+
+        if collection == "enrollments":
+            rows = self._read_json(self.enrollments_file, for_update=True)
+            for record in records:
+                record['id'] = str(uuid.uuid4())
+            self.seats.admit(records)
+            rows.extend(records)
+            self._write_json(self.enrollments_file, rows)
+        elif collection in SIGNUP_ID_PREFIXES:
+            partitioned = self.partitioned[collection]
+            months: Dict[str, List[Dict[str, Any]]] = {}
+            for record in records:
+                key = partition_key(record)
+                # Stamped from created_at so lookups by id go straight to the right month
+                stamp = key.replace("-", "") + str(record['created_at'])[8:19].replace("T", "").replace(":", "")
+                record['id'] = f"{SIGNUP_ID_PREFIXES[collection]}_{stamp.ljust(14, '0')}_{uuid.uuid4().hex[:8]}"
+                months.setdefault(key, []).append(record)
+            partitions = partitioned.partitions(for_update=True)
+            if set(months) - set(partitions):
+                self._write_json(partitioned.manifest_file, {"partitions": sorted(set(partitions) | set(months))})
+            for key in sorted(months):
+                partitioned.save(key, partitioned._rows(key, for_update=True) + months[key])
+        else:
+            raise ValueError(f"Bulk inserts are not supported for {collection}")
+
+        for record in records:
+            self._emit(collection, "insert", record)
+        return records
+
+    # Archive operations
+    @serialized
+    def archive_records(self, collection: str, record_ids: List[str]) -> Dict[str, Any]:
+        """Move records to the cold archive and drop them from the hot files"""
+        wanted = set(record_ids)
+        if collection in self.partitioned:
+            partitioned = self.partitioned[collection]
+            sources = [partitioned.partition_file(key) for key in partitioned.partitions(for_update=True)]
+        else:
+            sources = [f for f, names in self._file_collections.items() if collection in names]
+
+        archived = 0
+        written = 0
+        for file_path in sources:
+            rows = self._read_json(file_path, for_update=True)
+            moved = [r for r in rows if r.get('id') in wanted]
+            if not moved:
+                continue
+            # Archive first: a crash in between leaves a record in both tiers, never in neither
+            segment = self.archive.append(collection, moved)
+            self._write_json(file_path, [r for r in rows if r.get('id') not in wanted])
+            written += segment.stat().st_size + file_path.stat().st_size
+            archived += len(moved)
+            for record in moved:
+                self._emit(collection, "archive", record)
+
+        return {"archived": archived, "bytes": written}
+
+def create_file_db() -> FileDB:
+    """Local FileDB, or a replica of the storage writer started by app.server"""
+    if settings.STORAGE_WRITER_SOCKET:
+        from app.utils.storage_writer import RemoteFileDB
+        return RemoteFileDB(settings.DATA_DIR, settings.STORAGE_WRITER_SOCKET)
+    return FileDB(settings.DATA_DIR)
+
+# Global instance, initialized and prewarmed by the application lifespan
+file_db = create_file_db()
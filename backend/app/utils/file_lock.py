@@ -0,0 +1,28 @@
+# backend/app/utils/file_lock.py
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def lock_file(file_path: Path, attempts: int = 50, delay: float = 0.1):
+    """Hold <file>.lock, created exclusively, across processes - Windows compatible"""
+    lock_path = Path(str(file_path) + '.lock')
+    for _ in range(attempts):
+        try:
+            os.close(os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_RDWR))
+            break
+        except FileExistsError:
+            # Another process holds it, wait and retry
+            time.sleep(delay)
+    else:
+        raise TimeoutError(f"Could not acquire lock for {file_path}")
+
+    try:
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
@@ -0,0 +1,150 @@
+# backend/app/utils/file_watcher.py
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Watch directories with Linux inotify and report changed file paths"""
+
+    kind = "inotify"
+
+    def __init__(self, directories: List[Path], callback: Callable[[Path], None]):
+        self.directories = [Path(d) for d in directories]
+        self.callback = callback
+        self._watches: Dict[int, Path] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop_r, self._stop_w = os.pipe()
+
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        for directory in self.directories:
+            wd = self._libc.inotify_add_watch(
+                self._fd,
+                os.fsencode(str(directory)),
+                IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE
+            )
+            if wd < 0:
+                os.close(self._fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self._watches[wd] = directory
+
+    def _run(self) -> None:
+        while True:
+            readable, _, _ = select.select([self._fd, self._stop_r], [], [])
+            if self._stop_r in readable:
+                return
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+
+            paths = set()
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                if name and wd in self._watches:
+                    paths.add(self._watches[wd] / name)
+
+            for path in paths:
+                try:
+                    self.callback(path)
+                except Exception as e:
+                    print(f"File change handler failed for {path}: {e}")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            os.write(self._stop_w, b"x")
+            self._thread.join(timeout=2)
+            self._thread = None
+        for fd in (self._fd, self._stop_r, self._stop_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class PollingWatcher:
+    """Fallback watcher comparing file stats at a fixed interval"""
+
+    kind = "poll"
+
+    def __init__(self, directories: List[Path], callback: Callable[[Path], None], interval: float = 0.2):
+        self.directories = [Path(d) for d in directories]
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seen: Dict[Path, Tuple[int, int, int]] = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int, int]]:
+        seen = {}
+        for directory in self.directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            seen[directory / entry.name] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            except FileNotFoundError:
+                pass
+        return seen
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            current = self._scan()
+            changed = [path for path, sig in current.items() if self._seen.get(path) != sig]
+            changed += [path for path in self._seen if path not in current]
+            self._seen = current
+            for path in changed:
+                try:
+                    self.callback(path)
+                except Exception as e:
+                    print(f"File change handler failed for {path}: {e}")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+
+def create_watcher(directories: List[Path], callback: Callable[[Path], None], mode: str = "auto", interval: float = 0.2):
+    """Create an inotify watcher on Linux, falling back to polling"""
+    if mode in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories, callback)
+        except (OSError, AttributeError) as e:
+            if mode == "inotify":
+                raise
+            print(f"inotify unavailable ({e}), polling {directories[0]} instead")
+    return PollingWatcher(directories, callback, interval)
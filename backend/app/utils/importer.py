@@ -0,0 +1,245 @@
+# backend/app/utils/importer.py
+"""Bulk import of enrollments and CollegeNinja signups from CSV or NDJSON.
+
+Rows are parsed one at a time from the file, validated against the same
+models and lists as the public signup endpoints, and checked against the
+records already stored and earlier rows of the file. Valid rows are written
+IMPORT_CHUNK_SIZE at a time through FileDB.insert_many, so a large file costs
+a few file rewrites instead of one per row.
+"""
+import csv
+import io
+import json
+import time
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.api import enrollments, collegeninja
+from app.core.config import settings
+from app.models.enrollment import EnrollmentCreate
+from app.models.collegeninja import CollegeNinjaStudentCreate, CollegeNinjaCounselorCreate
+from app.utils.capacity import WAITLIST_STATUS
+from app.utils.email import (
+    send_enrollment_confirmation,
+    send_collegeninja_student_confirmation,
+    send_collegeninja_counselor_confirmation,
+)
+from app.utils.email_index import normalize_email
+
+IMPORT_FORMATS = ["csv", "ndjson"]
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Import format implied by a file name"""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def read_rows(f: BinaryIO, fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield (row number, row, parse error) without loading the whole file"""
+    text = io.TextIOWrapper(f, encoding='utf-8-sig', newline='')
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Spreadsheet exports pad missing cells with empty strings
+            yield reader.line_num, {k.strip(): v.strip() for k, v in row.items() if k and v not in (None, "")}, None
+    elif fmt == "ndjson":
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, None, f"Invalid JSON: {e}"
+                continue
+            if isinstance(row, dict):
+                yield number, row, None
+            else:
+                yield number, None, "Each line must be a JSON object"
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+
+def _preserved(row: Dict[str, Any], valid_statuses: List[str]) -> Dict[str, Any]:
+    """created_at and status columns carried over from a legacy export"""
+    preserved = {}
+    if row.get('created_at'):
+        # Raises ValueError for dates fromisoformat cannot read
+        preserved['created_at'] = datetime.fromisoformat(str(row['created_at'])).isoformat()
+    if row.get('status'):
+        if row['status'] not in valid_statuses:
+            raise ValueError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        preserved['status'] = row['status']
+    return preserved
+
+
+def _clean_enrollment(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate and normalize an enrollment row like POST /api/enrollments"""
+    data = EnrollmentCreate(**row).model_dump()
+    for field, valid in (
+        ('course', enrollments.VALID_COURSES),
+        ('student_type', enrollments.VALID_STUDENT_TYPES),
+        ('country', enrollments.VALID_COUNTRIES),
+    ):
+        if data[field] not in valid:
+            raise ValueError(f"Invalid {field.replace('_', ' ')}. Must be one of: {', '.join(valid)}")
+    enrollments.check_cohort(data['course'], data.get('cohort'))
+    for field in ('first_name', 'last_name', 'phone', 'zip_code'):
+        data[field] = data[field].strip()
+    data['email'] = data['email'].lower().strip()
+    data['comments'] = (data.get('comments') or '').strip()
+    return {**data, **_preserved(row, enrollments.VALID_STATUSES)}
+
+
+def _clean_student(row: Dict[str, Any]) -> Dict[str, Any]:
+    data = CollegeNinjaStudentCreate(**row).model_dump()
+    return {**data, **_preserved(row, collegeninja.VALID_STUDENT_STATUSES)}
+
+
+def _clean_counselor(row: Dict[str, Any]) -> Dict[str, Any]:
+    data = CollegeNinjaCounselorCreate(**row).model_dump()
+    return {**data, **_preserved(row, collegeninja.VALID_COUNSELOR_STATUSES)}
+
+
+def _enrollment_key(record: Dict[str, Any]) -> Tuple[str, ...]:
+    # The enrollment endpoint allows one enrollment per email and course
+    return (normalize_email(record.get('email')), record.get('course') or "")
+
+
+def _signup_key(record: Dict[str, Any]) -> Tuple[str, ...]:
+    return (normalize_email(record.get('email')),)
+
+
+async def _confirm_enrollment(record: Dict[str, Any]) -> None:
+    await send_enrollment_confirmation(
+        record['email'], record['first_name'], record['course'], waitlisted=record['status'] == WAITLIST_STATUS
+    )
+
+
+async def _confirm_student(record: Dict[str, Any]) -> None:
+    await send_collegeninja_student_confirmation(record['email'], record['name'])
+
+
+async def _confirm_counselor(record: Dict[str, Any]) -> None:
+    await send_collegeninja_counselor_confirmation(record['email'], record['name'])
+
+
+# collection -> (row cleaner, duplicate key, confirmation email)
+IMPORTERS: Dict[str, Tuple[Callable, Callable, Callable]] = {
+    "enrollments": (_clean_enrollment, _enrollment_key, _confirm_enrollment),
+    "collegeninja_students": (_clean_student, _signup_key, _confirm_student),
+    "collegeninja_counselors": (_clean_counselor, _signup_key, _confirm_counselor),
+}
+
+
+def _row_error(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        error = e.errors()[0]
+        return f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+    return str(e)
+
+
+class Importer:
+    """Streams one file into a collection in chunked FileDB transactions"""
+
+    def __init__(
+        self,
+        db,
+        collection: str,
+        dry_run: bool = False,
+        keep_created: bool = False,
+        chunk_size: Optional[int] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        if collection not in IMPORTERS:
+            raise ValueError(f"Invalid collection. Must be one of: {', '.join(IMPORTERS)}")
+        self.db = db
+        self.collection = collection
+        self.dry_run = dry_run
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.progress = progress
+        # Records written, kept only when confirmation emails will be sent
+        self.created: Optional[List[Dict[str, Any]]] = [] if keep_created else None
+        self.report: Dict[str, Any] = {
+            "collection": collection,
+            "dry_run": dry_run,
+            "rows": 0,
+            "imported": 0,
+            "duplicates": 0,
+            "invalid": 0,
+            "chunks": 0,
+            "errors": [],
+            "errors_truncated": False,
+        }
+
+    def _error(self, row_number: int, error: str) -> None:
+        if len(self.report["errors"]) < settings.IMPORT_MAX_ERRORS:
+            self.report["errors"].append({"row": row_number, "error": error})
+        else:
+            self.report["errors_truncated"] = True
+
+    def _commit(self, pending: List[Dict[str, Any]]) -> None:
+        if not self.dry_run:
+            created = self.db.insert_many(self.collection, pending)
+            if self.created is not None:
+                self.created.extend(created)
+        self.report["imported"] += len(pending)
+        self.report["chunks"] += 1
+        if self.progress:
+            self.progress(self.report)
+
+    def run(self, f: BinaryIO, fmt: str) -> Dict[str, Any]:
+        """Import every row of f and return the report"""
+        start = time.perf_counter()
+        clean, key_of, _ = IMPORTERS[self.collection]
+        # One pass over the stored records instead of a lookup per row
+        seen = {key_of(record) for record in self.db.get_collection(self.collection)}
+
+        pending: List[Dict[str, Any]] = []
+        for row_number, row, error in read_rows(f, fmt):
+            self.report["rows"] += 1
+            if row is not None:
+                try:
+                    record = clean(row)
+                except (ValidationError, ValueError) as e:
+                    error = _row_error(e)
+            if error is not None:
+                self.report["invalid"] += 1
+                self._error(row_number, error)
+                continue
+
+            key = key_of(record)
+            if key in seen:
+                self.report["duplicates"] += 1
+                self._error(row_number, "Duplicate of an existing record or an earlier row")
+                continue
+            seen.add(key)
+
+            pending.append(record)
+            if len(pending) >= self.chunk_size:
+                self._commit(pending)
+                pending = []
+        if pending:
+            self._commit(pending)
+
+        self.report["took_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return self.report
+
+
+async def send_confirmations(collection: str, records: List[Dict[str, Any]]) -> int:
+    """Send the signup confirmation for each imported record; returns how many were sent"""
+    confirm = IMPORTERS[collection][2]
+    sent = 0
+    for record in records:
+        try:
+            await confirm(record)
+            sent += 1
+        except Exception as e:
+            print(f"Failed to send import confirmation to {record.get('email')}: {e}")
+    return sent
@@ -0,0 +1,131 @@
+# backend/app/utils/partitions.py
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Collections stored as one file per month instead of one growing file
+PARTITIONED_COLLECTIONS = [
+    "schedules",
+    "job_applications",
+    "collegeninja_students",
+    "collegeninja_counselors",
+]
+
+MANIFEST_NAME = "manifest.json"
+
+# Record ids embed their creation time: sch_20261019155722_1410
+ID_TIMESTAMP_RE = re.compile(r"_(\d{4})(\d{2})\d{8}_")
+
+
+def partition_key(record: Dict[str, Any]) -> str:
+    """Month partition (YYYY-MM) a record belongs to, from its created_at"""
+    created_at = str(record.get('created_at') or "")
+    if len(created_at) >= 7 and created_at[4] == "-":
+        return created_at[:7]
+    return datetime.now(timezone.utc).strftime("%Y-%m")
+
+
+def _shift_month(key: str, months: int) -> str:
+    year, month = int(key[:4]), int(key[5:7]) - 1 + months
+    return f"{year + month // 12:04d}-{month % 12 + 1:02d}"
+
+
+class PartitionedCollection:
+    """A FileDB collection kept as data_dir/<name>/YYYY-MM.json plus a manifest.
+
+    The manifest lists the months in order, so writes only touch the current
+    month and newest-first listings can stop once a page is filled.
+    """
+
+    def __init__(self, db, name: str):
+        self.db = db
+        self.name = name
+        self.directory = db.data_dir / name
+        self.manifest_file = self.directory / MANIFEST_NAME
+
+    def partition_file(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def partitions(self, for_update: bool = False) -> List[str]:
+        """Month keys, oldest first"""
+        return self.db._read_json(self.manifest_file, for_update).get('partitions', [])
+
+    def files(self) -> List[Path]:
+        """Manifest and every partition file"""
+        return [self.manifest_file] + [self.partition_file(key) for key in self.partitions()]
+
+    def _rows(self, key: str, for_update: bool = False) -> List[Dict[str, Any]]:
+        rows = self.db._read_json(self.partition_file(key), for_update)
+        return rows if isinstance(rows, list) else []
+
+    def records(self, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every record, oldest month first, optionally only months up to until"""
+        records: List[Dict[str, Any]] = []
+        for key in self.partitions():
+            if until is not None and key > until:
+                break
+            records.extend(self._rows(key))
+        return records
+
+    def newest(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Records ordered by created_at descending, reading only the months needed"""
+        wanted = skip + limit
+        collected: List[Dict[str, Any]] = []
+        for key in reversed(self.partitions()):
+            collected.extend(sorted(self._rows(key), key=lambda x: x.get('created_at', ''), reverse=True))
+            if len(collected) >= wanted:
+                break
+        return collected[skip:skip + limit]
+
+    def insert(self, record: Dict[str, Any]) -> None:
+        """Append a record to its month, registering the month first if it is new"""
+        key = partition_key(record)
+        partitions = self.partitions(for_update=True)
+        if key not in partitions:
+            # Manifest first: a listed month without a file simply reads as empty
+            self.db._write_json(self.manifest_file, {"partitions": sorted(partitions + [key])})
+        rows = self._rows(key, for_update=True)
+        rows.append(record)
+        self.db._write_json(self.partition_file(key), rows)
+
+    def _candidate_keys(self, record_id: str, partitions: List[str]) -> List[str]:
+        """Months to search for an id: the one its timestamp suggests, its neighbours, then newest first"""
+        ordered: List[str] = []
+        match = ID_TIMESTAMP_RE.search(record_id or "")
+        if match:
+            hint = f"{match.group(1)}-{match.group(2)}"
+            # The id uses local time and created_at UTC, so check adjacent months too
+            ordered = [k for k in (hint, _shift_month(hint, 1), _shift_month(hint, -1)) if k in partitions]
+        ordered += [k for k in reversed(partitions) if k not in ordered]
+        return ordered
+
+    def find(self, record_id: str, for_update: bool = False) -> Optional[Tuple[str, List[Dict[str, Any]], int]]:
+        """Locate a record as (month, rows of that month, index)"""
+        partitions = self.partitions(for_update)
+        for key in self._candidate_keys(record_id, partitions):
+            rows = self._rows(key, for_update)
+            for i, record in enumerate(rows):
+                if record['id'] == record_id:
+                    return key, rows, i
+        return None
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        found = self.find(record_id)
+        return found[1][found[2]] if found else None
+
+    def save(self, key: str, rows: List[Dict[str, Any]]) -> None:
+        """Write back one month after changing its rows"""
+        self.db._write_json(self.partition_file(key), rows)
+
+    def migrate(self, records: List[Dict[str, Any]]) -> int:
+        """Split records from a legacy single file into month partitions"""
+        months: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            months.setdefault(partition_key(record), []).append(record)
+        partitions = self.partitions(for_update=True)
+        self.db._write_json(self.manifest_file, {"partitions": sorted(set(partitions) | set(months))})
+        for key, rows in months.items():
+            existing = self._rows(key, for_update=True)
+            self.db._write_json(self.partition_file(key), existing + rows)
+        return len(records)
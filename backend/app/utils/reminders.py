@@ -0,0 +1,216 @@
+# backend/app/utils/reminders.py
+"""Reminder emails ahead of scheduled consultations.
+
+Upcoming reminders sit in a min-heap ordered by send time, so the scheduler
+sleeps exactly until the next one is due and each push or pop is O(log n).
+The heap is built from the schedules once at startup and then follows
+FileDB writes: a changed or removed schedule only forgets its current
+scheduled_date, and heap entries pushed for an earlier version of it are
+skipped when they surface. Reminders whose send time passed while the process was down are
+not sent late.
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.change_log import REMOVAL_OPS
+from app.utils.email import email_sender, send_schedule_reminder
+from app.utils.file_db import file_db
+
+# Only confirmed consultations get reminders
+REMINDER_STATUSES = {"scheduled"}
+
+
+def parse_scheduled_date(value: Any) -> Optional[datetime]:
+    """scheduled_date as an aware UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    # Dates picked in the admin UI arrive without an offset
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class ReminderScheduler:
+    """Min-heap of (send at, version, schedule id, hours before) driving one task"""
+
+    def __init__(self, db, offsets_hours: Optional[List[float]] = None, sender=None):
+        self.db = db
+        self.offsets_hours = sorted(offsets_hours or settings.REMINDER_OFFSETS_HOURS, reverse=True)
+        self.sender = sender or email_sender
+        # Counted when the sender pool finishes each reminder
+        self.sent = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, int, str, float]] = []
+        # schedule id -> (scheduled_date, version); only entries of that version are sent
+        self._dates: Dict[str, Tuple[str, int]] = {}
+        self._counter = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _entries(self, schedule: Dict[str, Any], now: float) -> List[Tuple[float, int, str, float]]:
+        if schedule.get('status') not in REMINDER_STATUSES:
+            return []
+        when = parse_scheduled_date(schedule.get('scheduled_date'))
+        if when is None:
+            return []
+        version = next(self._counter)
+        return [
+            (send_at, version, schedule['id'], hours)
+            for send_at, hours in (((when - timedelta(hours=h)).timestamp(), h) for h in self.offsets_hours)
+            if send_at > now
+        ]
+
+    def rebuild(self) -> None:
+        """Load every upcoming reminder from the schedules"""
+        now = datetime.now(timezone.utc).timestamp()
+        heap = []
+        dates = {}
+        for schedule in self.db.partitioned["schedules"].records():
+            entries = self._entries(schedule, now)
+            if entries:
+                heap.extend(entries)
+                dates[schedule['id']] = (schedule['scheduled_date'], entries[0][1])
+        heapq.heapify(heap)
+        with self._lock:
+            self._heap, self._dates = heap, dates
+        self._wake()
+
+    def on_change(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        """FileDB listener; runs on the writing thread"""
+        if collection != "schedules":
+            return
+        if op == "reload":
+            self.rebuild()
+            return
+
+        entries = [] if op in REMOVAL_OPS else self._entries(record, datetime.now(timezone.utc).timestamp())
+        with self._lock:
+            tracked = self._dates.get(record['id'])
+            if entries and tracked and tracked[0] == record['scheduled_date']:
+                # Some other field changed; the queued reminders still hold
+                return
+            head = self._heap[0][0] if self._heap else None
+            # Older entries of this schedule stay in the heap and are skipped when popped
+            self._dates.pop(record['id'], None)
+            if entries:
+                self._dates[record['id']] = (record['scheduled_date'], entries[0][1])
+                for entry in entries:
+                    heapq.heappush(self._heap, entry)
+            if len(self._heap) > 64 and len(self._heap) > 4 * len(self._dates) * len(self.offsets_hours):
+                # Mostly stale entries: drop them in one O(n) pass
+                self._heap = [e for e in self._heap if self._current(e)]
+                heapq.heapify(self._heap)
+        # Offsets are largest first, so the first entry is the earliest
+        if entries and (head is None or entries[0][0] < head):
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _current(self, entry: Tuple[float, int, str, float]) -> bool:
+        tracked = self._dates.get(entry[2])
+        return tracked is not None and tracked[1] == entry[1]
+
+    def _pop_due(self, now: float) -> List[Tuple[str, str, float]]:
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if self._current(entry):
+                    due.append((entry[2], self._dates[entry[2]][0], entry[3]))
+                    if entry[3] == self.offsets_hours[-1]:
+                        # Last reminder of this consultation
+                        del self._dates[entry[2]]
+        return due
+
+    def _send(self, schedule_id: str, scheduled_date: str, hours: float) -> None:
+        schedule = self.db.get_schedule_by_id(schedule_id)
+        if (not schedule or schedule.get('status') not in REMINDER_STATUSES
+                or schedule.get('scheduled_date') != scheduled_date):
+            return
+        self.sender.submit(
+            self._deliver,
+            schedule.get('email'),
+            schedule.get('first_name', ''),
+            parse_scheduled_date(scheduled_date),
+            hours,
+        )
+
+    async def _deliver(self, *args: Any) -> bool:
+        try:
+            delivered = await send_schedule_reminder(*args)
+        except Exception:
+            self.failed += 1
+            # The sender pool logs it
+            raise
+        if delivered is False:
+            self.failed += 1
+        else:
+            self.sent += 1
+        return delivered
+
+    async def _run(self) -> None:
+        while True:
+            with self._lock:
+                next_at = self._heap[0][0] if self._heap else None
+            timeout = None if next_at is None else max(0.0, next_at - datetime.now(timezone.utc).timestamp())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            for reminder in self._pop_due(datetime.now(timezone.utc).timestamp()):
+                try:
+                    self._send(*reminder)
+                except Exception as e:
+                    print(f"Reminder for schedule {reminder[0]} failed: {e}")
+
+    def start(self) -> None:
+        """Build the heap and start sending on the running event loop"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.db.add_listener(self.on_change)
+        self.rebuild()
+        self._task = asyncio.create_task(self._run())
+        print(f"Reminder scheduler started: {len(self._dates)} upcoming consultations")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self.db.remove_listener(self.on_change)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            next_at = self._heap[0][0] if self._heap else None
+            return {
+                "running": self._task is not None,
+                "offsets_hours": self.offsets_hours,
+                "upcoming_consultations": len(self._dates),
+                "heap_entries": len(self._heap),
+                "next_reminder_at": datetime.fromtimestamp(next_at, timezone.utc).isoformat() if next_at else None,
+                "sent": self.sent,
+                "failed": self.failed,
+            }
+
+
+# Global instance, run by the application lifespan unless a storage writer owns reminders
+reminder_scheduler = ReminderScheduler(file_db)
@@ -0,0 +1,133 @@
+# backend/app/utils/retention.py
+"""Retention rules moving finished records from the hot files to the archive.
+
+A record is archived once its status is in the rule's set (any status when
+the set is None) and it was last touched more than the rule's days ago. The
+job archives in small batches and sleeps in proportion to the bytes written,
+so a large backlog does not saturate the disk the API is reading from.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.utils.file_db import file_db
+
+
+class RetentionRule:
+    """Archive records with one of the given statuses older than days"""
+
+    def __init__(self, statuses: Optional[Set[str]], days: int):
+        self.statuses = statuses
+        self.days = days
+
+    def cutoff(self, now: datetime) -> datetime:
+        return now - timedelta(days=self.days)
+
+    def matches(self, record: Dict[str, Any], cutoff: datetime) -> bool:
+        if self.statuses is not None and record.get('status') not in self.statuses:
+            return False
+        touched = record_time(record)
+        return touched is not None and touched < cutoff
+
+
+RETENTION_RULES: Dict[str, RetentionRule] = {
+    "enrollments": RetentionRule({"completed", "cancelled"}, 180),
+    "schedules": RetentionRule({"completed", "cancelled"}, 180),
+    "job_applications": RetentionRule({"rejected"}, 180),
+    # Signups are only followed up for a season, whatever their status
+    "collegeninja_students": RetentionRule(None, 365),
+    "collegeninja_counselors": RetentionRule(None, 365),
+}
+
+
+def record_time(record: Dict[str, Any]) -> Optional[datetime]:
+    """When a record was last touched, as an aware UTC datetime"""
+    value = record.get('updated_at') or record.get('created_at')
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    # Older records were stamped with naive utcnow()
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class RetentionJob:
+    """Applies the retention rules to a FileDB, in the background or on demand"""
+
+    def __init__(
+        self,
+        db,
+        rules: Optional[Dict[str, RetentionRule]] = None,
+        archive_call: Optional[Callable[[str, List[str]], Dict[str, Any]]] = None
+    ):
+        self.db = db
+        self.rules = rules or RETENTION_RULES
+        # The storage writer routes archive_records through its write lock
+        self.archive_call = archive_call or db.archive_records
+        self.last_run: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def candidates(self, collection: str, now: Optional[datetime] = None) -> List[str]:
+        """Ids of the records a rule would archive now"""
+        rule = self.rules[collection]
+        cutoff = rule.cutoff(now or datetime.now(timezone.utc))
+        if collection in self.db.partitioned:
+            # A record touched before the cutoff was created in or before its month
+            records = self.db.partitioned[collection].records(until=cutoff.strftime("%Y-%m"))
+        else:
+            records = self.db.get_collection(collection)
+        return [record['id'] for record in records if rule.matches(record, cutoff)]
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Archive everything currently due, throttled to RETENTION_IO_BYTES_PER_SECOND"""
+        started = datetime.now(timezone.utc)
+        archived: Dict[str, int] = {}
+        for collection in self.rules:
+            ids = await asyncio.to_thread(self.candidates, collection, started)
+            archived[collection] = 0
+            for start in range(0, len(ids), settings.RETENTION_BATCH_SIZE):
+                batch = ids[start:start + settings.RETENTION_BATCH_SIZE]
+                result = await asyncio.to_thread(self.archive_call, collection, batch)
+                archived[collection] += result["archived"]
+                await asyncio.sleep(result["bytes"] / settings.RETENTION_IO_BYTES_PER_SECOND)
+
+        self.last_run = {
+            "started_at": started.isoformat(),
+            "took_ms": round((datetime.now(timezone.utc) - started).total_seconds() * 1000, 1),
+            "archived": archived,
+        }
+        if any(archived.values()):
+            print(f"Retention archived {archived}")
+        return self.last_run
+
+    async def _run(self) -> None:
+        # Let startup and the first requests finish before scanning
+        await asyncio.sleep(settings.RETENTION_START_DELAY_SECONDS)
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Retention run failed: {e}")
+            await asyncio.sleep(settings.RETENTION_INTERVAL_HOURS * 3600)
+
+    def start(self) -> None:
+        """Start the periodic job on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# Global instance, run by the application lifespan unless a storage writer owns retention
+retention_job = RetentionJob(file_db)
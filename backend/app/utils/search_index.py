@@ -0,0 +1,299 @@
+# backend/app/utils/search_index.py
+import bisect
+import json
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.utils.change_log import REMOVAL_OPS
+
+# Text fields indexed for each collection
+SEARCH_FIELDS = {
+    "enrollments": ["first_name", "last_name", "email", "comments"],
+    "schedules": ["first_name", "last_name", "email", "message", "notes"],
+    "job_applications": ["name", "email", "cover_letter"],
+    "collegeninja_students": ["name", "email", "currentSchool"],
+    "collegeninja_counselors": ["name", "email"],
+}
+
+# Fields whose full value is also indexed as a single term
+EXACT_FIELDS = {"email"}
+
+INDEX_VERSION = 2
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Maximum number of index terms a single query prefix may expand to
+MAX_PREFIX_EXPANSION = 50
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens"""
+    if not text:
+        return []
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def doc_summary(collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Small record summary returned with search hits"""
+    name = record.get('name')
+    if not name:
+        name = f"{record.get('first_name', '')} {record.get('last_name', '')}".strip()
+    return {
+        "collection": collection,
+        "id": record.get('id'),
+        "name": name,
+        "email": record.get('email', ''),
+        "status": record.get('status'),
+        "created_at": record.get('created_at'),
+    }
+
+
+class SearchIndex:
+    """In-memory inverted index with prefix matching and BM25 ranking"""
+
+    def __init__(self, fields: Optional[Dict[str, List[str]]] = None):
+        self.fields = fields or SEARCH_FIELDS
+        self._file_db = None
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # term -> {doc_key: term frequency}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        # Sorted list of all terms, used for prefix expansion
+        self._terms: List[str] = []
+        # doc_key -> {term: term frequency}
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # Index maintenance
+    def _analyze(self, collection: str, record: Dict[str, Any]) -> Dict[str, int]:
+        """Compute term frequencies for a record"""
+        tf: Dict[str, int] = {}
+        for field in self.fields.get(collection, []):
+            value = record.get(field)
+            if not value:
+                continue
+            for token in tokenize(value):
+                tf[token] = tf.get(token, 0) + 1
+            if field in EXACT_FIELDS:
+                exact = str(value).lower().strip()
+                tf[exact] = tf.get(exact, 0) + 1
+        return tf
+
+    def _add_doc(self, key: str, summary: Dict[str, Any], tf: Dict[str, int]) -> None:
+        for term, count in tf.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            postings[key] = count
+        length = sum(tf.values())
+        self._doc_terms[key] = tf
+        self._doc_len[key] = length
+        self._docs[key] = summary
+        self._total_len += length
+
+    def _remove_doc(self, key: str) -> None:
+        tf = self._doc_terms.pop(key, None)
+        if tf is None:
+            return
+        for term in tf:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                i = bisect.bisect_left(self._terms, term)
+                if i < len(self._terms) and self._terms[i] == term:
+                    del self._terms[i]
+        self._total_len -= self._doc_len.pop(key, 0)
+        self._docs.pop(key, None)
+
+    def index_record(self, collection: str, record: Dict[str, Any]) -> None:
+        """Add or replace a record in the index"""
+        if collection not in self.fields or not record.get('id'):
+            return
+        key = f"{collection}:{record['id']}"
+        with self._lock:
+            self._remove_doc(key)
+            self._add_doc(key, doc_summary(collection, record), self._analyze(collection, record))
+
+    def remove_record(self, collection: str, record_id: str) -> None:
+        """Remove a record from the index"""
+        with self._lock:
+            self._remove_doc(f"{collection}:{record_id}")
+
+    def on_change(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        """FileDB change listener keeping the index up to date"""
+        if collection not in self.fields:
+            return
+        if op == "reload":
+            self.reload_collection(collection)
+        elif op in REMOVAL_OPS:
+            self.remove_record(collection, record.get('id'))
+        else:
+            self.index_record(collection, record)
+
+    def rebuild(self, file_db) -> None:
+        """Rebuild the whole index from FileDB"""
+        self._file_db = file_db
+        with self._lock:
+            self._reset()
+            for collection in self.fields:
+                for record in file_db.get_collection(collection):
+                    self.index_record(collection, record)
+
+    def reload_collection(self, collection: str) -> None:
+        """Re-index one collection after another process changed it"""
+        records = self._file_db.get_collection(collection)
+        with self._lock:
+            for key in [k for k, doc in self._docs.items() if doc["collection"] == collection]:
+                self._remove_doc(key)
+            for record in records:
+                self.index_record(collection, record)
+
+    # Querying
+    def _expand(self, token: str) -> List[str]:
+        """Return index terms starting with token"""
+        i = bisect.bisect_left(self._terms, token)
+        matches = []
+        while i < len(self._terms) and self._terms[i].startswith(token):
+            matches.append(self._terms[i])
+            if len(matches) >= MAX_PREFIX_EXPANSION:
+                break
+            i += 1
+        return matches
+
+    def search(
+        self,
+        query: str,
+        collections: Optional[List[str]] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Search the index, returning summaries ordered by BM25 score"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            n_docs = len(self._docs)
+            if n_docs == 0:
+                return []
+            avg_len = self._total_len / n_docs
+
+            scores: Dict[str, float] = {}
+            for token in dict.fromkeys(tokens):
+                # Best matching expansion per document for this query token
+                token_scores: Dict[str, float] = {}
+                for term in self._expand(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    # Exact matches rank above prefix matches
+                    weight = 1.0 if term == token else 0.5
+                    for key, tf in postings.items():
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_len[key] / avg_len)
+                        score = weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+                        if score > token_scores.get(key, 0.0):
+                            token_scores[key] = score
+                for key, score in token_scores.items():
+                    scores[key] = scores.get(key, 0.0) + score
+
+            if collections:
+                wanted = set(collections)
+                scores = {k: v for k, v in scores.items() if self._docs[k]["collection"] in wanted}
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [
+                {**self._docs[key], "score": round(score, 4)}
+                for key, score in ranked
+            ]
+
+    # Persistence
+    def _signature(self, file_db) -> Dict[str, List[int]]:
+        """Size and mtime of the source files, used to detect a stale index"""
+        signature = {}
+        for path in file_db.data_files(list(self.fields)):
+            name = str(path.relative_to(file_db.data_dir))
+            try:
+                stat = path.stat()
+                signature[name] = [stat.st_mtime_ns, stat.st_size]
+            except FileNotFoundError:
+                signature[name] = [0, 0]
+        return signature
+
+    def save(self, file_db, path: Path) -> None:
+        """Persist the index next to the data files"""
+        with self._lock:
+            payload = {
+                "version": INDEX_VERSION,
+                "signature": self._signature(file_db),
+                "docs": {
+                    key: [self._docs[key], self._doc_terms[key]]
+                    for key in self._docs
+                },
+            }
+        # The pid keeps workers saving at the same time from sharing a temp file
+        temp_file = Path(f"{path}.{os.getpid()}.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'), default=str)
+        os.replace(temp_file, path)
+
+    def load(self, file_db, path: Path) -> bool:
+        """Load a persisted index if it matches the current data files"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        if payload.get("version") != INDEX_VERSION:
+            return False
+        if payload.get("signature") != self._signature(file_db):
+            return False
+
+        with self._lock:
+            self._reset()
+            for key, (summary, tf) in payload.get("docs", {}).items():
+                for term, count in tf.items():
+                    self._postings.setdefault(term, {})[key] = count
+                length = sum(tf.values())
+                self._doc_terms[key] = tf
+                self._doc_len[key] = length
+                self._docs[key] = summary
+                self._total_len += length
+            self._terms = sorted(self._postings)
+        return True
+
+    def open(self, file_db, path: Path) -> None:
+        """Load the persisted index or rebuild it, then follow FileDB writes"""
+        start = time.perf_counter()
+        if self.load(file_db, path):
+            source = "loaded"
+        else:
+            self.rebuild(file_db)
+            self.save(file_db, path)
+            source = "rebuilt"
+        self._file_db = file_db
+        file_db.add_listener(self.on_change)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Search index {source}: {len(self)} documents in {elapsed:.1f}ms")
+
+
+# Global instance
+search_index = SearchIndex()
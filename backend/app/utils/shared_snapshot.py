@@ -0,0 +1,283 @@
+# backend/app/utils/shared_snapshot.py
+"""Read-mostly data shared by all worker processes through shared memory.
+
+The storage writer publishes a snapshot of the users (email -> id, password
+hash, flags and profile) and the catalogs. Workers answer auth lookups from
+it instead of each parsing users.json, and pick up a new version on their
+next lookup.
+
+Segments
+  control  "<name>": seqlock counter (u64), then the current data segment name
+  data     "<name>-<version>": immutable, replaced as a whole on every publish
+
+Data segment layout (little endian)
+  header   magic "SPSN", format u16, reserved u16, version u64,
+           user count u32, entries length u32, catalog length u32
+  offsets  user count x u32, entry offsets sorted by email
+  entries  flags u8, email len u16, id len u16, hash len u16, profile len u32,
+           then the bytes; the profile is the JSON of the remaining user fields
+  catalog  JSON
+"""
+import json
+import struct
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional
+
+MAGIC = b"SPSN"
+FORMAT_VERSION = 2
+
+HEADER = struct.Struct("<4sHHQIII")
+OFFSET = struct.Struct("<I")
+ENTRY = struct.Struct("<BHHHI")
+SEQUENCE = struct.Struct("<Q")
+NAME_LENGTH = struct.Struct("<H")
+
+CONTROL_SIZE = 256
+
+FLAG_ACTIVE = 1
+FLAG_ADMIN = 2
+
+# Stored in the entry itself; the profile keeps the email as registered
+ENTRY_FIELDS = {"id", "password_hash", "is_active", "is_admin"}
+
+
+def encode_snapshot(version: int, users: List[Dict[str, Any]], catalogs: Dict[str, Any]) -> bytes:
+    """Serialize users and catalogs into the data segment layout"""
+    entries = []
+    for user in users:
+        email = (user.get('email') or "").strip().lower().encode('utf-8')
+        if not email:
+            continue
+        flags = (FLAG_ACTIVE if user.get('is_active', True) else 0) | (FLAG_ADMIN if user.get('is_admin') else 0)
+        user_id = str(user.get('id', "")).encode('utf-8')
+        password_hash = (user.get('password_hash') or "").encode('utf-8')
+        profile = json.dumps(
+            {k: v for k, v in user.items() if k not in ENTRY_FIELDS}, separators=(',', ':'), default=str
+        ).encode('utf-8')
+        header = ENTRY.pack(flags, len(email), len(user_id), len(password_hash), len(profile))
+        entries.append((email, header + email + user_id + password_hash + profile))
+    entries.sort(key=lambda entry: entry[0])
+
+    catalog = json.dumps(catalogs, separators=(',', ':')).encode('utf-8')
+    offsets = bytearray()
+    body = bytearray()
+    for _, entry in entries:
+        offsets += OFFSET.pack(len(body))
+        body += entry
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, version, len(entries), len(body), len(catalog))
+    return header + bytes(offsets) + bytes(body) + catalog
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Map an existing segment without letting this process's tracker unlink it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Python < 3.13 always registers attached segments, and spawned workers share
+    # the launcher's tracker with the writer, so skip the registration entirely
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SnapshotPublisher:
+    """Writes new snapshot versions; only the storage writer process publishes"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.version = 0
+        self._lock = threading.Lock()
+        self._control = shared_memory.SharedMemory(name=name, create=True, size=CONTROL_SIZE)
+        self._control.buf[:SEQUENCE.size] = SEQUENCE.pack(0)
+        self._data: Optional[shared_memory.SharedMemory] = None
+
+    def publish(self, users: List[Dict[str, Any]], catalogs: Dict[str, Any]) -> int:
+        """Publish a new version and retire the previous data segment"""
+        with self._lock:
+            self.version += 1
+            payload = encode_snapshot(self.version, users, catalogs)
+            data = shared_memory.SharedMemory(name=f"{self.name}-{self.version}", create=True, size=len(payload))
+            data.buf[:len(payload)] = payload
+
+            # Seqlock: an odd counter tells readers the name is being replaced
+            name = data.name.encode('utf-8')
+            buf = self._control.buf
+            sequence = SEQUENCE.unpack_from(buf, 0)[0]
+            SEQUENCE.pack_into(buf, 0, sequence + 1)
+            NAME_LENGTH.pack_into(buf, SEQUENCE.size, len(name))
+            start = SEQUENCE.size + NAME_LENGTH.size
+            buf[start:start + len(name)] = name
+            SEQUENCE.pack_into(buf, 0, sequence + 2)
+
+            # Workers that already mapped the old segment keep their mapping
+            old, self._data = self._data, data
+            if old is not None:
+                old.close()
+                old.unlink()
+            return self.version
+
+    def close(self) -> None:
+        for segment in (self._data, self._control):
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+        self._data = None
+
+
+class SharedSnapshot:
+    """Worker side view of the published snapshot"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._control: Optional[shared_memory.SharedMemory] = None
+        self._sequence = -1
+        self._data: Optional[shared_memory.SharedMemory] = None
+        # Replaced segment kept mapped until the next refresh, for in-flight lookups
+        self._retired: Optional[shared_memory.SharedMemory] = None
+        self._catalogs: Optional[Dict[str, Any]] = None
+        self.version = 0
+
+    @property
+    def attached(self) -> bool:
+        return self._control is not None
+
+    @property
+    def ready(self) -> bool:
+        """Whether lookups are answered from a published version"""
+        return self._refresh() is not None
+
+    def attach(self, name: str) -> bool:
+        """Map the control segment published under name"""
+        try:
+            self._control = _attach(name)
+        except FileNotFoundError:
+            print(f"Shared snapshot {name} not found, using local data")
+            return False
+        self._refresh()
+        print(f"Attached shared snapshot {name} version {self.version}")
+        return True
+
+    def detach(self) -> None:
+        with self._lock:
+            for segment in (self._retired, self._data, self._control):
+                if segment is not None:
+                    segment.close()
+            self._control = self._data = self._retired = None
+            self._catalogs = None
+            self._sequence = -1
+
+    def _refresh(self) -> Optional[shared_memory.SharedMemory]:
+        """Return the current data segment, remapping it after a version bump"""
+        control = self._control
+        if control is None:
+            return None
+        sequence = SEQUENCE.unpack_from(control.buf, 0)[0]
+        if sequence == self._sequence:
+            return self._data
+
+        with self._lock:
+            while True:
+                sequence = SEQUENCE.unpack_from(control.buf, 0)[0]
+                if sequence == self._sequence:
+                    return self._data
+                if sequence == 0:
+                    # Nothing published yet
+                    return None
+                if sequence % 2:
+                    continue
+                length = NAME_LENGTH.unpack_from(control.buf, SEQUENCE.size)[0]
+                start = SEQUENCE.size + NAME_LENGTH.size
+                name = bytes(control.buf[start:start + length]).decode('utf-8')
+                if SEQUENCE.unpack_from(control.buf, 0)[0] != sequence:
+                    continue
+                try:
+                    data = _attach(name)
+                except FileNotFoundError:
+                    # Replaced again before we could map it
+                    continue
+                magic, fmt, _, version, _, _, _ = HEADER.unpack_from(data.buf, 0)
+                if magic != MAGIC or fmt != FORMAT_VERSION:
+                    data.close()
+                    raise ValueError(f"Unsupported shared snapshot format in {name}")
+
+                if self._retired is not None:
+                    self._retired.close()
+                self._retired, self._data = self._data, data
+                self._sequence = sequence
+                self._catalogs = None
+                self.version = version
+                return data
+
+    def user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Binary search the users index; None if the email is unknown"""
+        data = self._refresh()
+        if data is None:
+            return None
+        buf = data.buf
+        _, _, _, _, count, _, _ = HEADER.unpack_from(buf, 0)
+        offsets_start = HEADER.size
+        entries_start = offsets_start + count * OFFSET.size
+        target = (email or "").strip().lower().encode('utf-8')
+
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            position = entries_start + OFFSET.unpack_from(buf, offsets_start + mid * OFFSET.size)[0]
+            flags, email_len, id_len, hash_len, profile_len = ENTRY.unpack_from(buf, position)
+            start = position + ENTRY.size
+            candidate = bytes(buf[start:start + email_len])
+            if candidate < target:
+                low = mid + 1
+            elif candidate > target:
+                high = mid
+            else:
+                start += email_len
+                user_id = bytes(buf[start:start + id_len]).decode('utf-8')
+                start += id_len
+                password_hash = bytes(buf[start:start + hash_len]).decode('utf-8')
+                start += hash_len
+                return {
+                    "email": target.decode('utf-8'),
+                    **json.loads(bytes(buf[start:start + profile_len])),
+                    "id": user_id,
+                    "password_hash": password_hash,
+                    "is_active": bool(flags & FLAG_ACTIVE),
+                    "is_admin": bool(flags & FLAG_ADMIN),
+                }
+        return None
+
+    def catalogs(self) -> Optional[Dict[str, Any]]:
+        """Catalogs of the current version, decoded once per version"""
+        data = self._refresh()
+        if data is None:
+            return None
+        catalogs = self._catalogs
+        if catalogs is None:
+            _, _, _, _, count, body_len, catalog_len = HEADER.unpack_from(data.buf, 0)
+            start = HEADER.size + count * OFFSET.size + body_len
+            catalogs = self._catalogs = json.loads(bytes(data.buf[start:start + catalog_len]))
+        return catalogs
+
+    def stats(self) -> Dict[str, Any]:
+        data = self._refresh()
+        if data is None:
+            return {"attached": self.attached, "version": 0}
+        _, _, _, version, count, body_len, catalog_len = HEADER.unpack_from(data.buf, 0)
+        return {
+            "attached": True,
+            "version": version,
+            "users": count,
+            "users_bytes": count * OFFSET.size + body_len,
+            "catalog_bytes": catalog_len,
+            "segment_bytes": data.size,
+        }
+
+
+# Global instance, attached by the application lifespan in storage writer mode
+shared_snapshot = SharedSnapshot()
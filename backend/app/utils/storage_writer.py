@@ -0,0 +1,439 @@
+# backend/app/utils/storage_writer.py
+"""Single-writer storage topology.
+
+One dedicated process owns every FileDB mutation and serves them over a local
+Unix socket. HTTP workers use RemoteFileDB: reads come from their own cached
+replica of the data files, writes are forwarded to the writer, and a
+subscription connection streams every change so replicas and their indexes
+stay current without taking file locks.
+
+Protocol: one JSON object per line in each direction.
+  request   {"client_id": ..., "method": "create_user", "args": [...], "kwargs": {...}}
+  response  {"result": ..., "changes": [[collection, op, record, seq], ...], "reset_codes": bool}
+            or {"error": "ValueError", "message": "..."}
+  subscribe {"client_id": ..., "method": "subscribe"}, answered by
+            {"subscribed": true, "epoch": ..., "seq": ...} and then a stream of
+            {"origin": client_id, "changes": [...], "reset_codes": bool} for every
+            write, in sequence order; the origin only logs its own changes
+"""
+import asyncio
+import builtins
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.catalog import build_catalogs
+from app.core.config import settings
+from app.utils.availability import BookingConflict
+from app.utils.compact_records import json_default
+from app.utils.file_db import FileDB
+from app.utils.shared_snapshot import SnapshotPublisher
+
+# FileDB methods that modify storage and must run in the writer process
+WRITE_METHODS = {
+    "create_user",
+    "update_user",
+    "delete_user",
+    "create_enrollment",
+    "update_enrollment",
+    "save_reset_code",
+    "delete_reset_code",
+    "create_schedule",
+    "update_schedule",
+    "delete_schedule",
+    "create_job_application",
+    "update_job_application",
+    "delete_job_application",
+    "create_collegeninja_student",
+    "create_collegeninja_counselor",
+    "update_collegeninja_student",
+    "update_collegeninja_counselor",
+    "update_many",
+    "insert_many",
+    "archive_records",
+}
+
+RESET_CODE_METHODS = {"save_reset_code", "delete_reset_code"}
+
+# Application errors re-raised by type in the workers, besides builtins
+REMOTE_ERRORS = {"BookingConflict": BookingConflict}
+
+# Subscribers that cannot take a change within this many seconds are dropped
+SUBSCRIBER_SEND_TIMEOUT = 2.0
+
+RECONNECT_DELAY = 0.5
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(',', ':'), default=json_default).encode('utf-8') + b"\n"
+
+
+class StorageWriter:
+    """Executes writes one at a time and fans the resulting changes out to subscribers"""
+
+    def __init__(self, db: FileDB):
+        self.db = db
+        self._write_lock = threading.Lock()
+        self._captured: Optional[List[List[Any]]] = None
+        self._subscribers: Dict[str, socket.socket] = {}
+        self._subscribers_lock = threading.Lock()
+        db.add_listener(self._capture)
+
+    def _capture(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        if self._captured is not None:
+            # Listeners run after the change is logged, so last_seq is this change
+            self._captured.append([collection, op, record, self.db.changes.last_seq])
+
+    def execute(self, client_id: str, method: str, args: List[Any], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one write and return its result with the changes it made"""
+        if method not in WRITE_METHODS:
+            raise ValueError(f"Not a storage write: {method}")
+
+        # Broadcasting under the lock keeps every replica's change order identical
+        with self._write_lock:
+            self._captured = []
+            try:
+                result = getattr(self.db, method)(*args, **kwargs)
+                changes = self._captured
+            finally:
+                self._captured = None
+            message = {"changes": changes, "reset_codes": method in RESET_CODE_METHODS}
+            if changes or message["reset_codes"]:
+                self._broadcast(client_id, message)
+        return {"result": result, **message}
+
+    def subscribe(self, client_id: str, sock: socket.socket) -> None:
+        sock.settimeout(SUBSCRIBER_SEND_TIMEOUT)
+        # Between writes, so the acknowledged seq is exactly the last one broadcast
+        with self._write_lock, self._subscribers_lock:
+            self._subscribers[client_id] = sock
+            # Acknowledge before any broadcast can reach the new subscriber
+            sock.sendall(_encode({
+                "subscribed": True,
+                "epoch": self.db.changes.epoch,
+                "seq": self.db.changes.last_seq,
+            }))
+
+    def unsubscribe(self, client_id: str, sock: socket.socket) -> None:
+        with self._subscribers_lock:
+            if self._subscribers.get(client_id) is sock:
+                del self._subscribers[client_id]
+
+    def _broadcast(self, origin: str, message: Dict[str, Any]) -> None:
+        # The origin applies its changes from the response; it gets them here
+        # too so every replica's change log sees one gap-free sequence
+        payload = _encode({"origin": origin, **message})
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers.items())
+        for client_id, sock in subscribers:
+            try:
+                sock.sendall(payload)
+            except OSError as e:
+                print(f"Dropping storage subscriber {client_id}: {e}")
+                self.unsubscribe(client_id, sock)
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+class _WriterRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        writer: StorageWriter = self.server.writer
+        subscribed = None
+        try:
+            for line in self.rfile:
+                request = json.loads(line)
+                if request.get("method") == "subscribe":
+                    subscribed = request["client_id"]
+                    writer.subscribe(subscribed, self.request)
+                    self._wait_for_close()
+                    return
+                try:
+                    response = writer.execute(
+                        request.get("client_id", ""),
+                        request["method"],
+                        request.get("args", []),
+                        request.get("kwargs", {}),
+                    )
+                except Exception as e:
+                    response = {"error": type(e).__name__, "message": str(e)}
+                self.wfile.write(_encode(response))
+        except (OSError, ValueError):
+            pass
+        finally:
+            if subscribed is not None:
+                writer.unsubscribe(subscribed, self.request)
+
+    def _wait_for_close(self) -> None:
+        # Subscribers only receive; the send timeout must not end the connection
+        while True:
+            try:
+                if not self.request.recv(1):
+                    return
+            except socket.timeout:
+                continue
+
+
+class _WriterServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def run_writer(data_dir: str, socket_path: str, snapshot_name: Optional[str] = None) -> None:
+    """Entry point of the storage writer process"""
+    db = FileDB(data_dir)
+    db.initialize_files()
+    # Enrollments are admitted here, so the seat counts must be current before the first write
+    db.seats.rebuild()
+
+    publisher = None
+    if snapshot_name:
+        publisher = SnapshotPublisher(snapshot_name)
+        publisher.publish(db.get_collection("users"), build_catalogs())
+
+        def republish(collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+            # Runs inside the write, so the new version is visible before the response
+            if collection == "users":
+                publisher.publish(db.get_collection("users"), build_catalogs())
+
+        db.add_listener(republish)
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    server = _WriterServer(socket_path, _WriterRequestHandler)
+    server.writer = StorageWriter(db)
+    print(f"Storage writer {os.getpid()} serving {data_dir} on {socket_path}")
+    # Let the launcher's terminate() stop the server cleanly
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+
+    # Imported here: these pull in the global file_db, which may be a RemoteFileDB
+    from app.utils.email import email_sender
+    from app.utils.reminders import ReminderScheduler
+    from app.utils.retention import RetentionJob
+
+    # Archive through the writer so replicas drop the archived records too
+    retention = RetentionJob(
+        db,
+        archive_call=lambda collection, ids: server.writer.execute(
+            "retention", "archive_records", [collection, ids], {}
+        )["result"],
+    )
+    # Sees every write first, so each reminder goes out once whatever the worker count
+    reminders = ReminderScheduler(db)
+
+    async def serve() -> None:
+        # The writer is the only process that expires reset codes on disk
+        db.reset_codes.start_sweeper()
+        if settings.RETENTION_ENABLED:
+            retention.start()
+        if settings.REMINDERS_ENABLED:
+            reminders.start()
+        try:
+            await asyncio.to_thread(server.serve_forever)
+        finally:
+            await retention.stop()
+            await reminders.stop()
+            await email_sender.stop()
+            await db.reset_codes.stop_sweeper()
+
+    try:
+        asyncio.run(serve())
+    finally:
+        server.server_close()
+        if publisher is not None:
+            publisher.close()
+        try:
+            os.remove(socket_path)
+        except OSError:
+            pass
+
+
+def wait_for_writer(socket_path: str, timeout: float = 10.0) -> None:
+    """Block until the writer accepts connections"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Storage writer did not start on {socket_path}")
+            time.sleep(0.05)
+
+
+class StorageWriterError(Exception):
+    """Raised for a writer-side failure with no matching builtin exception"""
+
+
+class ChangeSubscriber:
+    """Follows the writer's change stream and applies it to a RemoteFileDB replica"""
+
+    kind = "writer"
+
+    def __init__(self, db: "RemoteFileDB"):
+        self.db = db
+        self._stop = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self.db.socket_path)
+                sock.sendall(_encode({"client_id": self.db.client_id, "method": "subscribe"}))
+            except OSError as e:
+                print(f"Storage writer unavailable ({e}), retrying")
+                self._stop.wait(RECONNECT_DELAY)
+                continue
+
+            self._sock = sock
+            with sock.makefile('rb') as reader:
+                ack = reader.readline()
+                if ack:
+                    ack = json.loads(ack)
+                    self.db.changes.reset(ack["epoch"], ack["seq"])
+                    # Pick up changes made before the subscription or while disconnected
+                    self.db.resync()
+                for line in reader:
+                    try:
+                        self.db.apply_changes(json.loads(line))
+                    except Exception as e:
+                        print(f"Failed to apply storage changes: {e}")
+            sock.close()
+            self._sock = None
+            if not self._stop.is_set():
+                self._stop.wait(RECONNECT_DELAY)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="storage-subscriber", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+
+class RemoteFileDB(FileDB):
+    """Read-only FileDB replica whose writes are executed by the storage writer"""
+
+    def __init__(self, data_dir: str, socket_path: str):
+        super().__init__(data_dir)
+        self.socket_path = str(socket_path)
+        self.client_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        # Reset codes are expired on disk by the writer only
+        self.reset_codes.read_only = True
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.socket_path)
+            conn = self._local.conn = (sock, sock.makefile('rb'))
+        return conn
+
+    def _call(self, method: str, args, kwargs) -> Any:
+        sock, reader = self._connection()
+        try:
+            sock.sendall(_encode({
+                "client_id": self.client_id,
+                "method": method,
+                "args": list(args),
+                "kwargs": kwargs,
+            }))
+            line = reader.readline()
+            if not line:
+                raise ConnectionError("Storage writer closed the connection")
+        except OSError:
+            # Not retried: the writer may already have applied the write
+            self._local.conn = None
+            reader.close()
+            sock.close()
+            raise
+
+        response = json.loads(line)
+        if "error" in response:
+            error_type = REMOTE_ERRORS.get(response["error"]) or getattr(builtins, response["error"], None)
+            if not (isinstance(error_type, type) and issubclass(error_type, Exception)):
+                error_type = StorageWriterError
+            raise error_type(response["message"])
+
+        self._apply(response)
+        return response["result"]
+
+    def _log_change(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        # Sequence numbers come from the writer's stream, see apply_changes
+        pass
+
+    def apply_changes(self, message: Dict[str, Any]) -> None:
+        """Apply a change stream message and log it with the writer's sequence numbers"""
+        if message.get("origin") != self.client_id:
+            self._apply(message)
+        for collection, op, record, seq in message.get("changes", []):
+            self.changes.append(collection, op, record, seq)
+
+    def _apply(self, message: Dict[str, Any]) -> None:
+        """Refresh the replica from a change message and notify listeners"""
+        changes = message.get("changes", [])
+        paths: Dict[Path, None] = {}
+        for collection, _, record, _ in changes:
+            # Manifests come first, so a new month is listed before it is read
+            files = self._files_for_change(collection, record) if record else self.data_files([collection])
+            paths.update(dict.fromkeys(files))
+        for path in paths:
+            # Reread now so the watcher-trusted cache never serves the old version;
+            # files this replica never loaded (users.json next to a shared snapshot) stay unloaded
+            if path in self._cache:
+                self._read_json(path, for_update=True)
+        if message.get("reset_codes"):
+            self.reset_codes.reload_if_changed()
+        for collection, op, record, _ in changes:
+            self._emit(collection, op, record)
+
+    def resync(self) -> None:
+        """Reload everything that changed while the change stream was down"""
+        for collection in self.partitioned.values():
+            # Drop cached manifests first so new months are part of the file list
+            self._on_file_changed(collection.manifest_file)
+        for path in self.data_files():
+            self._on_file_changed(path)
+        self.reset_codes.reload_if_changed()
+
+    def watch(self, mode: str = "auto", interval: float = 0.2) -> str:
+        """Follow the writer's change stream instead of watching files"""
+        self._ensure_initialized()
+        if self._watcher is None and mode != "off":
+            subscriber = ChangeSubscriber(self)
+            subscriber.start()
+            self._watcher = subscriber
+        return self._watcher.kind if self._watcher is not None else "off"
+
+
+def _remote_method(name: str):
+    def method(self, *args, **kwargs):
+        return self._call(name, args, kwargs)
+    method.__name__ = name
+    method.__doc__ = getattr(FileDB, name).__doc__
+    return method
+
+
+for _name in WRITE_METHODS:
+    setattr(RemoteFileDB, _name, _remote_method(_name))
@@ -0,0 +1,241 @@
+# backend/app/utils/ttl_store.py
+import asyncio
+import heapq
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.file_lock import lock_file
+
+# Upper bound on how long the sweeper sleeps between checks
+SWEEP_MAX_INTERVAL = 60.0
+
+
+class TTLStore:
+    """Key-value store whose entries expire, backed by a compact JSON file.
+
+    Entries live in a dict for O(1) lookups and their expiry times in a
+    min-heap, so the sweeper only ever looks at entries that are due.
+    Heap entries are invalidated lazily when a key is overwritten or deleted.
+    Writes apply their change to the file's current entries under a lock
+    file, so processes sharing the file never drop each other's entries.
+    """
+
+    def __init__(self, path: Path, read_only: bool = False):
+        self.path = Path(path)
+        # Read-only replicas expire entries in memory but never write the file
+        self.read_only = read_only
+        self._lock = threading.RLock()
+        # key -> (value, expires_at epoch seconds)
+        self._data: Dict[str, Tuple[Any, float]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._loaded = False
+        # Stat signature of the file as last loaded or written by this process
+        self._file_signature = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _read_file(self) -> Tuple[Dict[str, Tuple[Any, float]], bool]:
+        """Live entries in the file, and whether it holds expired or legacy ones"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            raw = json.loads(content) if content else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            raw = {}
+
+        now = time.time()
+        entries: Dict[str, Tuple[Any, float]] = {}
+        stale = False
+        for key, entry in (raw.items() if isinstance(raw, dict) else []):
+            try:
+                if isinstance(entry, dict):
+                    # Legacy format: {"code": ..., "expiration": iso}
+                    value = entry.get('code')
+                    expires_at = datetime.fromisoformat(entry['expiration']).timestamp()
+                    stale = True
+                else:
+                    value, expires_at = entry
+                    expires_at = float(expires_at)
+            except (KeyError, TypeError, ValueError):
+                # Malformed entry: drop it, and from the file on the next write
+                stale = True
+                continue
+            if expires_at > now:
+                entries[key] = (value, expires_at)
+            else:
+                stale = True
+        return entries, stale
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            entries, stale = self._read_file()
+            self._data = entries
+            self._heap = [(expires_at, key) for key, (_, expires_at) in entries.items()]
+            heapq.heapify(self._heap)
+            self._loaded = True
+            self._file_signature = self._stat()
+            if stale:
+                self._persist({})
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            return None
+
+    def reload_if_changed(self) -> bool:
+        """Drop the in-memory entries if another process rewrote the file"""
+        with self._lock:
+            if not self._loaded or self._stat() == self._file_signature:
+                return False
+            self._data.clear()
+            self._heap.clear()
+            self._loaded = False
+        self._ensure_loaded()
+        self._wake_sweeper()
+        return True
+
+    def _persist(self, changes: Dict[str, Optional[Tuple[Any, float]]]) -> None:
+        """Apply changes (None deletes) to the file's live entries and write them as {key: [value, expires_at]}"""
+        if self.read_only:
+            return
+        with lock_file(self.path):
+            # Reread under the lock: other workers may have added entries since
+            entries, _ = self._read_file()
+            for key, entry in changes.items():
+                if entry is None:
+                    entries.pop(key, None)
+                else:
+                    entries[key] = entry
+            temp_file = Path(f"{self.path}.{os.getpid()}.tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {key: [value, expires_at] for key, (value, expires_at) in entries.items()},
+                    f,
+                    separators=(',', ':')
+                )
+            os.replace(temp_file, self.path)
+            self._file_signature = self._stat()
+
+        # Adopt what the other workers wrote as well
+        for key, entry in entries.items():
+            if self._data.get(key) != entry:
+                heapq.heappush(self._heap, (entry[1], key))
+        self._data = entries
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._data)
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        """Store value under key until the epoch time expires_at"""
+        self._ensure_loaded()
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            heapq.heappush(self._heap, (expires_at, key))
+            self._persist({key: (value, expires_at)})
+            is_next = self._heap[0] == (expires_at, key)
+        if is_next:
+            self._wake_sweeper()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at) for a live key, or None"""
+        self._ensure_loaded()
+        entry = self._data.get(key)
+        if entry is None and self.reload_if_changed():
+            # Set by another process since this one last read the file
+            entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.time():
+            self.delete(key)
+            return None
+        return entry
+
+    def delete(self, key: str) -> bool:
+        """Remove a key; its heap entry is discarded when it surfaces"""
+        self._ensure_loaded()
+        with self._lock:
+            if self._data.pop(key, None) is None:
+                return False
+            self._persist({key: None})
+            return True
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Evict every expired entry and return how many were removed"""
+        self._ensure_loaded()
+        now = time.time() if now is None else now
+        evicted = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, key = heapq.heappop(self._heap)
+                entry = self._data.get(key)
+                # Skip stale heap entries left behind by overwrites and deletes
+                if entry is not None and entry[1] == expires_at:
+                    del self._data[key]
+                    evicted += 1
+            if evicted:
+                # Expired entries are dropped from the file on reread
+                self._persist({})
+        return evicted
+
+    def next_expiry(self) -> Optional[float]:
+        """Epoch time of the earliest pending expiry, if any"""
+        self._ensure_loaded()
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    # Background sweeper
+    def _wake_sweeper(self) -> None:
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run_sweeper(self) -> None:
+        while True:
+            evicted = self.sweep()
+            if evicted:
+                print(f"Expired {evicted} entries from {self.path.name}")
+
+            next_expiry = self.next_expiry()
+            timeout = SWEEP_MAX_INTERVAL
+            if next_expiry is not None:
+                timeout = min(max(next_expiry - time.time(), 0.0), SWEEP_MAX_INTERVAL)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start_sweeper(self) -> None:
+        """Start the expiry sweeper on the running event loop"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run_sweeper())
+
+    async def stop_sweeper(self) -> None:
+        """Stop the expiry sweeper"""
+        if self._task is None or self._loop is not asyncio.get_running_loop():
+            # Started on another event loop, which stops it
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+        self._wakeup = None
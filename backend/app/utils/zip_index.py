@@ -0,0 +1,218 @@
+# backend/app/utils/zip_index.py
+"""Postal code prefix index for regional reports.
+
+Each collection and country gets a character trie over normalized postal
+codes. Every node counts the records below it, so the count for a prefix
+costs one walk of the prefix's length, and a breakdown by 3- or 5-character
+prefix only visits the trie down to that depth. Records are kept at the node
+of their full code. Like the email index, it is built once at startup and
+then follows FileDB writes.
+"""
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.utils.change_log import REMOVAL_OPS
+
+# Postal code field per indexed collection
+ZIP_FIELDS = {
+    "enrollments": "zip_code",
+    "schedules": "zip_code",
+    "collegeninja_students": "zipCode",
+    "collegeninja_counselors": "zipCode",
+}
+
+# Signups do not ask for a country
+UNKNOWN_COUNTRY = "Unknown"
+
+
+def normalize_zip(code: Optional[str]) -> str:
+    """Upper-case a postal code and drop spaces and dashes (98004-1234 -> 980041234)"""
+    return "".join(ch for ch in str(code or "").upper() if ch.isalnum())
+
+
+class _Node:
+    __slots__ = ("children", "count", "records")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.count = 0
+        # id -> record, only at the node of a complete code
+        self.records: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+class ZipIndex:
+    """Per collection and country tries of postal codes, following FileDB writes"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._file_db = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._tries: Dict[Tuple[str, str], _Node] = {}
+        # (collection, id) -> (country, code) as indexed
+        self._key_of: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._key_of)
+
+    def _add(self, collection: str, record: Dict[str, Any]) -> None:
+        ref = (collection, record.get('id'))
+        code = normalize_zip(record.get(ZIP_FIELDS[collection]))
+        country = record.get('country') or UNKNOWN_COUNTRY
+        if self._key_of.get(ref) == (country, code):
+            # Same place; just keep the newest version of the record
+            self._find(collection, country, code).records[ref[1]] = record
+            return
+        self._discard(ref)
+        if not code:
+            return
+        node = self._tries.setdefault((collection, country), _Node())
+        node.count += 1
+        for ch in code:
+            node = node.children.setdefault(ch, _Node())
+            node.count += 1
+        if node.records is None:
+            node.records = {}
+        node.records[ref[1]] = record
+        self._key_of[ref] = (country, code)
+
+    def _discard(self, ref: Tuple[str, str]) -> None:
+        key = self._key_of.pop(ref, None)
+        if key is None:
+            return
+        country, code = key
+        node = self._tries[(ref[0], country)]
+        node.count -= 1
+        for ch in code:
+            child = node.children[ch]
+            child.count -= 1
+            if not child.count:
+                # The rest of the path only led to this record
+                del node.children[ch]
+                return
+            node = child
+        node.records.pop(ref[1], None)
+
+    def _find(self, collection: str, country: str, prefix: str) -> Optional[_Node]:
+        node = self._tries.get((collection, country))
+        for ch in prefix:
+            if node is None:
+                return None
+            node = node.children.get(ch)
+        return node
+
+    def on_change(self, collection: str, op: str, record: Optional[Dict[str, Any]]) -> None:
+        """FileDB change listener keeping the index up to date"""
+        if collection not in ZIP_FIELDS:
+            return
+        if op == "reload":
+            self.reload_collection(collection)
+            return
+        with self._lock:
+            if op in REMOVAL_OPS:
+                self._discard((collection, record.get('id')))
+            else:
+                self._add(collection, record)
+
+    def rebuild(self, file_db) -> None:
+        """Rebuild the index from the FileDB collections with postal codes"""
+        with self._lock:
+            self._reset()
+            for collection in ZIP_FIELDS:
+                for record in file_db.get_collection(collection):
+                    self._add(collection, record)
+
+    def reload_collection(self, collection: str) -> None:
+        """Re-index one collection after another process changed it"""
+        records = self._file_db.get_collection(collection)
+        with self._lock:
+            for ref in [ref for ref in self._key_of if ref[0] == collection]:
+                self._discard(ref)
+            for record in records:
+                self._add(collection, record)
+
+    def open(self, file_db) -> None:
+        """Build the index and follow FileDB writes"""
+        start = time.perf_counter()
+        self._file_db = file_db
+        self.rebuild(file_db)
+        file_db.add_listener(self.on_change)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Zip index built: {len(self)} records in {elapsed:.1f}ms")
+
+    def _roots(self, collections: List[str], country: Optional[str]) -> Iterator[Tuple[str, str, _Node]]:
+        for (collection, record_country), root in self._tries.items():
+            if collection in collections and (country is None or record_country.lower() == country.lower()):
+                yield collection, record_country, root
+
+    def breakdown(
+        self,
+        prefix: str = "",
+        digits: int = 3,
+        collections: Optional[List[str]] = None,
+        country: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Counts under a prefix, in total and grouped by country and by the first `digits` characters"""
+        prefix = normalize_zip(prefix)
+        collections = collections or list(ZIP_FIELDS)
+        totals = {collection: 0 for collection in collections}
+        countries: Dict[str, int] = {}
+        groups: Dict[Tuple[str, str], Dict[str, int]] = {}
+        with self._lock:
+            for collection, record_country, root in self._roots(collections, country):
+                node = self._find(collection, record_country, prefix)
+                if node is None or not node.count:
+                    continue
+                totals[collection] += node.count
+                countries[record_country] = countries.get(record_country, 0) + node.count
+                # Walk only as deep as the requested prefix length
+                stack = [(prefix, node)]
+                while stack:
+                    path, current = stack.pop()
+                    if len(path) >= digits or not current.children:
+                        group = groups.setdefault((record_country, path), {})
+                        group[collection] = group.get(collection, 0) + current.count
+                        continue
+                    # Codes ending before `digits` characters are grouped under themselves
+                    ended = current.count - sum(child.count for child in current.children.values())
+                    if ended:
+                        group = groups.setdefault((record_country, path), {})
+                        group[collection] = group.get(collection, 0) + ended
+                    stack.extend((path + ch, child) for ch, child in current.children.items())
+
+        regions = [
+            {"country": region_country, "prefix": path, "count": sum(counts.values()), "by_collection": counts}
+            for (region_country, path), counts in groups.items()
+        ]
+        regions.sort(key=lambda region: (-region["count"], region["country"], region["prefix"]))
+        return {"total": sum(totals.values()), "by_collection": totals, "by_country": countries, "regions": regions}
+
+    def records(
+        self,
+        prefix: str,
+        collections: Optional[List[str]] = None,
+        country: Optional[str] = None,
+        limit: int = 100
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Records whose postal code starts with prefix, grouped by collection"""
+        prefix = normalize_zip(prefix)
+        collections = collections or list(ZIP_FIELDS)
+        grouped: Dict[str, List[Dict[str, Any]]] = {collection: [] for collection in collections}
+        with self._lock:
+            for collection, record_country, root in self._roots(collections, country):
+                node = self._find(collection, record_country, prefix)
+                stack = [node] if node is not None else []
+                while stack and len(grouped[collection]) < limit:
+                    current = stack.pop()
+                    if current.records:
+                        grouped[collection].extend(list(current.records.values())[:limit - len(grouped[collection])])
+                    stack.extend(current.children.values())
+        for collection in grouped:
+            grouped[collection].sort(key=lambda x: str(x.get('created_at', '')), reverse=True)
+        return grouped
+
+
+# Global instance
+zip_index = ZipIndex()
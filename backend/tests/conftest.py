@@ -0,0 +1,38 @@
+# backend/tests/conftest.py
+import multiprocessing
+import os
+import tempfile
+
+# Settings and the global instances are created on import, so point them at a
+# scratch directory and turn the background jobs off before any app module loads
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="stempro-tests-")
+os.environ["RETENTION_ENABLED"] = "false"
+os.environ["REMINDERS_ENABLED"] = "false"
+
+import pytest
+
+from app.utils.file_db import FileDB
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Empty FileDB in its own data directory"""
+    db = FileDB(str(tmp_path / "data"))
+    db.initialize_files()
+    return db
+
+
+@pytest.fixture
+def writer(tmp_path):
+    """Storage writer process serving a fresh data directory: (data_dir, socket_path)"""
+    from app.utils.storage_writer import run_writer, wait_for_writer
+
+    data_dir = str(tmp_path / "data")
+    socket_path = str(tmp_path / "writer.sock")
+    # Spawned like app.server does, so the writer shares no state with the tests
+    process = multiprocessing.get_context("spawn").Process(target=run_writer, args=(data_dir, socket_path), daemon=True)
+    process.start()
+    wait_for_writer(socket_path, timeout=30)
+    yield data_dir, socket_path
+    process.terminate()
+    process.join(10)
@@ -0,0 +1,66 @@
+# backend/tests/test_availability.py
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils.availability import BookingConflict
+from app.utils.file_db import FileDB
+
+# A Monday, inside the default 09:00-17:00 UTC working hours
+MONDAY = "2030-01-07"
+
+
+def _book(db, hour, minute=0):
+    schedule = db.create_schedule({"email": f"b{hour}{minute}@x.com"})
+    return db.update_schedule(schedule["id"], {
+        "status": "scheduled", "scheduled_date": f"{MONDAY}T{hour:02d}:{minute:02d}:00+00:00",
+    })
+
+
+def _day(db):
+    start = datetime.fromisoformat(f"{MONDAY}T00:00:00+00:00")
+    end = datetime.fromisoformat(f"{MONDAY}T23:59:00+00:00")
+    slots = db.bookings.free_slots(start, end, now=datetime(2029, 1, 1, tzinfo=timezone.utc))
+    return [slot["start"][11:16] for slot in slots]
+
+
+def _window(start, end):
+    return (
+        datetime.fromisoformat(f"{MONDAY}T{start}:00+00:00").timestamp(),
+        datetime.fromisoformat(f"{MONDAY}T{end}:00+00:00").timestamp(),
+    )
+
+
+def test_overlapping_bookings_are_rejected(db):
+    _book(db, 10)
+    with pytest.raises(BookingConflict):
+        _book(db, 10, 30)
+    # Back to back is fine
+    _book(db, 11)
+    assert len(db.bookings.overlapping(*_window("10:59", "11:01"))) == 2
+
+
+def test_rescheduling_may_keep_or_move_its_own_slot(db):
+    booked = _book(db, 10)
+    db.update_schedule(booked["id"], {"scheduled_date": f"{MONDAY}T10:30:00+00:00"})
+    assert "10:00" not in _day(db) and "11:00" not in _day(db)
+
+
+def test_free_slots_follow_bookings_and_cancellations(db):
+    assert _day(db) == ["09:00", "10:00", "11:00", "12:00", "13:00", "14:00", "15:00", "16:00"]
+    booked = _book(db, 13)
+    _book(db, 9, 30)
+
+    assert _day(db) == ["11:00", "12:00", "14:00", "15:00", "16:00"]
+    db.update_schedule(booked["id"], {"status": "cancelled"})
+    assert "13:00" in _day(db)
+
+
+def test_index_is_rebuilt_from_disk(db):
+    _book(db, 15)
+    # Dates picked in the admin UI have no offset and count as UTC
+    restarted = FileDB(str(db.data_dir))
+    with pytest.raises(BookingConflict):
+        restarted.update_schedule(restarted.create_schedule({"email": "x@x.com"})["id"], {
+            "status": "scheduled", "scheduled_date": f"{MONDAY}T14:30:00",
+        })
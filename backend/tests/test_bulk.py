@@ -0,0 +1,107 @@
+# backend/tests/test_bulk.py
+import threading
+
+import pytest
+
+from app.utils.availability import BookingConflict
+from app.utils.file_db import FileDB
+
+
+def _count_writes(db, monkeypatch):
+    written = []
+    write_json = db._write_json
+
+    def counting(file_path, data):
+        written.append(file_path.name)
+        write_json(file_path, data)
+
+    monkeypatch.setattr(db, "_write_json", counting)
+    return written
+
+
+def test_update_many_writes_each_month_once(db, monkeypatch):
+    records = [
+        db.create_schedule({"email": f"s{n}@x.com", "created_at": f"2026-0{1 + n % 2}-05T00:00:00+00:00"})
+        for n in range(6)
+    ]
+    written = _count_writes(db, monkeypatch)
+    events = []
+    db.add_listener(lambda collection, op, record: events.append((op, record["id"])))
+
+    results = db.update_many("schedules", [
+        *({"id": record["id"], "changes": {"status": "completed"}} for record in records),
+        {"id": "sch_missing", "changes": {"status": "completed"}},
+    ])
+
+    assert sorted(written) == ["2026-01.json", "2026-02.json"]
+    assert [r and r["status"] for r in results] == ["completed"] * 6 + [None]
+    assert events == [("update", record["id"]) for record in records]
+    assert all(db.get_schedule_by_id(r["id"])["status"] == "completed" for r in records)
+
+
+def test_update_many_rejects_a_conflicting_batch_whole(db):
+    first = db.create_schedule({"email": "a@x.com"})
+    second = db.create_schedule({"email": "b@x.com"})
+    booked = {"status": "scheduled", "scheduled_date": "2030-01-07T16:00:00+00:00"}
+
+    with pytest.raises(BookingConflict):
+        db.update_many("schedules", [
+            {"id": first["id"], "changes": {"notes": "first"}},
+            {"id": second["id"], "changes": booked},
+            {"id": first["id"], "changes": booked},
+        ])
+    assert db.get_schedule_by_id(first["id"]).get("notes") is None
+    assert db.get_schedule_by_id(second["id"])["status"] == "pending"
+
+
+def test_insert_many_enrollments_in_one_write(db, monkeypatch):
+    written = _count_writes(db, monkeypatch)
+    records = db.insert_many("enrollments", [
+        {"first_name": "A", "email": "a@x.com", "course": "Generative AI Program"},
+        {"first_name": "B", "email": "b@x.com", "course": "Generative AI Program", "status": "confirmed"},
+    ])
+
+    assert written == ["enrollments.json"]
+    assert [r["status"] for r in records] == ["pending", "confirmed"]
+    assert len({r["id"] for r in records}) == 2
+    assert [r["id"] for r in db.get_collection("enrollments")] == [r["id"] for r in records]
+
+
+def test_bulk_rejects_unsupported_collections(db):
+    with pytest.raises(ValueError):
+        db.update_many("users", [])
+    with pytest.raises(ValueError):
+        db.insert_many("schedules", [{}])
+
+
+def test_bulk_and_single_writes_from_threads_keep_every_change(db):
+    records = db.insert_many("enrollments", [{"email": f"e{n}@x.com", "course": "Generative AI Program"} for n in range(50)])
+    errors = []
+
+    def bulk():
+        try:
+            for n in range(0, 50, 5):
+                db.update_many("enrollments", [
+                    {"id": r["id"], "changes": {"comments": "bulk"}} for r in records[n:n + 5]
+                ])
+        except Exception as e:
+            errors.append(e)
+
+    def single():
+        try:
+            for n in range(25):
+                db.create_enrollment({"email": f"new{n}@x.com", "course": "Generative AI Program"})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=bulk), threading.Thread(target=single)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    # Read back from disk, not the writer's cache
+    enrollments = FileDB(str(db.data_dir)).get_collection("enrollments")
+    assert len(enrollments) == 75
+    assert sum(1 for r in enrollments if r.get("comments") == "bulk") == 50
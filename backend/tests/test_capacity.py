@@ -0,0 +1,92 @@
+# backend/tests/test_capacity.py
+import multiprocessing
+import threading
+
+from app.core.catalog import course_capacity
+from app.utils.file_db import FileDB
+from app.utils.storage_writer import RemoteFileDB
+
+COURSE = "Junior AI Program"
+CAPACITY = course_capacity(COURSE)
+
+
+def _enroll(db, n, **fields):
+    return db.create_enrollment({"first_name": str(n), "email": f"e{n}@x.com", "course": COURSE, **fields})
+
+
+def _enroll_remote(data_dir, socket_path, prefix, count):
+    replica = RemoteFileDB(data_dir, socket_path)
+    for n in range(count):
+        _enroll(replica, f"{prefix}{n}")
+
+
+def _statuses(records):
+    return sorted(record["status"] for record in records)
+
+
+def test_enrollments_past_capacity_are_waitlisted(db):
+    records = [_enroll(db, n) for n in range(CAPACITY + 2)]
+
+    assert _statuses(records) == ["pending"] * CAPACITY + ["waitlisted"] * 2
+    assert db.seats.seats(COURSE) == {"taken": CAPACITY, "seats_left": 0, "waitlisted": 2}
+    # Admins may overbook by creating confirmed enrollments
+    assert _enroll(db, "vip", status="confirmed")["status"] == "confirmed"
+    assert db.seats.seats(COURSE)["taken"] == CAPACITY + 1
+
+
+def test_released_seat_goes_to_the_oldest_waitlisted(db):
+    records = [_enroll(db, n) for n in range(CAPACITY + 2)]
+    events = []
+    db.add_listener(lambda collection, op, record: events.append((record["id"], record["status"])))
+
+    db.update_enrollment(records[0]["id"], {"status": "cancelled"})
+
+    assert events == [(records[0]["id"], "cancelled"), (records[CAPACITY]["id"], "pending")]
+    on_disk = {r["id"]: r["status"] for r in FileDB(str(db.data_dir)).get_collection("enrollments")}
+    assert on_disk[records[CAPACITY]["id"]] == "pending"
+    assert on_disk[records[CAPACITY + 1]["id"]] == "waitlisted"
+    assert db.seats.seats(COURSE) == {"taken": CAPACITY, "seats_left": 0, "waitlisted": 1}
+
+
+def test_bulk_cancellations_promote_in_order(db):
+    records = [_enroll(db, n) for n in range(CAPACITY + 3)]
+    db.update_many("enrollments", [
+        {"id": records[n]["id"], "changes": {"status": "cancelled"}} for n in range(2)
+    ])
+
+    statuses = {r["id"]: r["status"] for r in db.get_collection("enrollments")}
+    assert [statuses[r["id"]] for r in records[CAPACITY:]] == ["pending", "pending", "waitlisted"]
+
+
+def test_counts_are_rebuilt_from_disk(db):
+    for n in range(CAPACITY):
+        _enroll(db, n)
+    restarted = FileDB(str(db.data_dir))
+    assert _enroll(restarted, "late")["status"] == "waitlisted"
+
+
+def test_threads_enrolling_at_once_never_overbook(db):
+    def enroll(prefix):
+        for n in range(5):
+            _enroll(db, f"{prefix}{n}")
+
+    threads = [threading.Thread(target=enroll, args=(f"t{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert _statuses(db.get_collection("enrollments")) == ["pending"] * CAPACITY + ["waitlisted"] * 12
+
+
+def test_workers_enrolling_through_the_writer_never_overbook(writer):
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_enroll_remote, args=(*writer, f"w{n}", 10)) for n in range(2)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    enrollments = FileDB(writer[0]).get_collection("enrollments")
+    assert _statuses(enrollments) == ["pending"] * CAPACITY + ["waitlisted"] * 12
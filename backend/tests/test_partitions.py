@@ -0,0 +1,72 @@
+# backend/tests/test_partitions.py
+import json
+
+from app.utils.file_db import FileDB
+
+
+def _schedule(db, month, n, **fields):
+    return db.create_schedule({
+        "first_name": "S", "last_name": str(n), "email": f"s{n}@x.com",
+        "created_at": f"{month}-1{n % 10}T12:00:00+00:00", **fields,
+    })
+
+
+def test_records_land_in_their_month(db):
+    for n, month in enumerate(["2026-03", "2026-01", "2026-03", "2025-12"]):
+        _schedule(db, month, n)
+
+    schedules = db.partitioned["schedules"]
+    assert schedules.partitions() == ["2025-12", "2026-01", "2026-03"]
+    assert [len(schedules._rows(key)) for key in schedules.partitions()] == [1, 1, 2]
+
+
+def test_newest_pages_across_months(db):
+    for n, month in enumerate(["2025-11", "2025-12", "2026-01", "2026-01", "2026-02"]):
+        _schedule(db, month, n)
+
+    newest = [record["last_name"] for record in db.get_schedules(skip=0, limit=10)]
+    assert newest == ["4", "3", "2", "1", "0"]
+    assert [record["last_name"] for record in db.get_schedules(skip=1, limit=2)] == ["3", "2"]
+
+
+def test_lookup_falls_back_when_the_id_hints_another_month(db):
+    # Ids carry the creation time; an imported record may sit in an older month
+    record = _schedule(db, "2024-06", 1)
+    _schedule(db, "2026-01", 2)
+
+    assert db.get_schedule_by_id(record["id"])["last_name"] == "1"
+    assert db.update_schedule(record["id"], {"notes": "called back"})["notes"] == "called back"
+    assert db.delete_schedule(record["id"])
+    assert db.get_schedule_by_id(record["id"]) is None
+    assert db.partitioned["schedules"].partitions() == ["2024-06", "2026-01"]
+
+
+def test_insert_many_stamps_ids_from_created_at(db):
+    records = db.insert_many("collegeninja_students", [
+        {"name": "A", "email": "a@x.com", "created_at": "2025-07-04T10:11:12+00:00"},
+        {"name": "B", "email": "b@x.com", "created_at": "2026-02-01T00:00:00+00:00"},
+    ])
+
+    assert records[0]["id"].startswith("cn_student_20250704101112_")
+    students = db.partitioned["collegeninja_students"]
+    assert students.partitions() == ["2025-07", "2026-02"]
+    assert students.get(records[1]["id"])["name"] == "B"
+
+
+def test_legacy_single_file_is_migrated(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "collegeninja_signups.json").write_text(json.dumps({
+        "students": [{"id": "cn_student_20250101000000_1", "name": "A", "created_at": "2025-01-01T00:00:00"}],
+        "counselors": [{"id": "cn_counselor_20250201000000_1", "name": "B", "created_at": "2025-02-01T00:00:00"}],
+    }))
+    db = FileDB(str(data_dir))
+    db.initialize_files()
+
+    assert not (data_dir / "collegeninja_signups.json").exists()
+    assert (data_dir / "collegeninja_signups.json.migrated").exists()
+    assert [r["name"] for r in db.get_collection("collegeninja_students")] == ["A"]
+    assert db.partitioned["collegeninja_counselors"].partitions() == ["2025-02"]
+    # A second start finds nothing left to migrate
+    FileDB(str(data_dir)).initialize_files()
+    assert len(db.get_collection("collegeninja_counselors")) == 1
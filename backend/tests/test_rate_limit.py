@@ -0,0 +1,95 @@
+# backend/tests/test_rate_limit.py
+import asyncio
+import json
+
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter, RateLimitMiddleware, TokenBucketStore
+
+
+def test_bucket_allows_a_burst_then_refills():
+    buckets = TokenBucketStore(max_keys=10)
+    assert all(buckets.allow("k", 3, now=0.0)[0] for _ in range(3))
+
+    allowed, retry_after = buckets.allow("k", 3, now=0.0)
+    assert not allowed
+    assert retry_after == 20.0
+    # 3 per minute: one token back after 20 seconds
+    assert not buckets.allow("k", 3, now=19.0)[0]
+    assert buckets.allow("k", 3, now=20.0)[0]
+
+
+def test_bucket_evicts_least_recently_used_keys():
+    buckets = TokenBucketStore(max_keys=2)
+    buckets.allow("a", 1, now=0.0)
+    buckets.allow("b", 1, now=0.0)
+    buckets.allow("a", 1, now=0.0)
+    buckets.allow("c", 1, now=0.0)
+
+    assert len(buckets) == 2
+    # "b" was evicted, so it starts over with a full bucket
+    assert buckets.allow("b", 1, now=0.0)[0]
+    assert not buckets.allow("c", 1, now=0.0)[0]
+
+
+def test_limiter_checks_ip_then_email_then_concurrency(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_IP_PER_MINUTE", 100)
+    monkeypatch.setattr(settings, "RATE_LIMIT_EMAIL_PER_MINUTE", 3)
+    monkeypatch.setattr(settings, "RATE_LIMIT_MAX_CONCURRENT", 1)
+    limiter = RateLimiter()
+
+    assert limiter.check("/login", "1.1.1.1", "A@x.com") is None
+    # Shed requests still spend their tokens
+    assert limiter.check("/login", "2.2.2.2", "a@x.com ")[:2] == (503, "overload")
+    limiter.release()
+    assert limiter.check("/login", "3.3.3.3", "a@x.com") is None
+    limiter.release()
+    # Emails are matched case-insensitively across addresses
+    assert limiter.check("/login", "4.4.4.4", "a@X.com")[:2] == (429, "email")
+    assert limiter.stats()["rejections"] == {"/login": {"overload": 1, "email": 1}}
+
+
+def _request(client, headers=()):
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/auth/login",
+        "query_string": b"",
+        "client": client,
+        "headers": [(b"content-type", b"application/json"), *headers],
+    }
+
+
+def _call(middleware, scope, body):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0]["status"]
+
+
+def test_forwarded_for_header_does_not_change_the_bucket(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_IP_PER_MINUTE", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_EMAIL_PER_MINUTE", 100)
+    received = []
+
+    async def app(scope, receive, send):
+        received.append(await receive())
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = RateLimitMiddleware(app, RateLimiter())
+    body = json.dumps({"username": "a@x.com"}).encode()
+    statuses = [
+        _call(middleware, _request(("10.0.0.5", 1234), [(b"x-forwarded-for", f"203.0.113.{n}".encode())]), body)
+        for n in range(3)
+    ]
+
+    assert statuses == [200, 200, 429]
+    # The buffered body reaches the application unchanged
+    assert received[0]["body"] == body
+    assert _call(middleware, _request(("10.0.0.6", 1234)), body) == 200
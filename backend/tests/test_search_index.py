@@ -0,0 +1,34 @@
+# backend/tests/test_search_index.py
+from app.utils.search_index import SearchIndex
+
+
+def _ids(results):
+    return [result["id"] for result in results]
+
+
+def test_follows_writes_and_matches_prefixes(db):
+    index = SearchIndex()
+    index.open(db, db.data_dir / "search_index.json")
+    schedule = db.create_schedule({"first_name": "Ada", "email": "ada@x.com", "notes": "interested in robotics"})
+    enrollment = db.create_enrollment({"first_name": "Alan", "email": "alan@x.com", "course": "Generative AI Program"})
+
+    assert _ids(index.search("robot")) == [schedule["id"]]
+    assert _ids(index.search("alan")) == [enrollment["id"]]
+    db.update_schedule(schedule["id"], {"notes": "prefers chemistry"})
+    assert index.search("robotics") == []
+    assert _ids(index.search("chem", collections=["schedules"])) == [schedule["id"]]
+    db.delete_schedule(schedule["id"])
+    assert index.search("chemistry") == []
+
+
+def test_saved_index_is_reused_until_the_data_changes(db):
+    path = db.data_dir / "search_index.json"
+    db.create_schedule({"first_name": "Ada", "email": "ada@x.com"})
+    index = SearchIndex()
+    index.rebuild(db)
+    index.save(db, path)
+
+    assert not list(db.data_dir.glob("*.tmp"))
+    assert SearchIndex().load(db, path)
+    db.create_schedule({"first_name": "Grace", "email": "grace@x.com"})
+    assert not SearchIndex().load(db, path)
@@ -0,0 +1,87 @@
+# backend/tests/test_storage_writer.py
+import multiprocessing
+import time
+
+import pytest
+
+from app.utils.availability import BookingConflict
+from app.utils.file_db import FileDB
+from app.utils.storage_writer import RemoteFileDB
+
+
+def _replica(writer) -> RemoteFileDB:
+    data_dir, socket_path = writer
+    replica = RemoteFileDB(data_dir, socket_path)
+    replica.initialize_files()
+    return replica
+
+
+def _create_schedules(data_dir, socket_path, prefix, count):
+    replica = RemoteFileDB(data_dir, socket_path)
+    for i in range(count):
+        replica.create_schedule({"first_name": prefix, "last_name": str(i), "email": f"{prefix}{i}@x.com"})
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_writes_run_in_the_writer(writer):
+    replica = _replica(writer)
+    user = replica.create_user({"email": "a@x.com", "full_name": "A", "hashed_password": "x"})
+
+    # The writer saved it, and the replica applied the change from the response
+    assert FileDB(writer[0]).get_user_by_email("a@x.com")["id"] == user["id"]
+    assert replica.get_user_by_email("a@x.com")["id"] == user["id"]
+    # Sequence numbers only come from the writer's change stream, which this replica does not follow
+    assert replica.changes.last_seq == 0
+
+
+def test_replicas_follow_each_others_writes(writer):
+    first, second = _replica(writer), _replica(writer)
+    local_epoch = second.changes.epoch
+    second.watch()
+    seen = []
+    second.add_listener(lambda collection, op, record: seen.append((collection, op, record["id"])))
+    try:
+        # Subscribed once the replica adopts the writer's numbering
+        _wait_for(lambda: second.changes.epoch != local_epoch)
+        schedule = first.create_schedule({"first_name": "A", "last_name": "B", "email": "a@x.com"})
+        _wait_for(lambda: ("schedules", "insert", schedule["id"]) in seen)
+        assert second.get_schedule_by_id(schedule["id"])["email"] == "a@x.com"
+        changes, truncated, _ = second.changes.since(0)
+        assert not truncated
+        assert [(c["collection"], c["op"], c["seq"]) for c in changes] == [("schedules", "insert", 1)]
+    finally:
+        second.unwatch()
+
+
+def test_writer_errors_are_raised_by_type(writer):
+    replica = _replica(writer)
+    first = replica.create_schedule({"first_name": "A", "last_name": "B", "email": "a@x.com"})
+    second = replica.create_schedule({"first_name": "C", "last_name": "D", "email": "c@x.com"})
+    booked = {"status": "scheduled", "scheduled_date": "2030-01-07T16:00:00+00:00"}
+    replica.update_schedule(first["id"], booked)
+
+    with pytest.raises(BookingConflict):
+        replica.update_schedule(second["id"], booked)
+    with pytest.raises(ValueError, match="not supported"):
+        replica.update_many("users", [])
+    # The failed write changed nothing
+    assert replica.get_schedule_by_id(second["id"])["status"] == "pending"
+
+
+def test_processes_writing_at_once_lose_nothing(writer):
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_create_schedules, args=(*writer, f"w{n}", 20)) for n in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    emails = {record["email"] for record in FileDB(writer[0]).get_collection("schedules")}
+    assert len(emails) == 60
@@ -0,0 +1,104 @@
+# backend/tests/test_ttl_store.py
+import json
+import multiprocessing
+import time
+
+from app.utils.ttl_store import TTLStore
+
+
+def _set_keys(path, prefix, count):
+    store = TTLStore(path)
+    for i in range(count):
+        store.set(f"{prefix}{i}", str(i), time.time() + 600)
+
+
+def test_set_get_and_delete(tmp_path):
+    store = TTLStore(tmp_path / "codes.json")
+    expires_at = time.time() + 60
+    store.set("a@x.com", "123456", expires_at)
+
+    assert store.get("a@x.com") == ("123456", expires_at)
+    # A new instance reads what the first one wrote
+    assert TTLStore(tmp_path / "codes.json").get("a@x.com") == ("123456", expires_at)
+    assert store.delete("a@x.com")
+    assert store.get("a@x.com") is None
+    assert not store.delete("a@x.com")
+
+
+def test_expired_entries_are_not_returned(tmp_path):
+    store = TTLStore(tmp_path / "codes.json")
+    store.set("old", "1", time.time() - 1)
+    assert store.get("old") is None
+
+
+def test_sweep_evicts_only_due_entries(tmp_path):
+    path = tmp_path / "codes.json"
+    store = TTLStore(path)
+    now = time.time()
+    store.set("soon", "1", now + 0.2)
+    store.set("kept", "2", now + 60)
+    # Overwriting leaves a stale heap entry behind, which the sweep must skip
+    store.set("moved", "3", now + 0.2)
+    store.set("moved", "4", now + 60)
+
+    assert store.sweep() == 0
+    time.sleep(0.3)
+    assert store.sweep() == 1
+    assert store.get("soon") is None
+    assert store.get("moved") == ("4", now + 60)
+    assert set(json.loads(path.read_text())) == {"kept", "moved"}
+
+
+def test_legacy_and_malformed_entries(tmp_path):
+    path = tmp_path / "codes.json"
+    path.write_text(json.dumps({
+        "legacy": {"code": "111111", "expiration": "2999-01-01T00:00:00"},
+        "no-expiration": {"code": "222222"},
+        "bad-date": {"code": "333333", "expiration": "tomorrow"},
+        "short": [1],
+        "bad-time": ["444444", "soon"],
+        "current": ["555555", time.time() + 60],
+    }))
+    store = TTLStore(path)
+
+    assert store.get("legacy")[0] == "111111"
+    assert store.get("current")[0] == "555555"
+    assert store.get("no-expiration") is None
+    # Loading rewrote the file in the current format without the broken entries
+    assert set(json.loads(path.read_text())) == {"legacy", "current"}
+    assert isinstance(json.loads(path.read_text())["legacy"], list)
+
+
+def test_read_only_replica_does_not_write(tmp_path):
+    path = tmp_path / "codes.json"
+    TTLStore(path).set("a", "1", time.time() + 60)
+    before = path.read_text()
+
+    replica = TTLStore(path, read_only=True)
+    replica.set("b", "2", time.time() + 60)
+    assert replica.get("b") is not None
+    assert path.read_text() == before
+
+
+def test_reload_picks_up_other_writers(tmp_path):
+    path = tmp_path / "codes.json"
+    reader = TTLStore(path)
+    assert reader.get("a") is None
+
+    TTLStore(path).set("a", "1", time.time() + 60)
+    assert reader.get("a")[0] == "1"
+
+
+def test_processes_writing_at_once_keep_every_entry(tmp_path):
+    path = tmp_path / "codes.json"
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_set_keys, args=(path, f"p{n}-", 25)) for n in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    entries = json.loads(path.read_text())
+    assert len(entries) == 100
+    assert not list(tmp_path.glob("*.tmp")) and not list(tmp_path.glob("*.lock"))